@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 import asyncio
 import functools
+import hashlib
 import aiohttp
 import json
 import argparse
 import os
+import random
 import re
+import sqlite3
 import sys
+import time
 import warnings
 import yaml
 
@@ -16,14 +20,20 @@ try:
     from queue import SimpleQueue as Queue
 except ImportError:
     from queue import Queue
+try:
+    # libyaml bindings are several times faster when they are available
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 from logging.handlers import QueueHandler, QueueListener
 
-from async_lru import alru_cache
 from logging import (
     Formatter,
     FileHandler,
+    Handler,
     DEBUG,
     INFO,
+    NOTSET,
     StreamHandler,
     getLogger,
 )
@@ -31,11 +41,94 @@ from logging import (
 warnings.filterwarnings("ignore")
 
 RETRIES = 15
-
-
-async def badfish_factory(_host, _username, _password, _logger, _retries, _loop=None):
-    badfish = Badfish(_host, _username, _password, _logger, _retries, _loop)
-    await badfish.init()
+CONNECTION_LIMIT = 50
+KEEPALIVE_TIMEOUT = 60
+AUTH_METHODS = ["basic", "session"]
+OUTPUT_FORMATS = ["json", "ndjson"]
+# Options that change the host and can't be combined with --plan.
+MUTATING_OPTIONS = [
+    "--boot-to",
+    "--boot-to-mac",
+    "--clear-jobs",
+    "--racreset",
+    "--factory-reset",
+    "--reboot-only",
+    "--power-cycle",
+    "--power-on",
+    "--power-off",
+    "--unmount-virtual-media",
+]
+SNAPSHOT_BATCH = 500
+MAX_CONCURRENCY = 50
+MEMBER_CONCURRENCY = 8
+JOB_DELETE_CONCURRENCY = 8
+DISCOVERY_TTL = 86400
+POLLING_INTERVAL = 5
+JOB_STATUS_INTERVAL = 10
+EVENT_RECHECK_INTERVAL = 30
+BACKOFF_INITIAL = 1
+BACKOFF_FACTOR = 2
+BACKOFF_MAX = 15
+JOB_TIMEOUT = 1800
+JOB_FINAL_STATES = [
+    "Completed",
+    "CompletedWithErrors",
+    "Failed",
+    "Exception",
+    "Cancelled",
+    "Killed",
+]
+
+# Seconds a GET response is reused for; None never expires and 0 disables
+# caching. Rules are checked in order and the first match wins.
+CACHE_TTL_DEFAULT = 60
+CACHE_TTL_RULES = [
+    (re.compile(r"/(Jobs|TaskService|SessionService)(/|$)"), 0),
+    (re.compile(r"/Systems/[^/]+$"), 0),
+    (re.compile(r"^/redfish/v1$"), None),
+    (
+        re.compile(
+            r"/(Systems|Managers|Chassis|EthernetInterfaces|NetworkAdapters|"
+            r"NetworkPorts|NetworkDeviceFunctions|Processors|Memory|"
+            r"FirmwareInventory|VirtualMedia)$"
+        ),
+        None,
+    ),
+]
+
+
+async def badfish_factory(
+    _host,
+    _username,
+    _password,
+    _logger,
+    _retries,
+    _loop=None,
+    _auth="basic",
+    _discovery=None,
+    _events=False,
+    _timeout=None,
+    _job_tracker=None,
+):
+    badfish = Badfish(
+        _host,
+        _username,
+        _password,
+        _logger,
+        _retries,
+        _loop,
+        _auth,
+        _discovery,
+        _events,
+        _timeout,
+        _job_tracker,
+    )
+    await badfish.open_session()
+    try:
+        await badfish.init()
+    except BadfishException:
+        await badfish.close()
+        raise
     return badfish
 
 
@@ -43,17 +136,624 @@ class BadfishException(Exception):
     pass
 
 
+def requires(*resources):
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            await self.discover(*resources)
+            return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_host_name_fields(host):
+    host_name_split = host.split(".")[0].split("-")
+    if len(host_name_split) < 4:
+        return None
+    return {
+        "rack": host_name_split[-4],
+        "uloc": host_name_split[-3],
+        "blade": host_name_split[-2],
+        "model": host_name_split[-1],
+    }
+
+
+def get_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "badfish")
+
+
+class DiscoveryCache:
+    def __init__(self, path, ttl=DISCOVERY_TTL, refresh=False):
+        self.path = path
+        self.ttl = ttl
+        self.refresh = refresh
+        self.entries = self.load()
+        self.updated = set()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as _file:
+                entries = json.load(_file)
+        except (IOError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def is_valid(self, host):
+        entry = self.entries.get(host)
+        if not entry:
+            return False
+        if host in self.updated:
+            return True
+        if self.refresh:
+            return False
+        return time.time() - entry.get("timestamp", 0) < self.ttl
+
+    def get(self, host, key):
+        if not self.is_valid(host):
+            return None
+        return self.entries[host].get(key)
+
+    def set(self, host, key, value):
+        if not self.is_valid(host):
+            self.entries[host] = {"timestamp": time.time()}
+        self.entries[host][key] = value
+        self.updated.add(host)
+
+    def forget(self, host, key):
+        if host in self.entries:
+            self.entries[host].pop(key, None)
+            self.updated.add(host)
+
+    def save(self):
+        if not self.updated:
+            return
+        # Merge with whatever other badfish runs wrote in the meantime so
+        # concurrent invocations against different hosts don't drop entries.
+        entries = self.load()
+        for host in self.updated:
+            entries[host] = self.entries[host]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = "%s.%s.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w") as _file:
+            json.dump(entries, _file)
+        os.replace(tmp_path, self.path)
+        self.updated = set()
+
+
+class BootOrderClassifier:
+    def __init__(self, sequences):
+        self.root = {"children": {}, "types": []}
+        for host_type, sequence in sorted(sequences.items()):
+            node = self.root
+            for device in sequence:
+                node = node["children"].setdefault(
+                    device, {"children": {}, "types": []}
+                )
+            node["types"].append(host_type)
+
+    def classify(self, boot_sequence):
+        # Every branch of the trie is walked once while counting the positions
+        # that differ from the boot sequence, so shared prefixes are compared
+        # only once for all the host types that start with them.
+        scores = []
+        stack = [(self.root, 0, 0)]
+        while stack:
+            node, depth, differences = stack.pop()
+            for host_type in node["types"]:
+                scores.append((differences, host_type))
+            for device, child in node["children"].items():
+                differs = depth >= len(boot_sequence) or boot_sequence[depth] != device
+                stack.append((child, depth + 1, differences + differs))
+
+        scores.sort()
+        if not scores:
+            return {"match": None, "closest": None, "differences": None}
+        differences, closest = scores[0]
+        return {
+            "match": closest if differences == 0 else None,
+            "closest": closest,
+            "differences": differences,
+        }
+
+
+class InterfacesIndex:
+    # Indexes are shared by every Badfish instance in the process.
+    indexes = {}
+
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.classifiers = {}
+        self.host_types = sorted({key.split("_")[0] for key in definitions})
+        self.interfaces = {}
+        blade_pattern = re.compile("b0[0-9]")
+        for key, value in definitions.items():
+            if not key.endswith("_interfaces") or not isinstance(value, str):
+                continue
+            parts = key[: -len("_interfaces")].split("_")
+            blade = None
+            if len(parts) > 2 and blade_pattern.match(parts[-1]):
+                blade = parts.pop()
+            if len(parts) < 2 or len(parts) > 4:
+                continue
+            host_type, model, prefix = parts[0], parts[-1], parts[1:-1]
+            rack = prefix[0] if prefix else None
+            uloc = prefix[1] if len(prefix) > 1 else None
+            self.interfaces[(host_type, rack, uloc, model, blade)] = value.split(",")
+
+    def get(self, host_type, rack, uloc, model, blade=None):
+        for prefix in [(rack, uloc), (rack, None), (None, None)]:
+            interfaces = self.interfaces.get((host_type,) + prefix + (model, blade))
+            if interfaces:
+                return list(interfaces)
+        return None
+
+    def get_classifier(self, rack, uloc, model, blade=None):
+        key = (rack, uloc, model, blade)
+        if key not in self.classifiers:
+            sequences = {}
+            for host_type in self.host_types:
+                interfaces = self.get(host_type, rack, uloc, model, blade)
+                if interfaces:
+                    sequences[host_type] = interfaces
+            self.classifiers[key] = BootOrderClassifier(sequences)
+        return self.classifiers[key]
+
+    @classmethod
+    def load(cls, path, cache_dir=None):
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+        cached = cls.indexes.get(path)
+        if cached and cached[0] == stat.st_mtime:
+            return cached[1]
+
+        index = None
+        compiled_path = None
+        if cache_dir:
+            name = hashlib.sha1(path.encode()).hexdigest()[:16]
+            compiled_path = os.path.join(cache_dir, "interfaces-%s.json" % name)
+            index = cls.load_compiled(path, stat, compiled_path)
+        if index is None:
+            with open(path, "r") as _file:
+                definitions = yaml.load(_file, Loader=YamlLoader) or {}
+            index = cls(definitions)
+            if compiled_path:
+                try:
+                    index.save_compiled(path, stat, compiled_path)
+                except (IOError, OSError):
+                    pass
+
+        cls.indexes[path] = (stat.st_mtime, index)
+        return index
+
+    @staticmethod
+    def get_digest(path):
+        with open(path, "rb") as _file:
+            return hashlib.sha256(_file.read()).hexdigest()
+
+    @classmethod
+    def load_compiled(cls, path, stat, compiled_path):
+        try:
+            with open(compiled_path, "r") as _file:
+                compiled = json.load(_file)
+        except (IOError, ValueError):
+            return None
+        if not isinstance(compiled, dict) or compiled.get("path") != path:
+            return None
+        # A touched file with the same content is still valid, only a
+        # different hash means it has to be parsed again.
+        if (compiled.get("mtime"), compiled.get("size")) != (
+            stat.st_mtime,
+            stat.st_size,
+        ) and compiled.get("sha256") != cls.get_digest(path):
+            return None
+        return cls(compiled.get("definitions") or {})
+
+    def save_compiled(self, path, stat, compiled_path):
+        compiled = {
+            "path": path,
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "sha256": self.get_digest(path),
+            "definitions": self.definitions,
+        }
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        tmp_path = "%s.%s.tmp" % (compiled_path, os.getpid())
+        with open(tmp_path, "w") as _file:
+            json.dump(compiled, _file)
+        os.replace(tmp_path, compiled_path)
+
+
+class ResponseCache:
+    def __init__(self, default_ttl=CACHE_TTL_DEFAULT, rules=None):
+        self.default_ttl = default_ttl
+        self.rules = CACHE_TTL_RULES if rules is None else rules
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_path(uri):
+        path = re.sub(r"^https?://[^/]+", "", uri)
+        return path.split("?")[0].rstrip("/")
+
+    def get_ttl(self, uri):
+        path = self.get_path(uri)
+        for pattern, ttl in self.rules:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    def get(self, uri):
+        key = uri.rstrip("/")
+        entry = self.entries.get(key)
+        if entry:
+            expires, response = entry
+            if expires is None or expires > time.monotonic():
+                self.hits += 1
+                return response
+            del self.entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, uri, response):
+        ttl = self.get_ttl(uri)
+        if ttl == 0:
+            return
+        expires = None if ttl is None else time.monotonic() + ttl
+        self.entries[uri.rstrip("/")] = (expires, response)
+
+    def forget(self, uri):
+        self.entries.pop(uri.rstrip("/"), None)
+
+    def invalidate(self, uri):
+        # A mutation on a settings object or an action affects the resource
+        # that owns it and every resource below it, while creating or deleting
+        # a member also changes the collection above it.
+        path = uri.split("?")[0].rstrip("/")
+        resource = re.sub(r"/(Actions(/.*)?|Settings)$", "", path)
+        affected = [resource]
+        if resource == path:
+            affected.append(resource.rsplit("/", 1)[0])
+        for key in list(self.entries):
+            _key = key.split("?")[0]
+            if _key in affected or _key.startswith(resource + "/"):
+                del self.entries[key]
+
+
+class ValidatorCache:
+    # Only inventory that rarely changes is kept across runs, settings and
+    # state are always read from the host.
+    pattern = re.compile(
+        r"/(FirmwareInventory|Memory|Processors|NetworkAdapters|"
+        r"EthernetInterfaces)(/|$)"
+    )
+
+    def __init__(self, path, refresh=False):
+        self.path = path
+        self.entries = {} if refresh else self.load()
+        self.updated = False
+        self.not_modified = 0
+        self.unchanged = 0
+
+    def load(self):
+        try:
+            with open(self.path, "r") as _file:
+                entries = json.load(_file)
+        except (IOError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    @staticmethod
+    def get_key(uri):
+        return re.sub(r"^https?://[^/]+", "", uri).rstrip("/")
+
+    @classmethod
+    def is_stored(cls, uri):
+        return bool(cls.pattern.search(cls.get_key(uri).split("?")[0]))
+
+    def get(self, uri):
+        return self.entries.get(self.get_key(uri))
+
+    def get_headers(self, uri):
+        entry = self.get(uri)
+        if entry and entry.get("etag"):
+            return {"If-None-Match": entry["etag"]}
+        return None
+
+    def set(self, uri, etag, body):
+        # Without an ETag the content hash still tells whether the resource
+        # changed since the last run, so unchanged entries aren't rewritten.
+        key = self.get_key(uri)
+        digest = hashlib.sha256(body.encode("utf-8", "ignore")).hexdigest()
+        entry = self.entries.get(key)
+        if entry and entry["hash"] == digest and entry.get("etag") == etag:
+            self.unchanged += 1
+            return
+        self.entries[key] = {"etag": etag, "hash": digest, "body": body}
+        self.updated = True
+
+    def save(self):
+        if not self.updated:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = "%s.%s.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w") as _file:
+            json.dump(self.entries, _file)
+        os.replace(tmp_path, self.path)
+        self.updated = False
+
+
+class CachedResponse:
+    def __init__(self, response, body=None, on_read=None):
+        self.response = response
+        self.status = 200
+        self.headers = response.headers
+        self.body = body
+        self.on_read = on_read
+
+    async def text(self, encoding="utf-8", errors="strict"):
+        if self.body is None:
+            self.body = await self.response.text(encoding, errors)
+            if self.on_read:
+                self.on_read(self.body)
+        return self.body
+
+    async def read(self):
+        body = await self.text("utf-8", "ignore")
+        return body.encode("utf-8")
+
+
+class Backoff:
+    def __init__(
+        self,
+        timeout,
+        initial=BACKOFF_INITIAL,
+        factor=BACKOFF_FACTOR,
+        maximum=BACKOFF_MAX,
+    ):
+        self.timeout = timeout
+        self.delay = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return min(time.monotonic() - self.started, self.timeout)
+
+    @property
+    def remaining(self):
+        return self.timeout - self.elapsed
+
+    def next_delay(self):
+        delay = min(self.delay, self.maximum)
+        self.delay = delay * self.factor
+        # Keep at least half of the delay and spread the rest, so hosts that
+        # started waiting together do not poll in lockstep.
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        return min(delay, self.remaining)
+
+    async def wait(self):
+        if self.remaining <= 0:
+            return False
+        await asyncio.sleep(self.next_delay())
+        return True
+
+
+class JobTracker:
+    def __init__(self):
+        self.entries = {}
+        self.task = None
+
+    async def track(self, badfish, job_ids, timeout):
+        future = asyncio.get_event_loop().create_future()
+        # Every host backs off on its own, so hosts joining later poll fast
+        # without resetting the delay of the ones already waiting.
+        self.entries[badfish] = {
+            "jobs": {job_id: None for job_id in job_ids},
+            "future": future,
+            "backoff": Backoff(timeout),
+            "next_poll": time.monotonic(),
+        }
+        if not self.task or self.task.done():
+            self.task = asyncio.ensure_future(self.run())
+        return await future
+
+    async def run(self):
+        while self.entries:
+            now = time.monotonic()
+            entries = [
+                (badfish, entry)
+                for badfish, entry in self.entries.items()
+                if entry["next_poll"] <= now
+            ]
+            results = await asyncio.gather(
+                *[badfish.get_jobs(list(entry["jobs"])) for badfish, entry in entries],
+                return_exceptions=True,
+            )
+            for (badfish, entry), result in zip(entries, results):
+                future = entry["future"]
+                if future.done():
+                    del self.entries[badfish]
+                    continue
+                if isinstance(result, BaseException):
+                    badfish.logger.debug(result)
+                else:
+                    self.update(badfish, entry, result)
+
+                if all(
+                    job and job.get("JobState") in JOB_FINAL_STATES
+                    for job in entry["jobs"].values()
+                ):
+                    future.set_result(entry["jobs"])
+                    del self.entries[badfish]
+                elif entry["backoff"].remaining <= 0:
+                    badfish.logger.error(
+                        "Timed out waiting for jobs: %s." % ", ".join(entry["jobs"])
+                    )
+                    future.set_exception(BadfishException())
+                    del self.entries[badfish]
+                else:
+                    entry["next_poll"] = (
+                        time.monotonic() + entry["backoff"].next_delay()
+                    )
+
+            if self.entries:
+                next_poll = min(entry["next_poll"] for entry in self.entries.values())
+                await asyncio.sleep(max(next_poll - time.monotonic(), 0))
+
+    @staticmethod
+    def update(badfish, entry, jobs):
+        for job_id, job in jobs.items():
+            if job_id not in entry["jobs"]:
+                continue
+            previous = entry["jobs"][job_id] or {}
+            state = job.get("JobState")
+            percent = job.get("PercentComplete")
+            if (state, percent) != (
+                previous.get("JobState"),
+                previous.get("PercentComplete"),
+            ):
+                badfish.logger.info(
+                    "Job %s is %s, %s%% complete." % (job_id, state, percent or 0)
+                )
+            entry["jobs"][job_id] = job
+
+
+class EventListener:
+    def __init__(self, session, url, logger, match=None, headers=None, auth=None):
+        self.session = session
+        self.url = url
+        self.logger = logger
+        self.match = match
+        self.headers = dict(headers) if headers else {}
+        self.auth = auth
+        self.event = asyncio.Event()
+        self.response = None
+        self.task = None
+
+    @property
+    def running(self):
+        return self.task is not None and not self.task.done()
+
+    async def start(self):
+        _headers = dict(self.headers)
+        _headers["Accept"] = "text/event-stream"
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30)
+        self.response = await self.session.get(
+            self.url, headers=_headers, auth=self.auth, timeout=timeout
+        )
+        if self.response.status != 200:
+            self.logger.debug(
+                "Event stream returned status code %s." % self.response.status
+            )
+            self.response.release()
+            return False
+        self.task = asyncio.ensure_future(self.read())
+        return True
+
+    async def read(self):
+        data = []
+        try:
+            async for line in self.response.content:
+                line = line.decode("utf-8", "ignore").rstrip("\r\n")
+                if line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    self.dispatch("\n".join(data))
+                    data = []
+        except (Exception, TimeoutError) as ex:
+            self.logger.debug(ex)
+        finally:
+            self.response.release()
+            # Wake any waiter so it notices the stream is gone.
+            self.event.set()
+
+    def dispatch(self, raw):
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            self.logger.debug("Ignoring malformed event: %s" % raw)
+            return
+        if self.match is None or self.match(payload):
+            self.event.set()
+
+    def clear(self):
+        self.event.clear()
+
+    async def wait(self, timeout):
+        if not self.running:
+            return False
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.running
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        elif self.response:
+            self.response.release()
+        self.task = None
+
+
 class Badfish:
-    def __init__(self, _host, _username, _password, _logger, _retries, _loop=None):
+    def __init__(
+        self,
+        _host,
+        _username,
+        _password,
+        _logger,
+        _retries,
+        _loop=None,
+        _auth="basic",
+        _discovery=None,
+        _events=False,
+        _timeout=None,
+        _job_tracker=None,
+    ):
         self.host = _host
         self.username = _username
         self.password = _password
+        self.auth = _auth
+        self.token = None
+        self.session_uri = None
+        self.token_lock = asyncio.Lock()
         self.retries = _retries
+        self.timeout = _timeout or self.retries * POLLING_INTERVAL
+        self.job_status_timeout = _timeout or self.retries * JOB_STATUS_INTERVAL
+        self.job_timeout = _timeout or JOB_TIMEOUT
+        self.job_tracker = _job_tracker or JobTracker()
         self.host_uri = "https://%s" % _host
         self.redfish_uri = "/redfish/v1"
         self.root_uri = "%s%s" % (self.host_uri, self.redfish_uri)
         self.logger = _logger
-        self.semaphore = asyncio.Semaphore(50)
+        self.semaphore = asyncio.Semaphore(CONNECTION_LIMIT)
+        self.member_semaphore = asyncio.Semaphore(MEMBER_CONCURRENCY)
+        self.session = None
+        self.cache = ResponseCache()
+        self.discovery = _discovery
+        self.validators = None
+        if _discovery:
+            self.validators = ValidatorCache(
+                os.path.join(
+                    os.path.dirname(_discovery.path), "responses", "%s.json" % _host
+                ),
+                _discovery.refresh,
+            )
+        self.events = _events
+        self.event_listener = None
+        self.show_progress = True
         if not _loop:
             self.loop = asyncio.get_event_loop()
         else:
@@ -61,19 +761,173 @@ class Badfish:
 
         self.system_resource = None
         self.manager_resource = None
-        self.bios_uri = None
         self.boot_devices = None
+        self.boot_seq = None
+        self.boot_settings_etag = None
+        self.service_root = None
+        self.service_root_lock = asyncio.Lock()
+        self.discover_lock = asyncio.Lock()
 
     async def init(self):
-        await self.validate_credentials()
-        self.system_resource = await self.find_systems_resource()
-        self.manager_resource = await self.find_managers_resource()
-        self.bios_uri = (
-            "%s/Bios/Settings" % self.system_resource[len(self.redfish_uri) :]
+        if self.auth == "session":
+            await self.create_redfish_session()
+        self.system_resource = self.get_discovered("system_resource")
+        self.manager_resource = self.get_discovered("manager_resource")
+
+    @property
+    def bios_uri(self):
+        if not self.system_resource:
+            return None
+        return "%s/Bios/Settings" % self.system_resource[len(self.redfish_uri) :]
+
+    async def discover(self, *resources):
+        lookups = []
+        if "system" in resources and not self.system_resource:
+            lookups.append(("system_resource", self.find_systems_resource))
+        if "manager" in resources and not self.manager_resource:
+            lookups.append(("manager_resource", self.find_managers_resource))
+        if not lookups:
+            return
+
+        async with self.discover_lock:
+            lookups = [(key, find) for key, find in lookups if not getattr(self, key)]
+            values = await asyncio.gather(*[find() for _, find in lookups])
+            for (key, _), value in zip(lookups, values):
+                setattr(self, key, value)
+                self.set_discovered(key, value)
+
+    def get_discovered(self, key):
+        if self.discovery:
+            return self.discovery.get(self.host, key)
+        return None
+
+    def set_discovered(self, key, value):
+        if self.discovery:
+            self.discovery.set(self.host, key, value)
+
+    def forget_discovered(self, key):
+        if self.discovery:
+            self.discovery.forget(self.host, key)
+
+    def get_backoff(self, timeout=None):
+        return Backoff(timeout or self.timeout)
+
+    async def open_session(self):
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            ssl=False,
+            limit=CONNECTION_LIMIT,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
         )
+        self.session = aiohttp.ClientSession(connector=connector)
 
-    @staticmethod
-    def progress_bar(value, end_value, state, bar_length=20):
+    async def close(self):
+        self.logger.debug(
+            "Response cache: %s hits, %s misses." % (self.cache.hits, self.cache.misses)
+        )
+        if self.validators:
+            self.logger.debug(
+                "Conditional requests: %s not modified, %s unchanged."
+                % (self.validators.not_modified, self.validators.unchanged)
+            )
+            try:
+                self.validators.save()
+            except (IOError, OSError) as ex:
+                self.logger.debug(ex)
+                self.logger.warning(
+                    "Could not write response cache to %s" % self.validators.path
+                )
+        if self.event_listener:
+            await self.event_listener.stop()
+        if self.token:
+            await self.delete_redfish_session()
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def create_redfish_session(self):
+        self.logger.debug("Creating Redfish session.")
+        _url = "%s/SessionService/Sessions" % self.root_uri
+        _payload = {"UserName": self.username, "Password": self.password}
+        _headers = {"content-type": "application/json"}
+        try:
+            async with self.semaphore:
+                async with self.session.post(
+                    _url, data=json.dumps(_payload), headers=_headers
+                ) as _response:
+                    await _response.read()
+        except (Exception, TimeoutError) as ex:
+            self.logger.debug(ex)
+            self.logger.error("Failed to communicate with server.")
+            raise BadfishException
+
+        if _response.status == 401:
+            self.logger.error(
+                f"Failed to authenticate. Verify your credentials for {self.host}"
+            )
+            raise BadfishException
+
+        token = _response.headers.get("X-Auth-Token")
+        if _response.status not in [200, 201] or not token:
+            self.logger.error(f"Failed to create a Redfish session on {self.host}")
+            raise BadfishException
+
+        location = _response.headers.get("Location")
+        if location and location.startswith("/"):
+            location = "%s%s" % (self.host_uri, location)
+        self.token = token
+        self.session_uri = location
+
+    async def delete_redfish_session(self):
+        self.logger.debug("Deleting Redfish session.")
+        token = self.token
+        self.token = None
+        if not self.session_uri:
+            self.logger.warning("Redfish session location unknown, skipping logout.")
+            return
+        try:
+            async with self.session.delete(
+                self.session_uri, headers={"X-Auth-Token": token}
+            ) as _response:
+                await _response.read()
+            if _response.status not in [200, 204]:
+                self.logger.warning(
+                    "Could not delete Redfish session, status code is %s."
+                    % _response.status
+                )
+        except (Exception, TimeoutError) as ex:
+            self.logger.debug(ex)
+            self.logger.warning("Could not delete Redfish session.")
+        self.session_uri = None
+
+    async def send_request(self, method, uri, headers=None, **kwargs):
+        request = getattr(self.session, method)
+        for _ in range(2):
+            _headers = dict(headers) if headers else {}
+            token = self.token
+            auth = None
+            if token:
+                _headers["X-Auth-Token"] = token
+            else:
+                auth = aiohttp.BasicAuth(self.username, self.password)
+            async with self.semaphore:
+                async with request(
+                    uri, headers=_headers, auth=auth, **kwargs
+                ) as _response:
+                    if _response.status != 204:
+                        await _response.read()
+            if _response.status != 401 or not token:
+                break
+            async with self.token_lock:
+                if self.token == token:
+                    self.logger.debug("Redfish session expired, re-authenticating.")
+                    await self.create_redfish_session()
+        return _response
+
+    def progress_bar(self, value, end_value, state, bar_length=20):
+        if not self.show_progress:
+            return
         ratio = float(value) / end_value
         arrow = "-" * int(round(ratio * bar_length) - 1) + ">"
         spaces = " " * (bar_length - len(arrow))
@@ -103,18 +957,16 @@ class Badfish:
 
         raise BadfishException
 
-    @alru_cache(maxsize=64)
     async def get_request(self, uri, _continue=False):
+        _response = self.cache.get(uri)
+        if _response:
+            return _response
+        validators = self.validators
+        if validators and not validators.is_stored(uri):
+            validators = None
+        headers = validators.get_headers(uri) if validators else None
         try:
-            async with self.semaphore:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        uri,
-                        auth=aiohttp.BasicAuth(self.username, self.password),
-                        verify_ssl=False,
-                        timeout=60,
-                    ) as _response:
-                        await _response.read()
+            _response = await self.send_request("get", uri, headers=headers, timeout=60)
         except (Exception, TimeoutError) as ex:
             if _continue:
                 return
@@ -122,40 +974,42 @@ class Badfish:
                 self.logger.debug(ex)
                 self.logger.error("Failed to communicate with server.")
                 raise BadfishException
+        if _response.status == 401:
+            self.logger.error(
+                f"Failed to authenticate. Verify your credentials for {self.host}"
+            )
+            raise BadfishException
+        if _response.status == 304 and headers:
+            validators.not_modified += 1
+            _response = CachedResponse(_response, validators.get(uri)["body"])
+        elif _response.status == 200 and validators:
+            etag = _response.headers.get("ETag")
+            if not isinstance(etag, str):
+                etag = None
+            _response = CachedResponse(
+                _response, on_read=functools.partial(validators.set, uri, etag)
+            )
+        if _response.status == 200:
+            self.cache.set(uri, _response)
         return _response
 
     async def post_request(self, uri, payload, headers):
+        self.cache.invalidate(uri)
         try:
-            async with self.semaphore:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        uri,
-                        data=json.dumps(payload),
-                        headers=headers,
-                        auth=aiohttp.BasicAuth(self.username, self.password),
-                        verify_ssl=False,
-                    ) as _response:
-                        if _response.status != 204:
-                            await _response.read()
-                        else:
-                            return _response
+            _response = await self.send_request(
+                "post", uri, headers=headers, data=json.dumps(payload)
+            )
         except (Exception, TimeoutError):
             self.logger.exception("Failed to communicate with server.")
             raise BadfishException
         return _response
 
     async def patch_request(self, uri, payload, headers, _continue=False):
+        self.cache.invalidate(uri)
         try:
-            async with self.semaphore:
-                async with aiohttp.ClientSession() as session:
-                    async with session.patch(
-                        uri,
-                        data=json.dumps(payload),
-                        headers=headers,
-                        auth=aiohttp.BasicAuth(self.username, self.password),
-                        verify_ssl=False,
-                    ) as _response:
-                        await _response.read()
+            _response = await self.send_request(
+                "patch", uri, headers=headers, data=json.dumps(payload)
+            )
         except Exception as ex:
             if _continue:
                 return
@@ -166,46 +1020,37 @@ class Badfish:
         return _response
 
     async def delete_request(self, uri, headers):
+        self.cache.invalidate(uri)
         try:
-            async with self.semaphore:
-                async with aiohttp.ClientSession() as session:
-                    async with session.delete(
-                        uri,
-                        headers=headers,
-                        auth=aiohttp.BasicAuth(self.username, self.password),
-                        ssl=False,
-                    ) as _response:
-                        await _response.read()
+            _response = await self.send_request("delete", uri, headers=headers)
         except (Exception, TimeoutError):
             self.logger.exception("Failed to communicate with server.")
             raise BadfishException
         return _response
 
-    async def get_interfaces_by_type(self, host_type, _interfaces_path):
-        definitions = await self.read_yaml(_interfaces_path)
+    def get_host_fields(self):
+        fields = get_host_name_fields(self.host)
+        if not fields:
+            self.logger.error(
+                f"Couldn't parse rack and model from host name: {self.host}"
+            )
+            raise BadfishException
 
-        host_name_split = self.host.split(".")[0].split("-")
-        host_model = host_name_split[-1]
-        host_blade = host_name_split[-2]
-        uloc = host_name_split[-3]
-        rack = host_name_split[-4]
+        b_pattern = re.compile("b0[0-9]")
+        blade = fields["blade"] if b_pattern.match(fields["blade"]) else None
+        return fields["rack"], fields["uloc"], fields["model"], blade
 
-        prefix = [host_type, rack, uloc]
+    async def get_interfaces_by_type(self, host_type, _interfaces_path):
+        index = await self.get_interfaces_index(_interfaces_path)
+        rack, uloc, host_model, blade = self.get_host_fields()
 
-        b_pattern = re.compile("b0[0-9]")
-        if b_pattern.match(host_blade):
-            host_model = "%s_%s" % (host_model, host_blade)
-
-        len_prefix = len(prefix)
-        for _ in range(len_prefix):
-            prefix_string = "_".join(prefix)
-            key = "%s_%s_interfaces" % (prefix_string, host_model)
-            interfaces_string = definitions.get(key)
-            if interfaces_string:
-                return interfaces_string.split(",")
-            else:
-                prefix.pop()
+        interfaces = index.get(host_type, rack, uloc, host_model, blade)
+        if interfaces:
+            return interfaces
 
+        if blade:
+            host_model = "%s_%s" % (host_model, blade)
+        key = "%s_%s_interfaces" % (host_type, host_model)
         self.logger.error(
             f"Couldn't find a valid key defined on the interfaces yaml: {key}"
         )
@@ -218,7 +1063,12 @@ class Badfish:
         else:
             return "BootSeq"
 
+    @requires("system")
     async def get_bios_boot_mode(self):
+        bios_boot_mode = self.get_discovered("boot_mode")
+        if bios_boot_mode:
+            return bios_boot_mode
+
         self.logger.debug("Getting bios boot mode.")
         _uri = "%s%s/Bios" % (self.host_uri, self.system_resource)
         _response = await self.get_request(_uri)
@@ -232,15 +1082,28 @@ class Badfish:
 
         try:
             bios_boot_mode = data["Attributes"]["BootMode"]
+            self.set_discovered("boot_mode", bios_boot_mode)
             return bios_boot_mode
         except KeyError:
             self.logger.warning("Could not retrieve Bios Attributes. Assuming Bios.")
             return "Bios"
 
-    async def get_boot_devices(self):
-        if not self.boot_devices:
+    @requires("system")
+    async def get_boot_devices(self, refresh=False, for_update=False):
+        if (
+            not self.boot_devices
+            or refresh
+            or (for_update and not self.boot_settings_etag)
+        ):
             _boot_seq = await self.get_boot_seq()
             _uri = "%s%s/BootSources" % (self.host_uri, self.system_resource)
+            self.boot_settings_etag = None
+            if for_update:
+                # The PATCH goes to the settings resource, so that is the ETag
+                # to match. The devices are read after it and never from the
+                # cache, so any change in between makes it stale.
+                self.boot_settings_etag = await self.get_etag("%s/Settings" % _uri)
+                self.cache.forget(_uri)
             _response = await self.get_request(_uri)
 
             if _response.status == 404:
@@ -252,60 +1115,136 @@ class Badfish:
 
             raw = await _response.text("utf-8", "ignore")
             data = json.loads(raw.strip())
-            if "Attributes" in data:
-                self.boot_devices = data["Attributes"][_boot_seq]
-            else:
+            if "Attributes" not in data:
                 self.logger.debug(data)
                 self.logger.error(
                     "Boot order modification is not supported by this host."
                 )
                 raise BadfishException
 
+            if _boot_seq not in data["Attributes"]:
+                # The boot mode is a BIOS setting, it may have been switched
+                # since it was cached.
+                self.logger.debug("%s not found, reading boot mode again." % _boot_seq)
+                self.forget_discovered("boot_mode")
+                self.cache.forget("%s%s/Bios" % (self.host_uri, self.system_resource))
+                _boot_seq = await self.get_boot_seq()
+            if _boot_seq not in data["Attributes"]:
+                self.logger.debug(data)
+                self.logger.error("Couldn't find %s in the boot sources." % _boot_seq)
+                raise BadfishException
+            self.boot_devices = data["Attributes"][_boot_seq]
+            self.boot_seq = _boot_seq
+
+    @requires("manager")
     async def get_job_queue(self):
         self.logger.debug("Getting job queue.")
         _url = "%s%s/Jobs" % (self.host_uri, self.manager_resource)
-        _response = await self.get_request(_url)
+        try:
+            return [
+                member.get("Id") or member["@odata.id"].split("/")[-1]
+                async for member in self.iter_collection(_url, prefetch=True)
+            ]
+        except ValueError:
+            self.logger.error("Could not retrieve the job queue.")
+            raise BadfishException
+
+    @requires("manager")
+    async def get_jobs(self, job_ids):
+        _url = "%s%s/Jobs" % (self.host_uri, self.manager_resource)
+        expand = False
+        if len(job_ids) > 1:
+            expand, _ = await self.check_supported_queries()
+        if expand:
+            members = await self.get_collection_members(
+                _url,
+                member_filter=lambda uri: uri.rstrip("/").split("/")[-1] in job_ids,
+                _continue=True,
+            )
+        else:
+            members = await asyncio.gather(
+                *[
+                    self.get_collection_member(
+                        {"@odata.id": "%s/Jobs/%s" % (self.manager_resource, job_id)},
+                        _continue=True,
+                    )
+                    for job_id in job_ids
+                ]
+            )
 
-        data = await _response.text("utf-8", "ignore")
-        job_queue = re.findall(r"[JR]ID_.+?\d+", data)
-        jobs = [job.strip("}").strip('"').strip("'") for job in job_queue]
+        jobs = {}
+        for member in members:
+            if member:
+                jobs[member["@odata.id"].rstrip("/").split("/")[-1]] = member
         return jobs
 
+    @requires("manager")
+    async def wait_for_jobs(self, job_ids):
+        self.logger.info("Waiting for jobs to finish: %s." % ", ".join(job_ids))
+        jobs = await self.job_tracker.track(self, job_ids, self.job_timeout)
+        failed = False
+        for job_id, job in jobs.items():
+            if job.get("JobState") != "Completed":
+                failed = True
+                self.logger.error(
+                    "Job %s finished as %s: %s"
+                    % (job_id, job.get("JobState"), job.get("Message"))
+                )
+        if failed:
+            raise BadfishException
+
+    @requires("manager")
     async def get_job_status(self, _job_id):
         self.logger.debug("Getting job status.")
         _uri = "%s%s/Jobs/%s" % (self.host_uri, self.manager_resource, _job_id)
 
-        for _ in range(self.retries):
+        backoff = self.get_backoff(self.job_status_timeout)
+        while True:
             _response = await self.get_request(_uri, _continue=True)
-            if not _response:
-                continue
-
-            status_code = _response.status
-            if status_code == 200:
-                self.logger.info(f"Command passed to check job status {_job_id}")
-                await asyncio.sleep(10)
-            else:
-                self.logger.error(
-                    f"Command failed to check job status {_job_id}, return code is %s."
-                    % status_code
-                )
+            if _response:
+                status_code = _response.status
+                if status_code == 200:
+                    self.logger.info(f"Command passed to check job status {_job_id}")
+                else:
+                    self.logger.error(
+                        f"Command failed to check job status {_job_id}, return code is %s."
+                        % status_code
+                    )
 
-                await self.error_handler(_response)
+                    await self.error_handler(_response)
 
-            raw = await _response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
-            if data["Message"] == "Task successfully scheduled.":
-                self.logger.info("Job id %s successfully scheduled." % _job_id)
-                return
-            else:
-                self.logger.warning(
-                    "JobStatus not scheduled, current status is: %s." % data["Message"]
-                )
+                raw = await _response.text("utf-8", "ignore")
+                data = json.loads(raw.strip())
+                message = data.get("Message")
+                job_state = data.get("JobState")
+                if message == "Task successfully scheduled." or job_state in [
+                    "Scheduled",
+                    "Completed",
+                ]:
+                    self.logger.info("Job id %s successfully scheduled." % _job_id)
+                    return
+                elif job_state in JOB_FINAL_STATES:
+                    self.logger.error(
+                        "Job %s finished as %s: %s" % (_job_id, job_state, message)
+                    )
+                    raise BadfishException
+                elif message is None and job_state is None:
+                    self.logger.warning(
+                        "JobStatus not scheduled, job %s has no state yet." % _job_id
+                    )
+                else:
+                    self.logger.warning(
+                        "JobStatus not scheduled, current status is: %s."
+                        % (message or job_state)
+                    )
+            if not await backoff.wait():
+                break
 
         self.logger.error("Not able to successfully schedule the job.")
         raise BadfishException
 
     async def get_reset_types(self, manager=False):
+        await self.discover("manager" if manager else "system")
         if manager:
             resource = self.manager_resource
             endpoint = "#Manager.Reset"
@@ -330,199 +1269,266 @@ class Badfish:
                         self.logger.warning("Could not get allowable reset types")
         return reset_types
 
-    async def read_yaml(self, _yaml_file):
-        with open(_yaml_file, "r") as f:
-            try:
-                definitions = yaml.safe_load(f)
-            except yaml.YAMLError as ex:
-                self.logger.error("Couldn't read file: %s" % _yaml_file)
-                self.logger.debug(ex)
-                raise BadfishException
-        return definitions
+    async def get_interfaces_index(self, _interfaces_path):
+        try:
+            return InterfacesIndex.load(_interfaces_path)
+        except yaml.YAMLError as ex:
+            self.logger.error("Couldn't read file: %s" % _interfaces_path)
+            self.logger.debug(ex)
+            raise BadfishException
 
     async def get_host_types_from_yaml(self, _interfaces_path):
-        definitions = await self.read_yaml(_interfaces_path)
-        host_types = set()
-        for line in definitions:
-            _split = line.split("_")
-            host_types.add(_split[0])
+        index = await self.get_interfaces_index(_interfaces_path)
+        return list(index.host_types)
 
-        ordered_types = sorted(list(host_types))
-        return ordered_types
+    @requires("system")
+    async def classify_boot_order(self, _interfaces_path):
+        index = await self.get_interfaces_index(_interfaces_path)
+        classifier = index.get_classifier(*self.get_host_fields())
+        await self.get_boot_devices()
+        boot_sequence = [
+            device["Name"]
+            for device in sorted(self.boot_devices, key=lambda x: x["Index"])
+        ]
+        return classifier.classify(boot_sequence)
 
+    @requires("system")
     async def get_host_type(self, _interfaces_path):
         await self.get_boot_devices()
 
         if _interfaces_path:
-            host_types = await self.get_host_types_from_yaml(_interfaces_path)
-            for host_type in host_types:
-                match = True
-                interfaces = await self.get_interfaces_by_type(
-                    host_type, _interfaces_path
+            classification = await self.classify_boot_order(_interfaces_path)
+            if not classification["match"] and classification["closest"]:
+                self.logger.debug(
+                    "Current boot order is closest to %s, %s position(s) differ."
+                    % (classification["closest"], classification["differences"])
                 )
-
-                for device in sorted(
-                    self.boot_devices[: len(interfaces)], key=lambda x: x["Index"]
-                ):
-                    if device["Name"] == interfaces[device["Index"]]:
-                        continue
-                    else:
-                        match = False
-                        break
-                if match:
-                    return host_type
+            return classification["match"]
 
         return None
 
-    async def validate_credentials(self):
-        response = await self.get_request(self.root_uri + "/Systems")
-
-        if response.status == 401:
+    async def detect_type(self, _interfaces_path):
+        if not _interfaces_path:
             self.logger.error(
-                f"Failed to authenticate. Verify your credentials for {self.host}"
+                "You must provide a path to the interfaces yaml via `-i` optional argument."
             )
             raise BadfishException
 
-        if response.status not in [200, 201]:
-            self.logger.error(f"Failed to communicate with {self.host}")
-            raise BadfishException
-
-    async def get_interfaces_endpoints(self):
-        _uri = "%s%s/EthernetInterfaces" % (self.host_uri, self.system_resource)
-        _response = await self.get_request(_uri)
-
-        raw = await _response.text("utf-8", "ignore")
-        data = json.loads(raw.strip())
-
-        if _response.status == 404:
-            self.logger.debug(raw)
-            self.logger.error(
-                "EthernetInterfaces entry point not supported by this host."
+        classification = await self.classify_boot_order(_interfaces_path)
+        if classification["match"]:
+            self.logger.info(
+                "Boot order matches host type: %s." % classification["match"]
+            )
+        elif classification["closest"]:
+            self.logger.warning(
+                "Boot order does not match any host type, closest is %s with %s "
+                "position(s) differing."
+                % (classification["closest"], classification["differences"])
             )
-            raise BadfishException
-
-        endpoints = []
-        if data.get("Members"):
-            for member in data["Members"]:
-                endpoints.append(member["@odata.id"])
         else:
-            self.logger.error(
-                "EthernetInterfaces's Members array is either empty or missing"
+            self.logger.warning(
+                "No host types on the interfaces yaml apply to %s." % self.host
             )
-            raise BadfishException
-
-        return endpoints
+        return classification
+
+    async def get_service_root(self):
+        # Systems and managers are discovered concurrently, both need the
+        # service root but only the first one to get here fetches it.
+        async with self.service_root_lock:
+            if self.service_root is None:
+                response = await self.get_request(self.root_uri)
+                try:
+                    raw = await response.text("utf-8", "ignore")
+                    self.service_root = json.loads(raw.strip())
+                except ValueError:
+                    self.logger.error("Failed to communicate with server.")
+                    raise BadfishException
+        return self.service_root
 
-    async def get_interface(self, endpoint):
-        _uri = "%s%s" % (self.host_uri, endpoint)
-        _response = await self.get_request(_uri)
+    async def get_resource_collection(self, resource):
+        data = await self.get_service_root()
+        if resource not in data:
+            self.logger.error("%s resource not found" % resource)
+            raise BadfishException
 
-        raw = await _response.text("utf-8", "ignore")
+        response = await self.get_request(self.host_uri + data[resource]["@odata.id"])
+        if response.status not in [200, 201]:
+            self.logger.error(f"Failed to communicate with {self.host}")
+            raise BadfishException
 
+        raw = await response.text("utf-8", "ignore")
+        return json.loads(raw.strip())
+
+    async def check_supported_queries(self):
+        expand = self.get_discovered("supported_expand")
+        select = self.get_discovered("supported_select")
+        if expand is None or select is None:
+            data = await self.get_service_root()
+            features = data.get("ProtocolFeaturesSupported") or {}
+            expand_query = features.get("ExpandQuery") or {}
+            expand = bool(expand_query.get("NoLinks") and expand_query.get("Levels"))
+            select = bool(features.get("SelectQuery"))
+            self.set_discovered("supported_expand", expand)
+            self.set_discovered("supported_select", select)
+
+        return expand, select
+
+    async def get_collection_page(self, uri):
+        _response = await self.get_request(uri)
         if _response.status == 404:
-            self.logger.debug(raw)
-            self.logger.error(
-                "EthernetInterface entry point not supported by this host."
-            )
+            self.logger.error("Server does not support this functionality")
             raise BadfishException
 
+        raw = await _response.text("utf-8", "ignore")
         data = json.loads(raw.strip())
-
+        if not isinstance(data, dict):
+            return {}
+        if "error" in data:
+            self.logger.debug(data["error"])
+            self.logger.error("Not able to access %s" % uri)
+            raise BadfishException
         return data
 
-    async def find_systems_resource(self):
-        response = await self.get_request(self.root_uri)
-        if response:
+    async def iter_collection(
+        self,
+        uri,
+        select=None,
+        member_filter=None,
+        fetch=False,
+        prefetch=False,
+        _continue=False,
+    ):
+        query = ""
+        if fetch:
+            expand, select_supported = await self.check_supported_queries()
+            if expand:
+                uri = "%s?$expand=.($levels=1)" % uri
+            if select and select_supported:
+                query = "?$select=%s" % ",".join(select)
+
+        # Only the page being yielded is held in memory, with prefetch the
+        # next one is already being read while the caller consumes it.
+        page = asyncio.ensure_future(self.get_collection_page(uri))
+        try:
+            while page:
+                data = await page
+                page = None
+                next_link = data.get("Members@odata.nextLink")
+                if next_link:
+                    if next_link.startswith("/"):
+                        next_link = "%s%s" % (self.host_uri, next_link)
+                    if prefetch:
+                        page = asyncio.ensure_future(
+                            self.get_collection_page(next_link)
+                        )
 
-            if response.status == 401:
-                self.logger.error("Failed to authenticate. Verify your credentials.")
-                raise BadfishException
+                members = [
+                    member
+                    for member in data.get("Members", [])
+                    if not member_filter or member_filter(member["@odata.id"])
+                ]
+                # BMCs that don't honour $expand only return the member
+                # links, so those still need to be fetched one by one.
+                if fetch:
+                    members = await asyncio.gather(
+                        *[
+                            self.get_collection_member(member, query, _continue)
+                            for member in members
+                        ]
+                    )
+                for member in members:
+                    if member:
+                        yield member
+
+                if next_link and not page:
+                    page = asyncio.ensure_future(self.get_collection_page(next_link))
+        finally:
+            if page and not page.done():
+                page.cancel()
+
+    async def get_collection_members(
+        self, uri, select=None, member_filter=None, _continue=False
+    ):
+        return [
+            member
+            async for member in self.iter_collection(
+                uri,
+                select,
+                member_filter,
+                fetch=True,
+                prefetch=True,
+                _continue=_continue,
+            )
+        ]
 
-            raw = await response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
-            if "Systems" not in data:
-                self.logger.error("Systems resource not found")
-                raise BadfishException
-            else:
-                systems = data["Systems"]["@odata.id"]
-                _response = await self.get_request(self.host_uri + systems)
-                if _response.status == 401:
-                    self.logger.error("Authorization Error: verify credentials.")
-                    raise BadfishException
+    async def get_collection_member(self, member, query="", _continue=False):
+        if len(member) > 1:
+            return member
 
-                raw = await _response.text("utf-8", "ignore")
-                data = json.loads(raw.strip())
-                if data.get("Members"):
-                    for member in data["Members"]:
-                        systems_service = member["@odata.id"]
-                        self.logger.debug("Systems service: %s." % systems_service)
-                        return systems_service
-                else:
-                    try:
-                        msg = (
-                            data.get("error")
-                            .get("@Message.ExtendedInfo")[0]
-                            .get("Message")
-                        )
-                        resolution = (
-                            data.get("error")
-                            .get("@Message.ExtendedInfo")[0]
-                            .get("Resolution")
-                        )
-                        self.logger.error(msg)
-                        self.logger.info(resolution)
-                    except (IndexError, TypeError, AttributeError):
-                        pass
-                    else:
-                        self.logger.error(
-                            "ComputerSystem's Members array is either empty or missing"
-                        )
-                    raise BadfishException
+        async with self.member_semaphore:
+            self.logger.debug("Getting member info for %s" % member["@odata.id"])
+            member_url = "%s%s%s" % (self.host_uri, member["@odata.id"], query)
+            member_response = await self.get_request(member_url, _continue)
+            if not member_response:
+                return None
+            member_raw = await member_response.text("utf-8", "ignore")
+
+        member_data = json.loads(member_raw.strip())
+        member_data.setdefault("@odata.id", member["@odata.id"])
+        return member_data
+
+    async def find_systems_resource(self):
+        data = await self.get_resource_collection("Systems")
+        if data.get("Members"):
+            for member in data["Members"]:
+                systems_service = member["@odata.id"]
+                self.logger.debug("Systems service: %s." % systems_service)
+                return systems_service
         else:
-            self.logger.error("Failed to communicate with server.")
+            try:
+                msg = data.get("error").get("@Message.ExtendedInfo")[0].get("Message")
+                resolution = (
+                    data.get("error").get("@Message.ExtendedInfo")[0].get("Resolution")
+                )
+                self.logger.error(msg)
+                self.logger.info(resolution)
+            except (IndexError, TypeError, AttributeError):
+                pass
+            else:
+                self.logger.error(
+                    "ComputerSystem's Members array is either empty or missing"
+                )
             raise BadfishException
 
     async def find_managers_resource(self):
-        response = await self.get_request(self.root_uri)
-        if response:
-            raw = await response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
-            if "Managers" not in data:
-                self.logger.error("Managers resource not found")
-                raise BadfishException
-            else:
-                managers = data["Managers"]["@odata.id"]
-                response = await self.get_request(self.host_uri + managers)
-                if response:
-                    raw = await response.text("utf-8", "ignore")
-                    data = json.loads(raw.strip())
-                    if data.get("Members"):
-                        for member in data["Members"]:
-                            managers_service = member["@odata.id"]
-                            self.logger.debug(
-                                "Managers service: %s." % managers_service
-                            )
-                            return managers_service
-                    else:
-                        self.logger.error(
-                            "Manager's Members array is either empty or missing"
-                        )
-                        raise BadfishException
+        data = await self.get_resource_collection("Managers")
+        if data.get("Members"):
+            for member in data["Members"]:
+                managers_service = member["@odata.id"]
+                self.logger.debug("Managers service: %s." % managers_service)
+                return managers_service
+        else:
+            self.logger.error("Manager's Members array is either empty or missing")
+            raise BadfishException
 
-    async def get_power_state(self):
+    @requires("system")
+    async def get_power_state(self, _continue=False):
         _uri = "%s%s" % (self.host_uri, self.system_resource)
         self.logger.debug("url: %s" % _uri)
 
+        # Only callers polling through a reboot expect the host to be
+        # unreachable, anywhere else that has to be reported.
         _response = await self.get_request(_uri, _continue=True)
-        if not _response:
-            return "Down"
-        if _response.status == 200:
-            raw = await _response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
-        else:
+        if not _response or _response.status != 200:
+            if not _continue:
+                self.logger.error("Failed to communicate with server.")
+                raise BadfishException
             self.logger.debug("Couldn't get power state. Retrying.")
             return "Down"
 
+        raw = await _response.text("utf-8", "ignore")
+        data = json.loads(raw.strip())
+
         if not data.get("PowerState"):
             self.logger.debug("Power state not found. Try to racreset.")
             raise BadfishException
@@ -531,6 +1537,7 @@ class Badfish:
 
         return data["PowerState"]
 
+    @requires("system")
     async def set_power_state(self, state):
         if state.lower() not in ["on", "off"]:
             self.logger.error("Power state not valid. 'on' or 'off' only accepted.")
@@ -564,20 +1571,24 @@ class Badfish:
 
         return data["PowerState"]
 
-    async def change_boot(self, host_type, interfaces_path, pxe=False):
-        if interfaces_path:
-            host_types = await self.get_host_types_from_yaml(interfaces_path)
-            if host_type.lower() not in host_types:
-                self.logger.error(f"Expected values for -t argument are: {host_types}")
-                raise BadfishException
-            if not os.path.exists(interfaces_path):
-                self.logger.error("No such file or directory: %s." % interfaces_path)
+    async def check_host_type(self, host_type, _interfaces_path):
+        if _interfaces_path:
+            if not os.path.exists(_interfaces_path):
+                self.logger.error("No such file or directory: %s." % _interfaces_path)
                 raise BadfishException
         else:
             self.logger.error(
                 "You must provide a path to the interfaces yaml via `-i` optional argument."
             )
             raise BadfishException
+        host_types = await self.get_host_types_from_yaml(_interfaces_path)
+        if host_type.lower() not in host_types:
+            self.logger.error(f"Expected values for -t argument are: {host_types}")
+            raise BadfishException
+
+    @requires("system", "manager")
+    async def change_boot(self, host_type, interfaces_path, pxe=False, wait_jobs=False):
+        await self.check_host_type(host_type, interfaces_path)
 
         _type = await self.get_host_type(interfaces_path)
         if (_type and _type.lower() != host_type.lower()) or not _type:
@@ -593,16 +1604,83 @@ class Badfish:
 
             await self.reboot_server(graceful=False)
 
+            if job_id and wait_jobs:
+                await self.wait_for_jobs([job_id])
+
         else:
             self.logger.warning(
                 "No changes were made since the boot order already matches the requested."
             )
         return True
 
-    async def change_boot_order(self, _host_type, _interfaces_path):
+    @requires("system", "manager")
+    async def plan_change_boot(self, host_type, interfaces_path, pxe=False):
+        await self.check_host_type(host_type, interfaces_path)
+
+        _type = await self.get_host_type(interfaces_path)
+        plan = {
+            "host_type": _type,
+            "target": host_type.lower(),
+            "clear_jobs": [],
+            "boot_order": [],
+            "pxe": False,
+            "reboot": False,
+        }
+        if (_type and _type.lower() != host_type.lower()) or not _type:
+            plan["clear_jobs"] = await self.get_job_queue()
+            ordered_devices = await self.get_boot_order_changes(
+                host_type, interfaces_path
+            )
+            current = {device["Name"]: device["Index"] for device in self.boot_devices}
+            for device in sorted(ordered_devices or [], key=lambda x: x["Index"]):
+                if current[device["Name"]] != device["Index"]:
+                    plan["boot_order"].append(
+                        {
+                            "Name": device["Name"],
+                            "From": current[device["Name"]],
+                            "To": device["Index"],
+                        }
+                    )
+            plan["pxe"] = pxe
+            plan["reboot"] = True
+
+        if plan["reboot"]:
+            changes = ["%s -> %s" % (_type or "unknown", plan["target"])]
+            if plan["clear_jobs"]:
+                changes.append("clear %s job(s)" % len(plan["clear_jobs"]))
+            if plan["boot_order"]:
+                changes.append(
+                    "boot order %s"
+                    % ", ".join(
+                        "%s %s->%s" % (move["Name"], move["From"] + 1, move["To"] + 1)
+                        for move in plan["boot_order"]
+                    )
+                )
+            if plan["pxe"]:
+                changes.append("set next boot to PXE")
+            changes.append("reboot")
+            self.logger.info("Plan for %s: %s." % (self.host, ", ".join(changes)))
+        else:
+            self.logger.info(
+                "Plan for %s: no changes, boot order already matches %s."
+                % (self.host, plan["target"])
+            )
+        return plan
+
+    @requires("system")
+    async def get_boot_order_changes(
+        self, _host_type, _interfaces_path, for_update=False
+    ):
+        interfaces = await self.get_boot_interfaces(
+            _host_type, _interfaces_path, for_update
+        )
+        return self.order_boot_devices(interfaces)
+
+    @requires("system")
+    async def get_boot_interfaces(self, _host_type, _interfaces_path, for_update=False):
         interfaces = await self.get_interfaces_by_type(_host_type, _interfaces_path)
 
-        await self.get_boot_devices()
+        await self.get_boot_devices(for_update=for_update)
         devices = [device["Name"] for device in self.boot_devices]
         valid_devices = [device for device in interfaces if device in devices]
         if len(valid_devices) < len(interfaces):
@@ -611,9 +1689,12 @@ class Badfish:
                 "Some interfaces are not valid boot devices. Ignoring: %s"
                 % ", ".join(diff)
             )
+        return valid_devices
+
+    def order_boot_devices(self, interfaces):
         change = False
-        ordered_devices = self.boot_devices.copy()
-        for i, interface in enumerate(valid_devices):
+        ordered_devices = [dict(device) for device in self.boot_devices]
+        for i, interface in enumerate(interfaces):
             for device in ordered_devices:
                 if interface == device["Name"]:
                     if device["Index"] != i:
@@ -622,29 +1703,88 @@ class Badfish:
                     break
 
         if change:
-            await self.patch_boot_seq(ordered_devices)
+            return ordered_devices
+        return None
+
+    @requires("system")
+    async def change_boot_order(self, _host_type, _interfaces_path):
+        interfaces = await self.get_boot_interfaces(
+            _host_type, _interfaces_path, for_update=True
+        )
+        ordered_devices = self.order_boot_devices(interfaces)
+        if ordered_devices:
+            await self.patch_boot_seq(ordered_devices, interfaces)
         else:
             self.logger.warning(
                 "No changes were made since the boot order already matches the requested."
             )
 
-    async def patch_boot_seq(self, ordered_devices):
-        _boot_seq = await self.get_boot_seq()
+    async def get_etag(self, uri):
+        _response = await self.get_request(uri, _continue=True)
+        if not _response or _response.status not in [200, 304]:
+            return None
+        # Weak validators never satisfy If-Match, so only strong ones are
+        # used to guard a PATCH.
+        etag = _response.headers.get("ETag")
+        if isinstance(etag, str) and not etag.startswith("W/"):
+            return etag
+        return None
+
+    @requires("system")
+    async def patch_boot_seq(self, ordered_devices, interfaces=None):
+        _boot_seq = self.boot_seq or await self.get_boot_seq()
         boot_sources_uri = "%s/BootSources/Settings" % self.system_resource
         url = "%s%s" % (self.host_uri, boot_sources_uri)
-        payload = {"Attributes": {_boot_seq: ordered_devices}}
-        headers = {"content-type": "application/json"}
         response = None
         _status_code = 400
-
-        for _ in range(self.retries):
-            if _status_code != 200:
-                response = await self.patch_request(url, payload, headers, True)
-                if response:
-                    raw = await response.text("utf-8", "ignore")
-                    self.logger.debug(raw)
-                    _status_code = response.status
-            else:
+        refreshes = 0
+
+        backoff = self.get_backoff()
+        while True:
+            payload = {"Attributes": {_boot_seq: ordered_devices}}
+            headers = {"content-type": "application/json"}
+            if self.boot_settings_etag:
+                headers["If-Match"] = self.boot_settings_etag
+            response = await self.patch_request(url, payload, headers, True)
+            if response:
+                raw = await response.text("utf-8", "ignore")
+                self.logger.debug(raw)
+                _status_code = response.status
+            if _status_code == 412:
+                if interfaces is None:
+                    self.logger.error(
+                        "Boot sources changed since they were read, boot order "
+                        "was not updated."
+                    )
+                    raise BadfishException
+                if refreshes >= self.retries:
+                    self.logger.error(
+                        "Boot sources kept changing, boot order was not updated."
+                    )
+                    raise BadfishException
+                refreshes += 1
+                # Someone else changed the boot sources since they were read,
+                # apply the requested order again on top of their current state
+                # so the devices it doesn't touch keep what they have now.
+                self.logger.debug("Boot sources changed, refreshing before retry.")
+                await self.get_boot_devices(refresh=True, for_update=True)
+                devices = [device["Name"] for device in self.boot_devices]
+                missing = [device for device in interfaces if device not in devices]
+                if missing:
+                    self.logger.error(
+                        "Boot sources changed and no longer include: %s. "
+                        "Boot order was not updated." % ", ".join(missing)
+                    )
+                    raise BadfishException
+                ordered_devices = self.order_boot_devices(interfaces)
+                if not ordered_devices:
+                    self.logger.warning(
+                        "No changes were made since the boot order already matches "
+                        "the requested."
+                    )
+                    return
+                continue
+            if _status_code == 200 or not await backoff.wait():
                 break
 
         if _status_code == 200:
@@ -655,6 +1795,7 @@ class Badfish:
             if response:
                 await self.error_handler(response)
 
+    @requires("system")
     async def set_next_boot_pxe(self):
         _url = "%s%s" % (self.host_uri, self.system_resource)
         _payload = {
@@ -664,9 +1805,11 @@ class Badfish:
             }
         }
         _headers = {"content-type": "application/json"}
-        _response = await self.patch_request(_url, _payload, _headers)
-
-        await asyncio.sleep(5)
+        backoff = self.get_backoff()
+        while True:
+            _response = await self.patch_request(_url, _payload, _headers)
+            if _response.status != 503 or not await backoff.wait():
+                break
 
         if _response.status == 200:
             self.logger.info(
@@ -679,9 +1822,14 @@ class Badfish:
             await self.error_handler(_response)
 
     async def check_supported_idrac_version(self):
-        _url = "%s/Dell/Managers/iDRAC.Embedded.1/DellJobService/" % self.root_uri
-        _response = await self.get_request(_url)
-        if _response.status != 200:
+        supported = self.get_discovered("supported_DellJobService")
+        if supported is None:
+            _url = "%s/Dell/Managers/iDRAC.Embedded.1/DellJobService/" % self.root_uri
+            _response = await self.get_request(_url)
+            supported = _response.status == 200
+            self.set_discovered("supported_DellJobService", supported)
+
+        if not supported:
             self.logger.warning(
                 "iDRAC version installed does not support DellJobService"
             )
@@ -689,13 +1837,16 @@ class Badfish:
 
         return True
 
+    @requires("system")
     async def check_supported_network_interfaces(self, endpoint):
-        _url = "%s%s/%s" % (self.host_uri, self.system_resource, endpoint)
-        _response = await self.get_request(_url)
-        if _response.status != 200:
-            return False
+        supported = self.get_discovered("supported_%s" % endpoint)
+        if supported is None:
+            _url = "%s%s/%s" % (self.host_uri, self.system_resource, endpoint)
+            _response = await self.get_request(_url)
+            supported = _response.status == 200
+            self.set_discovered("supported_%s" % endpoint, supported)
 
-        return True
+        return supported
 
     async def delete_job_queue_dell(self, force):
         _url = (
@@ -721,6 +1872,7 @@ class Badfish:
             )
             raise BadfishException
 
+    @requires("manager")
     async def delete_job_queue_force(self):
         _url = "%s%s/Jobs" % (self.host_uri, self.manager_resource)
         _headers = {"content-type": "application/json"}
@@ -732,17 +1884,29 @@ class Badfish:
             raise
         return _response
 
+    @requires("manager")
     async def clear_job_list(self, _job_queue):
         _url = "%s%s/Jobs" % (self.host_uri, self.manager_resource)
         _headers = {"content-type": "application/json"}
         self.logger.warning("Clearing job queue for job IDs: %s." % _job_queue)
-        failed = False
-        for _job in _job_queue:
-            job = _job.strip("'")
-            url = "/".join([_url, job])
-            response = await self.delete_request(url, _headers)
-            if response.status != 200:
-                failed = True
+        semaphore = asyncio.Semaphore(JOB_DELETE_CONCURRENCY)
+
+        async def delete_job(job):
+            async with semaphore:
+                try:
+                    response = await self.delete_request(
+                        "/".join([_url, job]), _headers
+                    )
+                except BadfishException:
+                    return "no response"
+            if response.status not in [200, 204]:
+                return "status code %s" % response.status
+            return None
+
+        errors = await asyncio.gather(*[delete_job(job) for job in _job_queue])
+        failed = {job: error for job, error in zip(_job_queue, errors) if error}
+        for job, error in failed.items():
+            self.logger.warning("Could not delete job %s, %s." % (job, error))
 
         if not failed:
             self.logger.info("Job queue for iDRAC %s successfully cleared." % self.host)
@@ -752,6 +1916,7 @@ class Badfish:
             )
             raise BadfishException
 
+    @requires("manager")
     async def clear_job_queue(self, force=False):
         _job_queue = await self.get_job_queue()
         if _job_queue or force:
@@ -772,6 +1937,7 @@ class Badfish:
                 % self.host
             )
 
+    @requires("manager")
     async def list_job_queue(self):
         _job_queue = await self.get_job_queue()
         if _job_queue:
@@ -780,6 +1946,7 @@ class Badfish:
                 self.logger.info(job)
         else:
             self.logger.info("No active jobs found.")
+        return _job_queue
 
     async def create_job(self, _url, _payload, _headers, expected=None):
         if not expected:
@@ -798,12 +1965,21 @@ class Badfish:
 
             await self.error_handler(_response)
 
+        location = _response.headers.get("Location")
+        if isinstance(location, str):
+            job_id = re.search(r"[JR]ID_\d+", location)
+            if job_id:
+                return job_id.group()
+        return None
+
+    @requires("manager")
     async def create_bios_config_job(self, uri):
         _url = "%s%s/Jobs" % (self.host_uri, self.manager_resource)
         _payload = {"TargetSettingsURI": "%s%s" % (self.redfish_uri, uri)}
         _headers = {"content-type": "application/json"}
-        await self.create_job(_url, _payload, _headers)
+        return await self.create_job(_url, _payload, _headers)
 
+    @requires("system")
     async def send_reset(self, reset_type):
         _url = "%s%s/Actions/ComputerSystem.Reset" % (
             self.host_uri,
@@ -819,7 +1995,6 @@ class Badfish:
                 "Command passed to %s server, code return is %s."
                 % (reset_type, status_code)
             )
-            await asyncio.sleep(10)
         elif status_code == 409:
             self.logger.warning(
                 "Command failed to %s server, host appears to be already in that state."
@@ -833,6 +2008,7 @@ class Badfish:
 
             await self.error_handler(_response)
 
+    @requires("system")
     async def reboot_server(self, graceful=True):
         _reset_types = await self.get_reset_types()
         reset_type = "GracefulRestart"
@@ -854,18 +2030,25 @@ class Badfish:
                         "Unable to graceful shutdown the server, will perform forced shutdown now."
                     )
                     await self.send_reset("ForceOff")
+                    host_down = await self.polling_host_state("Off")
             else:
                 await self.send_reset("ForceOff")
+                host_down = await self.polling_host_state("Off")
 
-            host_not_down = await self.polling_host_state("Down", False)
+            if not host_down:
+                self.logger.error(
+                    "Server %s did not power off, it will not be powered on."
+                    % self.host
+                )
+                raise BadfishException
 
-            if host_not_down:
-                await self.send_reset("On")
+            await self.send_reset("On")
 
         elif power_state.lower() == "off":
             await self.send_reset("On")
         return True
 
+    @requires("manager")
     async def reset_idrac(self):
         self.logger.debug("Running reset iDRAC.")
         _reset_types = await self.get_reset_types(manager=True)
@@ -899,8 +2082,10 @@ class Badfish:
         )
         return True
 
+    @requires("system")
     async def reset_bios(self):
         self.logger.debug("Running BIOS reset.")
+        self.forget_discovered("boot_mode")
         _url = "%s%s/Bios/Actions/Bios.ResetBios/" % (
             self.host_uri,
             self.system_resource,
@@ -927,6 +2112,7 @@ class Badfish:
         self.logger.info("BIOS will now reset and be back online within a few minutes.")
         return True
 
+    @requires("system", "manager")
     async def boot_to(self, device):
         device_check = await self.check_device(device)
         if device_check:
@@ -937,34 +2123,41 @@ class Badfish:
             raise BadfishException
         return True
 
+    @requires("system", "manager")
     async def boot_to_type(self, host_type, _interfaces_path):
-        if _interfaces_path:
-            if not os.path.exists(_interfaces_path):
-                self.logger.error("No such file or directory: %s." % _interfaces_path)
-                raise BadfishException
-        else:
-            self.logger.error(
-                "You must provide a path to the interfaces yaml via `-i` optional argument."
-            )
-            raise BadfishException
-        host_types = await self.get_host_types_from_yaml(_interfaces_path)
-        if host_type.lower() not in host_types:
-            self.logger.error(f"Expected values for -t argument are: {host_types}")
-            raise BadfishException
+        await self.check_host_type(host_type, _interfaces_path)
 
         device = await self.get_host_type_boot_device(host_type, _interfaces_path)
 
         await self.boot_to(device)
 
-    async def boot_to_mac(self, mac_address):
-        interfaces_endpoints = await self.get_interfaces_endpoints()
+    @requires("system", "manager")
+    async def plan_boot_to_type(self, host_type, _interfaces_path):
+        await self.check_host_type(host_type, _interfaces_path)
 
-        device = None
-        for endpoint in interfaces_endpoints:
-            interface = await self.get_interface(endpoint)
-            if interface.get("MACAddress", "").upper() == mac_address.upper():
-                device = interface.get("Id")
-                break
+        device = await self.get_host_type_boot_device(host_type, _interfaces_path)
+        if not await self.check_device(device):
+            raise BadfishException
+
+        plan = {
+            "device": device,
+            "clear_jobs": await self.get_job_queue(),
+            "one_time_boot": True,
+        }
+        changes = []
+        if plan["clear_jobs"]:
+            changes.append("clear %s job(s)" % len(plan["clear_jobs"]))
+        changes.append("one time boot to %s" % device)
+        self.logger.info("Plan for %s: %s." % (self.host, ", ".join(changes)))
+        return plan
+
+    @requires("system", "manager")
+    async def boot_to_mac(self, mac_address):
+        mac_addresses = self.get_discovered("mac_addresses") or {}
+        device = mac_addresses.get(mac_address.upper())
+        if not device:
+            mac_addresses = await self.get_mac_addresses(refresh=True)
+            device = mac_addresses.get(mac_address.upper())
 
         if device:
             await self.boot_to(device)
@@ -972,6 +2165,89 @@ class Badfish:
             self.logger.error("MAC Address does not match any of the existing")
             raise BadfishException
 
+    async def find_mac(self, mac_address):
+        # A fresh index is trusted on a miss, otherwise a lookup across a host
+        # list would crawl every host that doesn't own the address.
+        mac_addresses = await self.get_mac_addresses()
+        device = mac_addresses.get(mac_address.upper())
+        if device:
+            self.logger.info(
+                "MAC address %s belongs to %s on host %s."
+                % (mac_address, device, self.host)
+            )
+        else:
+            self.logger.debug(
+                "MAC address %s not found on host %s." % (mac_address, self.host)
+            )
+        return device
+
+    @requires("system")
+    async def get_mac_addresses(self, refresh=False):
+        mac_addresses = None if refresh else self.get_discovered("mac_addresses")
+        if mac_addresses is not None:
+            return mac_addresses
+
+        na_supported, ei_supported = await asyncio.gather(
+            self.check_supported_network_interfaces("NetworkAdapters"),
+            self.check_supported_network_interfaces("EthernetInterfaces"),
+        )
+        lookups = []
+        if ei_supported:
+            lookups.append(self.get_ethernet_interfaces_macs())
+        if na_supported:
+            lookups.append(self.get_network_functions_macs())
+
+        mac_addresses = {}
+        # EthernetInterfaces ids are what older badfish versions booted to,
+        # so they take precedence over NetworkDeviceFunctions ids.
+        for result in reversed(await asyncio.gather(*lookups)):
+            mac_addresses.update(result)
+
+        self.set_discovered("mac_addresses", mac_addresses)
+        return mac_addresses
+
+    @requires("system")
+    async def get_ethernet_interfaces_macs(self):
+        _url = "%s%s/EthernetInterfaces" % (self.host_uri, self.system_resource)
+        try:
+            interfaces = await self.get_collection_members(_url, ["Id", "MACAddress"])
+        except ValueError:
+            self.logger.error("There was something wrong getting network interfaces")
+            raise BadfishException
+
+        mac_addresses = {}
+        for interface in interfaces:
+            if interface.get("MACAddress") and interface.get("Id"):
+                mac_addresses[interface["MACAddress"].upper()] = interface["Id"]
+        return mac_addresses
+
+    @requires("system")
+    async def get_network_functions_macs(self):
+        _url = "%s%s/NetworkAdapters" % (self.host_uri, self.system_resource)
+        try:
+            functions = await asyncio.gather(
+                *[
+                    self.get_collection_members(
+                        "%s%s/NetworkDeviceFunctions"
+                        % (self.host_uri, member["@odata.id"]),
+                        ["Id", "Ethernet"],
+                    )
+                    async for member in self.iter_collection(_url)
+                ]
+            )
+        except (ValueError, AttributeError):
+            self.logger.error("There was something wrong getting network interfaces")
+            raise BadfishException
+
+        mac_addresses = {}
+        for adapter_functions in functions:
+            for function in adapter_functions:
+                ethernet = function.get("Ethernet") or {}
+                if ethernet.get("MACAddress") and function.get("Id"):
+                    mac_addresses[ethernet["MACAddress"].upper()] = function["Id"]
+        return mac_addresses
+
+    @requires("system")
     async def send_one_time_boot(self, device):
         _url = "%s%s" % (self.root_uri, self.bios_uri)
         _payload = {
@@ -1003,19 +2279,25 @@ class Badfish:
                     continue
                 await self.error_handler(_response)
 
+    @requires("system")
     async def check_boot(self, _interfaces_path):
         if _interfaces_path:
 
-            _host_type = await self.get_host_type(_interfaces_path)
+            classification = await self.classify_boot_order(_interfaces_path)
 
-            if _host_type:
-                self.logger.warning("Current boot order is set to: %s." % _host_type)
+            if classification["match"]:
+                self.logger.warning(
+                    "Current boot order is set to: %s." % classification["match"]
+                )
             else:
-                await self.get_boot_devices()
-
                 self.logger.warning(
                     "Current boot order does not match any of the given."
                 )
+                if classification["closest"]:
+                    self.logger.warning(
+                        "Closest match is %s, %s position(s) differ."
+                        % (classification["closest"], classification["differences"])
+                    )
                 self.logger.info("Current boot order:")
                 for device in sorted(self.boot_devices, key=lambda x: x["Index"]):
                     if device["Enabled"]:
@@ -1040,8 +2322,28 @@ class Badfish:
                     self.logger.info(
                         "%s: %s (DISABLED)" % (int(device["Index"]) + 1, device["Name"])
                     )
-        return True
 
+        return await self.get_boot_order(_interfaces_path)
+
+    @requires("system")
+    async def get_boot_order(self, _interfaces_path=None):
+        classification = {}
+        if _interfaces_path:
+            classification = await self.classify_boot_order(_interfaces_path)
+        else:
+            await self.get_boot_devices()
+
+        boot_order = [
+            {
+                "Index": device["Index"],
+                "Name": device["Name"],
+                "Enabled": device["Enabled"],
+            }
+            for device in sorted(self.boot_devices, key=lambda x: x["Index"])
+        ]
+        return dict(classification, BootOrder=boot_order)
+
+    @requires("system")
     async def check_device(self, device):
         self.logger.debug("Checking device %s." % device)
         await self.get_boot_devices()
@@ -1056,65 +2358,151 @@ class Badfish:
             )
             return False
 
+    async def get_event_stream_uri(self):
+        uri = self.get_discovered("event_stream_uri")
+        if uri is None:
+            uri = ""
+            _url = "%s/EventService" % self.root_uri
+            _response = await self.get_request(_url, _continue=True)
+            if _response and _response.status == 200:
+                try:
+                    raw = await _response.text("utf-8", "ignore")
+                    data = json.loads(raw.strip())
+                except ValueError:
+                    data = {}
+                if data.get("ServiceEnabled", True):
+                    uri = data.get("ServerSentEventUri") or ""
+            self.set_discovered("event_stream_uri", uri)
+        return uri
+
+    def is_power_event(self, payload):
+        for event in payload.get("Events") or [payload]:
+            origin = event.get("OriginOfCondition") or ""
+            if isinstance(origin, dict):
+                origin = origin.get("@odata.id") or ""
+            message = "%s %s" % (event.get("MessageId", ""), event.get("Message", ""))
+            if (
+                "PowerState" in event
+                or "power" in message.lower()
+                or origin.rstrip("/") == self.system_resource
+            ):
+                return True
+        return False
+
+    @requires("system")
+    async def get_event_listener(self, timeout=None):
+        if self.event_listener is None:
+            self.event_listener = False
+            uri = await self.get_event_stream_uri()
+            if uri:
+                if not uri.startswith("http"):
+                    uri = "%s%s" % (self.host_uri, uri)
+                headers = {}
+                auth = None
+                if self.token:
+                    headers["X-Auth-Token"] = self.token
+                else:
+                    auth = aiohttp.BasicAuth(self.username, self.password)
+                listener = EventListener(
+                    self.session, uri, self.logger, self.is_power_event, headers, auth
+                )
+                # A BMC that accepts the connection but never answers must not
+                # hold the wait past its deadline.
+                try:
+                    if await asyncio.wait_for(
+                        listener.start(), timeout or self.timeout
+                    ):
+                        self.event_listener = listener
+                except asyncio.TimeoutError:
+                    self.logger.debug("Timed out opening the event stream.")
+                except (Exception, TimeoutError) as ex:
+                    self.logger.debug(ex)
+            if not self.event_listener:
+                self.logger.debug(
+                    "Event stream not available, polling for power state."
+                )
+        return self.event_listener or None
+
+    async def wait_host_state(self, listener, state, backoff, equals=True):
+        # Events only wake the waiter early, the power state is always read back
+        # and also rechecked periodically in case an event is missed.
+        while listener.running:
+            listener.clear()
+            current_state = await self.get_power_state(_continue=True)
+            desired_state = (current_state.lower() == state.lower()) == equals
+            if desired_state or backoff.remaining <= 0:
+                self.progress_bar(backoff.timeout, backoff.timeout, current_state)
+                return desired_state
+            self.progress_bar(backoff.elapsed, backoff.timeout, current_state)
+            await listener.wait(min(backoff.remaining, EVENT_RECHECK_INTERVAL))
+        return None
+
     async def polling_host_state(self, state, equals=True):
         state_str = "Not %s" % state if not equals else state
         self.logger.info("Polling for host state: %s" % state_str)
-        desired_state = False
-        for count in range(self.retries):
-            current_state = await self.get_power_state()
+        # The event wait and the polling fallback share one deadline.
+        backoff = self.get_backoff()
+        if self.events:
+            listener = await self.get_event_listener(backoff.remaining)
+            if listener:
+                desired_state = await self.wait_host_state(
+                    listener, state, backoff, equals
+                )
+                if desired_state is not None:
+                    return desired_state
+                self.logger.debug("Event stream closed, polling for power state.")
+
+        while True:
+            current_state = await self.get_power_state(_continue=True)
             if equals:
                 desired_state = current_state.lower() == state.lower()
             else:
                 desired_state = current_state.lower() != state.lower()
-            await asyncio.sleep(5)
             if desired_state:
-                self.progress_bar(self.retries, self.retries, current_state)
+                self.progress_bar(backoff.timeout, backoff.timeout, current_state)
+                break
+            self.progress_bar(backoff.elapsed, backoff.timeout, current_state)
+            if not await backoff.wait():
                 break
-            self.progress_bar(count, self.retries, current_state)
 
         return desired_state
 
-    async def get_firmware_inventory(self):
+    async def get_firmware_devices(self):
         self.logger.debug(
             "Getting firmware inventory for all devices supported by iDRAC."
         )
 
-        _url = "%s/UpdateService/FirmwareInventory/" % self.root_uri
-        _response = await self.get_request(_url)
-
+        _url = "%s/UpdateService/FirmwareInventory" % self.root_uri
         try:
-            raw = await _response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
+            devices = await self.get_collection_members(
+                _url,
+                member_filter=lambda member: "Installed" in member.split("/")[-1],
+                _continue=True,
+            )
         except ValueError:
             self.logger.error("Not able to access Firmware inventory.")
             raise BadfishException
-        installed_devices = []
-        if "error" in data:
-            self.logger.debug(data["error"])
-            self.logger.error("Not able to access Firmware inventory.")
-            raise BadfishException
-        for device in data["Members"]:
-            a = device["@odata.id"]
-            a = a.replace("/redfish/v1/UpdateService/FirmwareInventory/", "")
-            if "Installed" in a:
-                installed_devices.append(a)
 
-        for device in installed_devices:
-            self.logger.debug("Getting device info for %s" % device)
-            _uri = "%s/UpdateService/FirmwareInventory/%s" % (self.root_uri, device)
-
-            _response = await self.get_request(_uri, _continue=True)
-            if not _response:
-                continue
-
-            raw = await _response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
+        inventory = []
+        for data in devices:
+            device = {}
             for info in data.items():
                 if "odata" not in info[0] and "Description" not in info[0]:
-                    self.logger.info("%s: %s" % (info[0], info[1]))
+                    device[info[0]] = info[1]
+            inventory.append(device)
+
+        return inventory
+
+    async def get_firmware_inventory(self):
+        inventory = await self.get_firmware_devices()
+        for device in inventory:
+            for info in device.items():
+                self.logger.info("%s: %s" % (info[0], info[1]))
 
             self.logger.info("*" * 48)
 
+        return inventory
+
     async def get_host_type_boot_device(self, host_type, _interfaces_path):
         if _interfaces_path:
             interfaces = await self.get_interfaces_by_type(host_type, _interfaces_path)
@@ -1126,6 +2514,7 @@ class Badfish:
 
         return interfaces[0]
 
+    @requires("manager")
     async def get_virtual_media_config_uri(self):
         _url = "%s%s" % (self.host_uri, self.manager_resource)
         _response = await self.get_request(_url)
@@ -1163,6 +2552,7 @@ class Badfish:
 
         return None
 
+    @requires("manager")
     async def get_virtual_media(self):
         _url = "%s%s" % (self.host_uri, self.manager_resource)
         _response = await self.get_request(_url)
@@ -1180,15 +2570,10 @@ class Badfish:
             virtual_media = vm_endpoint.get("@odata.id")
             if virtual_media:
                 vm_url = "%s%s" % (self.host_uri, virtual_media)
-                vm_response = await self.get_request(vm_url)
                 try:
-                    raw = await vm_response.text("utf-8", "ignore")
-                    vm_data = json.loads(raw.strip())
-
-                    if vm_data.get("Members"):
-                        for member in vm_data["Members"]:
-                            vms.append(member["@odata.id"])
-                    else:
+                    async for member in self.iter_collection(vm_url):
+                        vms.append(member["@odata.id"])
+                    if not vms:
                         self.logger.warning("No active VirtualMedia found")
                         return vms
 
@@ -1204,8 +2589,10 @@ class Badfish:
 
         return vms
 
+    @requires("manager")
     async def check_virtual_media(self):
         vms = await self.get_virtual_media()
+        media = []
         for vm in vms:
             disc_url = "%s%s" % (self.host_uri, vm)
             disc_response = await self.get_request(disc_url)
@@ -1219,14 +2606,23 @@ class Badfish:
                 self.logger.info(
                     f"ID: {_id} - Name: {name} - ImageName: {image_name} - Inserted: {inserted}"
                 )
+                media.append(
+                    {
+                        "Id": _id,
+                        "Name": name,
+                        "ImageName": image_name,
+                        "Inserted": inserted,
+                    }
+                )
             except ValueError:
                 self.logger.error(
                     "There was something wrong getting values for VirtualMedia"
                 )
                 raise BadfishException
 
-        return True
+        return media
 
+    @requires("manager")
     async def unmount_virtual_media(self):
 
         vmc = await self.get_virtual_media_config_uri()
@@ -1254,78 +2650,20 @@ class Badfish:
 
         return True
 
+    @requires("system")
     async def get_network_adapters(self):
         _url = "%s%s/NetworkAdapters" % (self.host_uri, self.system_resource)
-        _response = await self.get_request(_url)
         try:
-            raw = await _response.text("utf-8", "ignore")
-            na_data = json.loads(raw.strip())
-
-            root_nics = []
-            if na_data.get("Members"):
-                for member in na_data["Members"]:
-                    root_nics.append(member["@odata.id"])
+            root_nics = [
+                member["@odata.id"] async for member in self.iter_collection(_url)
+            ]
 
+            adapters = await asyncio.gather(
+                *[self.get_network_adapter(nic) for nic in root_nics]
+            )
             data = {}
-            for nic in root_nics:
-                net_ports_url = "%s%s/NetworkPorts" % (self.host_uri, nic)
-                rn_response = await self.get_request(net_ports_url)
-                rn_raw = await rn_response.text("utf-8", "ignore")
-                rn_data = json.loads(rn_raw.strip())
-
-                nic_ports = []
-                if rn_data.get("Members"):
-                    for member in rn_data["Members"]:
-                        nic_ports.append(member["@odata.id"])
-
-                net_df_url = "%s%s/NetworkDeviceFunctions" % (self.host_uri, nic)
-                ndf_response = await self.get_request(net_df_url)
-                ndf_raw = await ndf_response.text("utf-8", "ignore")
-                ndf_data = json.loads(ndf_raw.strip())
-
-                ndf_members = []
-                if ndf_data.get("Members"):
-                    for member in ndf_data["Members"]:
-                        ndf_members.append(member["@odata.id"])
-
-                for i, nic_port in enumerate(nic_ports):
-                    np_url = "%s%s" % (self.host_uri, nic_port)
-                    np_response = await self.get_request(np_url)
-                    np_raw = await np_response.text("utf-8", "ignore")
-                    np_data = json.loads(np_raw.strip())
-
-                    interface = nic_port.split("/")[-1]
-
-                    fields = [
-                        "Id",
-                        "LinkStatus",
-                        "SupportedLinkCapabilities",
-                    ]
-                    values = {}
-                    for field in fields:
-                        value = np_data.get(field)
-                        if value:
-                            values[field] = value
-
-                    ndf_url = "%s%s" % (self.host_uri, ndf_members[i])
-                    ndf_response = await self.get_request(ndf_url)
-                    ndf_raw = await ndf_response.text("utf-8", "ignore")
-                    ndf_data = json.loads(ndf_raw.strip())
-                    oem = ndf_data.get("Oem")
-                    ethernet = ndf_data.get("Ethernet")
-                    if ethernet:
-                        mac_address = ethernet.get("MACAddress")
-                        if mac_address:
-                            values["MACAddress"] = mac_address
-                    if oem:
-                        dell = oem.get("Dell")
-                        if dell:
-                            dell_nic = dell.get("DellNIC")
-                            vendor = dell_nic.get("VendorName")
-                            if dell_nic.get("VendorName"):
-                                values["Vendor"] = vendor
-
-                    data.update({interface: values})
+            for adapter in adapters:
+                data.update(adapter)
 
         except (ValueError, AttributeError):
             self.logger.error("There was something wrong getting network interfaces")
@@ -1333,38 +2671,85 @@ class Badfish:
 
         return data
 
+    @staticmethod
+    def get_port_function(port, functions):
+        # Functions reference their physical port through Links, older
+        # firmware only exposes the partition Id, e.g. NIC.Slot.1-1 -> NIC.Slot.1-1-1
+        for function in functions:
+            links = function.get("Links") or {}
+            assignment = links.get("PhysicalPortAssignment") or {}
+            if assignment.get("@odata.id") == port["@odata.id"]:
+                return function
+
+        port_id = port.get("Id") or port["@odata.id"].split("/")[-1]
+        partitions = [
+            function
+            for function in functions
+            if str(function.get("Id", "")).startswith("%s-" % port_id)
+        ]
+        if partitions:
+            return sorted(partitions, key=lambda function: function["Id"])[0]
+        return {}
+
+    async def get_network_adapter(self, nic):
+        fields = [
+            "Id",
+            "LinkStatus",
+            "SupportedLinkCapabilities",
+        ]
+        net_ports_url = "%s%s/NetworkPorts" % (self.host_uri, nic)
+        net_df_url = "%s%s/NetworkDeviceFunctions" % (self.host_uri, nic)
+        nic_ports, ndf_members = await asyncio.gather(
+            self.get_collection_members(net_ports_url, fields),
+            self.get_collection_members(net_df_url, ["Id", "Ethernet", "Oem", "Links"]),
+        )
+
+        data = {}
+        for np_data in nic_ports:
+            interface = np_data["@odata.id"].split("/")[-1]
+
+            values = {}
+            for field in fields:
+                value = np_data.get(field)
+                if value:
+                    values[field] = value
+
+            ndf_data = self.get_port_function(np_data, ndf_members)
+            oem = ndf_data.get("Oem")
+            ethernet = ndf_data.get("Ethernet")
+            if ethernet:
+                mac_address = ethernet.get("MACAddress")
+                if mac_address:
+                    values["MACAddress"] = mac_address
+            if oem:
+                dell = oem.get("Dell")
+                if dell:
+                    dell_nic = dell.get("DellNIC")
+                    vendor = dell_nic.get("VendorName")
+                    if dell_nic.get("VendorName"):
+                        values["Vendor"] = vendor
+
+            data.update({interface: values})
+
+        return data
+
+    @requires("system")
     async def get_ethernet_interfaces(self):
         _url = "%s%s/EthernetInterfaces" % (self.host_uri, self.system_resource)
-        _response = await self.get_request(_url)
-
-        if _response.status == 404:
-            self.logger.error("Server does not support this functionality")
-            raise BadfishException
+        fields = [
+            "Name",
+            "MACAddress",
+            "Status",
+            "LinkStatus",
+            "SpeedMbps",
+        ]
 
         try:
-            raw = await _response.text("utf-8", "ignore")
-            ei_data = json.loads(raw.strip())
-
-            interfaces = []
-            if ei_data.get("Members"):
-                for member in ei_data["Members"]:
-                    interfaces.append(member["@odata.id"])
+            interfaces = await self.get_collection_members(_url, ["Id"] + fields)
 
             data = {}
-            for interface in interfaces:
-                interface_url = "%s%s" % (self.host_uri, interface)
-                int_response = await self.get_request(interface_url)
-                int_raw = await int_response.text("utf-8", "ignore")
-                int_data = json.loads(int_raw.strip())
-
+            for int_data in interfaces:
                 int_name = int_data.get("Id")
-                fields = [
-                    "Name",
-                    "MACAddress",
-                    "Status",
-                    "LinkStatus",
-                    "SpeedMbps",
-                ]
 
                 values = {}
                 for field in fields:
@@ -1380,19 +2765,25 @@ class Badfish:
 
         return data
 
-    async def list_interfaces(self):
+    @requires("system")
+    async def get_network_interfaces(self):
         na_supported = await self.check_supported_network_interfaces("NetworkAdapters")
         ei_supported = await self.check_supported_network_interfaces(
             "EthernetInterfaces"
         )
         if na_supported:
             self.logger.debug("Getting Network Adapters")
-            data = await self.get_network_adapters()
+            return await self.get_network_adapters()
         elif ei_supported:
             self.logger.debug("Getting Ethernet interfaces")
-            data = await self.get_ethernet_interfaces()
-        else:
-            self.logger.error("Server does not support this functionality")
+            return await self.get_ethernet_interfaces()
+
+        self.logger.error("Server does not support this functionality")
+        return None
+
+    async def list_interfaces(self):
+        data = await self.get_network_interfaces()
+        if data is None:
             return False
 
         for interface, properties in data.items():
@@ -1411,8 +2802,9 @@ class Badfish:
                 else:
                     self.logger.info(f"    {key}: {value}")
 
-        return True
+        return data
 
+    @requires("system")
     async def get_processor_summary(self):
         _url = "%s%s" % (self.host_uri, self.system_resource)
         _response = await self.get_request(_url)
@@ -1445,42 +2837,26 @@ class Badfish:
 
         return values
 
+    @requires("system")
     async def get_processor_details(self):
-
         _url = "%s%s/Processors" % (self.host_uri, self.system_resource)
-        _response = await self.get_request(_url)
-
-        if _response.status == 404:
-            self.logger.error("Server does not support this functionality")
-            raise BadfishException
+        fields = [
+            "Name",
+            "InstructionSet",
+            "Manufacturer",
+            "MemoryDeviceType",
+            "MaxSpeedMHz",
+            "Model",
+            "TotalCores",
+            "TotalThreads",
+        ]
 
         try:
-            raw = await _response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
-
-            processors = []
-            if data.get("Members"):
-                for member in data["Members"]:
-                    processors.append(member["@odata.id"])
+            processors = await self.get_collection_members(_url, ["Id"] + fields)
 
             proc_details = {}
-            for processor in processors:
-                processor_url = "%s%s" % (self.host_uri, processor)
-                proc_response = await self.get_request(processor_url)
-                proc_raw = await proc_response.text("utf-8", "ignore")
-                proc_data = json.loads(proc_raw.strip())
-
+            for proc_data in processors:
                 proc_name = proc_data.get("Id")
-                fields = [
-                    "Name",
-                    "InstructionSet",
-                    "Manufacturer",
-                    "MemoryDeviceType",
-                    "MaxSpeedMHz",
-                    "Model",
-                    "TotalCores",
-                    "TotalThreads",
-                ]
 
                 values = {}
                 for field in fields:
@@ -1496,6 +2872,7 @@ class Badfish:
 
         return proc_details
 
+    @requires("system")
     async def get_memory_summary(self):
         _url = "%s%s" % (self.host_uri, self.system_resource)
         _response = await self.get_request(_url)
@@ -1527,39 +2904,23 @@ class Badfish:
 
         return values
 
+    @requires("system")
     async def get_memory_details(self):
-
         _url = "%s%s/Memory" % (self.host_uri, self.system_resource)
-        _response = await self.get_request(_url)
-
-        if _response.status == 404:
-            self.logger.error("Server does not support this functionality")
-            raise BadfishException
+        fields = [
+            "CapacityMiB",
+            "Description",
+            "Manufacturer",
+            "MemoryDeviceType",
+            "OperatingSpeedMhz",
+        ]
 
         try:
-            raw = await _response.text("utf-8", "ignore")
-            data = json.loads(raw.strip())
-
-            memories = []
-            if data.get("Members"):
-                for member in data["Members"]:
-                    memories.append(member["@odata.id"])
+            memories = await self.get_collection_members(_url, ["Name"] + fields)
 
             mem_details = {}
-            for memory in memories:
-                memory_url = "%s%s" % (self.host_uri, memory)
-                mem_response = await self.get_request(memory_url)
-                mem_raw = await mem_response.text("utf-8", "ignore")
-                mem_data = json.loads(mem_raw.strip())
-
+            for mem_data in memories:
                 mem_name = mem_data.get("Name")
-                fields = [
-                    "CapacityMiB",
-                    "Description",
-                    "Manufacturer",
-                    "MemoryDeviceType",
-                    "OperatingSpeedMhz",
-                ]
 
                 values = {}
                 for field in fields:
@@ -1575,6 +2936,44 @@ class Badfish:
 
         return mem_details
 
+    async def get_power_summary(self):
+        return {"PowerState": await self.get_power_state()}
+
+    async def get_processors(self):
+        summary, details = await asyncio.gather(
+            self.get_processor_summary(), self.get_processor_details()
+        )
+        return {"ProcessorSummary": summary, "Processors": details}
+
+    async def get_memory(self):
+        summary, details = await asyncio.gather(
+            self.get_memory_summary(), self.get_memory_details()
+        )
+        return {"MemorySummary": summary, "Memory": details}
+
+    @requires("system", "manager")
+    async def get_inventory(self, _interfaces_path=None):
+        parts = {
+            "power_state": self.get_power_summary(),
+            "processors": self.get_processors(),
+            "memory": self.get_memory(),
+            "interfaces": self.get_network_interfaces(),
+            "firmware": self.get_firmware_devices(),
+            "boot_order": self.get_boot_order(_interfaces_path),
+        }
+        results = await asyncio.gather(*parts.values(), return_exceptions=True)
+
+        inventory = {}
+        for kind, result in zip(parts, results):
+            if isinstance(result, BadfishException):
+                self.logger.warning("Could not collect %s inventory." % kind)
+            elif isinstance(result, BaseException):
+                raise result
+            elif result is not None:
+                inventory[kind] = result
+        return inventory
+
+    @requires("system")
     async def list_processors(self):
         data = await self.get_processor_summary()
 
@@ -1589,8 +2988,9 @@ class Badfish:
             for _key, _value in _properties.items():
                 self.logger.info(f"    {_key}: {_value}")
 
-        return True
+        return {"ProcessorSummary": data, "Processors": processor_data}
 
+    @requires("system")
     async def list_memory(self):
         data = await self.get_memory_summary()
 
@@ -1605,10 +3005,495 @@ class Badfish:
             for _key, _value in _properties.items():
                 self.logger.info(f"    {_key}: {_value}")
 
-        return True
+        return {"MemorySummary": data, "Memory": memory_data}
+
+
+class OutputWriter:
+    def __init__(self, output_format, stream=None):
+        self.format = output_format
+        self.stream = stream or sys.stdout
+        self.count = 0
+
+    def write(self, record):
+        # Records are written as soon as each host finishes so memory use does
+        # not grow with the number of hosts, "json" streams a single array.
+        line = json.dumps(record, default=str)
+        if self.format == "json":
+            line = "%s%s" % ("[\n" if not self.count else ",\n", line)
+        else:
+            line = "%s\n" % line
+        self.stream.write(line)
+        self.stream.flush()
+        self.count += 1
+
+    def close(self):
+        if self.format == "json":
+            self.stream.write("\n]\n" if self.count else "[]\n")
+            self.stream.flush()
+
+
+class SnapshotStore:
+    def __init__(self, path, batch_size=SNAPSHOT_BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.pending = []
+        self.changed = 0
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS inventory ("
+                "host TEXT NOT NULL, "
+                "kind TEXT NOT NULL, "
+                "content TEXT NOT NULL, "
+                "hash TEXT NOT NULL, "
+                "updated REAL NOT NULL, "
+                "PRIMARY KEY (host, kind))"
+            )
+            indexed = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'attributes'"
+            ).fetchone()
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS attributes ("
+                "host TEXT NOT NULL, "
+                "kind TEXT NOT NULL, "
+                "name TEXT NOT NULL, "
+                "value TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS attributes_name_value "
+                "ON attributes (name, value)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS attributes_host_kind "
+                "ON attributes (host, kind)"
+            )
+            # Snapshots taken before attributes existed get them built once.
+            if not indexed:
+                rows = self.connection.execute(
+                    "SELECT host, kind, content FROM inventory"
+                ).fetchall()
+                for host, kind, content in rows:
+                    self.set_attributes(host, kind, json.loads(content))
+
+    @staticmethod
+    def get_attributes(kind, data):
+        attributes = set()
+        if not isinstance(data, list if kind == "firmware" else dict):
+            return []
+        if kind == "power_state":
+            attributes.add(("power_state", data.get("PowerState")))
+        elif kind == "processors":
+            summary = data.get("ProcessorSummary") or {}
+            attributes.add(("processor_model", summary.get("Model")))
+        elif kind == "memory":
+            summary = data.get("MemorySummary") or {}
+            attributes.add(("memory_gib", summary.get("TotalSystemMemoryGiB")))
+        elif kind == "interfaces":
+            for interface in filter(lambda item: isinstance(item, dict), data.values()):
+                attributes.add(("nic_vendor", interface.get("Vendor")))
+                mac_address = interface.get("MACAddress")
+                if mac_address:
+                    attributes.add(("mac_address", mac_address.upper()))
+        elif kind == "firmware":
+            for device in filter(lambda item: isinstance(item, dict), data):
+                if device.get("Name"):
+                    attributes.add(
+                        ("firmware:%s" % device["Name"], device.get("Version"))
+                    )
+        elif kind == "boot_order":
+            attributes.add(("host_type", data.get("match")))
+        return sorted(
+            (name, str(value)) for name, value in attributes if value is not None
+        )
+
+    def set_attributes(self, host, kind, data):
+        self.connection.execute(
+            "DELETE FROM attributes WHERE host = ? AND kind = ?", (host, kind)
+        )
+        self.connection.executemany(
+            "INSERT INTO attributes (host, kind, name, value) VALUES (?, ?, ?, ?)",
+            [
+                (host, kind, name, value)
+                for name, value in self.get_attributes(kind, data)
+            ],
+        )
+
+    def query(self, name, value=None):
+        sql = "SELECT host, value FROM attributes WHERE name = ?"
+        params = [name]
+        if value is not None:
+            sql += (
+                " AND value GLOB ?" if re.search(r"[*?\[]", value) else " AND value = ?"
+            )
+            params.append(value)
+        return self.connection.execute(sql + " ORDER BY host, value", params).fetchall()
+
+    def add(self, host, kind, data, _flush=True):
+        content = json.dumps(data, sort_keys=True, default=str)
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        self.pending.append((host, kind, data, content, digest, time.time()))
+        if _flush and len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def add_inventory(self, host, inventory):
+        for kind, data in inventory.items():
+            self.add(host, kind, data, _flush=False)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        # Rows are only rewritten when their content hash changed, plain
+        # UPDATE and INSERT OR IGNORE keep this working on older SQLite
+        # versions without UPSERT support.
+        changed = 0
+        with self.connection:
+            for host, kind, data, content, digest, updated in self.pending:
+                cursor = self.connection.execute(
+                    "UPDATE inventory SET content = ?, hash = ?, updated = ? "
+                    "WHERE host = ? AND kind = ? AND hash != ?",
+                    (content, digest, updated, host, kind, digest),
+                )
+                if not cursor.rowcount:
+                    cursor = self.connection.execute(
+                        "INSERT OR IGNORE INTO inventory "
+                        "(host, kind, content, hash, updated) VALUES (?, ?, ?, ?, ?)",
+                        (host, kind, content, digest, updated),
+                    )
+                if cursor.rowcount:
+                    changed += 1
+                    self.set_attributes(host, kind, data)
+        self.changed += changed
+        self.pending = []
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+
+class FleetScheduler:
+    def __init__(self, max_concurrency, max_per_rack=None, max_per_chassis=None):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_per_rack = max_per_rack
+        self.max_per_chassis = max_per_chassis
+        self.group_semaphores = {}
+
+    def get_group_semaphores(self, host):
+        fields = get_host_name_fields(host)
+        if not fields:
+            return []
+
+        groups = []
+        if self.max_per_rack:
+            groups.append(("rack", fields["rack"], self.max_per_rack))
+        if self.max_per_chassis:
+            chassis = "%s-%s" % (fields["rack"], fields["uloc"])
+            groups.append(("chassis", chassis, self.max_per_chassis))
+
+        semaphores = []
+        for kind, name, limit in groups:
+            key = (kind, name)
+            if key not in self.group_semaphores:
+                self.group_semaphores[key] = asyncio.Semaphore(limit)
+            semaphores.append(self.group_semaphores[key])
+        return semaphores
+
+    async def run(self, host, coro_fn):
+        # Group slots are always taken before the global one and in the same
+        # order, so a host waiting on its rack never holds a global slot.
+        semaphores = self.get_group_semaphores(host) + [self.semaphore]
+        acquired = []
+        try:
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+            return await coro_fn()
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    async def as_completed(self, tasks):
+        futures = [
+            asyncio.ensure_future(self.run(host, coro_fn)) for host, coro_fn in tasks
+        ]
+        try:
+            for future in asyncio.as_completed(futures):
+                yield await future
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+class HostResult:
+    def __init__(self, host, success, data=None, messages=None):
+        self.host = host
+        self.success = success
+        self.data = data
+        self.messages = messages or []
+
+    def __repr__(self):
+        return "HostResult(host=%r, success=%r)" % (self.host, self.success)
+
+    @property
+    def errors(self):
+        return [message for level, message in self.messages if level == "ERROR"]
+
+    def to_dict(self):
+        return {
+            "host": self.host,
+            "success": self.success,
+            "data": self.data,
+            "messages": [
+                {"level": level, "message": message} for level, message in self.messages
+            ],
+        }
+
+
+class MessageHandler(Handler):
+    def __init__(self, messages, level=INFO, forward=None):
+        super().__init__()
+        self.messages = messages
+        self.capture_level = level
+        self.forward = forward
+
+    def emit(self, record):
+        if record.levelno >= self.capture_level:
+            self.messages.append((record.levelname, record.getMessage()))
+        # Records are captured at INFO regardless of the caller's level, only
+        # the ones its logger is enabled for are passed on to its handlers.
+        if self.forward and self.forward.isEnabledFor(record.levelno):
+            self.forward.handle(record)
+
+
+class BadfishFleet:
+    def __init__(
+        self,
+        hosts,
+        username,
+        password,
+        logger=None,
+        retries=RETRIES,
+        auth="basic",
+        max_concurrency=MAX_CONCURRENCY,
+        max_per_rack=None,
+        max_per_chassis=None,
+        cache_dir=None,
+        cache_ttl=DISCOVERY_TTL,
+        interfaces_path=None,
+        events=False,
+        timeout=None,
+    ):
+        self.hosts = list(hosts)
+        self.username = username
+        self.password = password
+        self.logger = logger or getLogger("badfish")
+        self.retries = retries
+        self.auth = auth
+        self.max_concurrency = max_concurrency
+        self.max_per_rack = max_per_rack
+        self.max_per_chassis = max_per_chassis
+        self.events = events
+        self.timeout = timeout
+        self.discovery = None
+        if cache_ttl > 0:
+            cache_dir = cache_dir or get_cache_dir()
+            self.discovery = DiscoveryCache(
+                os.path.join(cache_dir, "discovery.json"), cache_ttl
+            )
+        if interfaces_path:
+            try:
+                InterfacesIndex.load(interfaces_path, cache_dir)
+            except (IOError, OSError, yaml.YAMLError) as ex:
+                self.logger.debug(ex)
+        self.job_tracker = JobTracker()
+        self.clients = {}
+        self.locks = {}
+
+    async def get_client(self, host, logger):
+        badfish = self.clients.get(host)
+        if not badfish:
+            badfish = await badfish_factory(
+                _host=host,
+                _username=self.username,
+                _password=self.password,
+                _logger=logger,
+                _retries=self.retries,
+                _auth=self.auth,
+                _discovery=self.discovery,
+                _events=self.events,
+                _timeout=self.timeout,
+                _job_tracker=self.job_tracker,
+            )
+            badfish.show_progress = False
+            self.clients[host] = badfish
+        else:
+            await badfish.open_session()
+            # Cached responses stay until their TTL, only the boot devices
+            # parsed from them are read again so each call sees that cache.
+            badfish.boot_devices = None
+        return badfish
+
+    def invalidate(self, hosts=None):
+        hosts = self.hosts if hosts is None else hosts
+        for host in hosts:
+            badfish = self.clients.get(host)
+            if badfish:
+                badfish.cache = ResponseCache()
+                badfish.boot_devices = None
+
+    async def run_host(self, host, action, args, kwargs):
+        messages = []
+        handler = MessageHandler(messages, forward=self.logger)
+        logger = getLogger("%s.%s" % (self.logger.name, host))
+        # Runs on the same host share its client and logger, so they take
+        # turns and each one only captures its own messages. Outside a run
+        # the client logs straight to the fleet logger again.
+        async with self.locks.setdefault(host, asyncio.Lock()):
+            logger.setLevel(min(INFO, self.logger.getEffectiveLevel()))
+            logger.propagate = False
+            logger.addHandler(handler)
+            try:
+                badfish = await self.get_client(host, logger)
+                if callable(action):
+                    data = await action(badfish, *args, **kwargs)
+                else:
+                    data = await getattr(badfish, action)(*args, **kwargs)
+                return HostResult(host, True, data, messages)
+            except BadfishException as ex:
+                logger.debug(ex)
+                return HostResult(host, False, None, messages)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.debug(ex, exc_info=True)
+                logger.error("Unexpected error executing Badfish: %r" % ex)
+                return HostResult(host, False, None, messages)
+            finally:
+                logger.removeHandler(handler)
+                logger.propagate = True
+                logger.setLevel(NOTSET)
+
+    async def run(self, action, *args, hosts=None, **kwargs):
+        hosts = self.hosts if hosts is None else list(hosts)
+        scheduler = FleetScheduler(
+            self.max_concurrency, self.max_per_rack, self.max_per_chassis
+        )
+        tasks = [
+            (host, functools.partial(self.run_host, host, action, args, kwargs))
+            for host in hosts
+        ]
+        results = {}
+        async for result in scheduler.as_completed(tasks):
+            results[result.host] = result
+        return [results[host] for host in hosts]
+
+    async def close(self):
+        clients = list(self.clients.values())
+        self.clients = {}
+        await asyncio.gather(*[badfish.close() for badfish in clients])
+        if self.discovery:
+            try:
+                self.discovery.save()
+            except (IOError, OSError) as ex:
+                self.logger.debug(ex)
+                self.logger.warning(
+                    "Could not write discovery cache to %s" % self.discovery.path
+                )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+class BadfishFleetSync:
+    def __init__(self, *args, **kwargs):
+        self.loop = asyncio.new_event_loop()
+        self.fleet = BadfishFleet(*args, **kwargs)
+
+    def run(self, action, *args, **kwargs):
+        return self.loop.run_until_complete(self.fleet.run(action, *args, **kwargs))
+
+    def invalidate(self, hosts=None):
+        self.fleet.invalidate(hosts)
+
+    def close(self):
+        try:
+            self.loop.run_until_complete(self.fleet.close())
+        finally:
+            self.loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def query_snapshot(snapshot, expressions, logger, writer=None):
+    matches = None
+    for expression in expressions:
+        name, has_value, value = expression.partition("=")
+        name = name.strip()
+        found = {}
+        for host, _value in snapshot.query(name, value.strip() if has_value else None):
+            found.setdefault(host, {}).setdefault(name, []).append(_value)
+        if matches is None:
+            matches = found
+        else:
+            matches = {
+                host: dict(values, **found[host])
+                for host, values in matches.items()
+                if host in found
+            }
+
+    for host, values in sorted(matches.items()):
+        logger.info(
+            "%s: %s"
+            % (
+                host,
+                ", ".join(
+                    "%s=%s" % (name, ",".join(_values))
+                    for name, _values in values.items()
+                ),
+            )
+        )
+        if writer:
+            writer.write({"host": host, "success": True, "data": values})
+    logger.info("%s hosts matched." % len(matches))
+    return True
 
 
-async def execute_badfish(_host, _args, logger):
+async def execute_badfish_fleet(tasks, _args, logger):
+    scheduler = FleetScheduler(
+        _args["max_concurrency"], _args["max_per_rack"], _args["max_per_chassis"]
+    )
+    result = True
+    succeeded = 0
+    found = False
+    async for _host, _result, _data in scheduler.as_completed(tasks):
+        if _result:
+            succeeded += 1
+            found = found or bool(_data)
+            logger.info(f"{_host}: SUCCESSFUL")
+        else:
+            result = False
+            logger.info(f"{_host}: FAILED")
+
+    logger.info("RESULTS: %s of %s hosts SUCCESSFUL" % (succeeded, len(tasks)))
+    if _args["find_mac"] and not found:
+        logger.error("MAC address %s not found on any host." % _args["find_mac"])
+        result = False
+    return result
+
+
+async def execute_badfish(
+    _host, _args, logger, discovery=None, job_tracker=None, writer=None, snapshot=None
+):
     _username = _args["u"]
     _password = _args["p"]
     host_type = _args["t"]
@@ -1618,6 +3503,8 @@ async def execute_badfish(_host, _args, logger):
     device = _args["boot_to"]
     boot_to_type = _args["boot_to_type"]
     boot_to_mac = _args["boot_to_mac"]
+    find_mac = _args["find_mac"]
+    detect_type = _args["detect_type"]
     reboot_only = _args["reboot_only"]
     power_state = _args["power_state"]
     power_on = _args["power_on"]
@@ -1635,9 +3522,16 @@ async def execute_badfish(_host, _args, logger):
     check_virtual_media = _args["check_virtual_media"]
     unmount_virtual_media = _args["unmount_virtual_media"]
     retries = int(_args["retries"])
+    auth = _args["auth"]
+    wait_events = _args["wait_events"]
+    timeout = _args["timeout"]
+    wait_jobs = _args["wait_jobs"]
+    plan = _args["plan"]
 
     result = True
+    data = None
 
+    badfish = None
     try:
         badfish = await badfish_factory(
             _host=_host,
@@ -1645,27 +3539,42 @@ async def execute_badfish(_host, _args, logger):
             _password=_password,
             _logger=logger,
             _retries=retries,
+            _auth=auth,
+            _discovery=discovery,
+            _events=wait_events,
+            _timeout=timeout,
+            _job_tracker=job_tracker,
         )
+        badfish.show_progress = writer is None
 
         if _args["host_list"]:
             badfish.logger.info("Executing actions on host: %s" % _host)
 
-        if device:
+        # Plans are dispatched first, nothing after them may run in a dry run.
+        if plan and boot_to_type:
+            data = await badfish.plan_boot_to_type(boot_to_type, interfaces_path)
+        elif plan:
+            data = await badfish.plan_change_boot(host_type, interfaces_path, pxe)
+        elif device:
             await badfish.boot_to(device)
         elif boot_to_type:
             await badfish.boot_to_type(boot_to_type, interfaces_path)
         elif boot_to_mac:
             await badfish.boot_to_mac(boot_to_mac)
+        elif find_mac:
+            data = await badfish.find_mac(find_mac)
         elif check_boot:
-            await badfish.check_boot(interfaces_path)
+            data = await badfish.check_boot(interfaces_path)
+        elif detect_type:
+            data = await badfish.detect_type(interfaces_path)
         elif firmware_inventory:
-            await badfish.get_firmware_inventory()
+            data = await badfish.get_firmware_inventory()
         elif clear_jobs:
             await badfish.clear_job_queue(force)
         elif list_jobs:
-            await badfish.list_job_queue()
+            data = await badfish.list_job_queue()
         elif host_type:
-            await badfish.change_boot(host_type, interfaces_path, pxe)
+            await badfish.change_boot(host_type, interfaces_path, pxe, wait_jobs)
         elif rac_reset:
             await badfish.reset_idrac()
         elif factory_reset:
@@ -1673,6 +3582,7 @@ async def execute_badfish(_host, _args, logger):
         elif power_state:
             state = await badfish.get_power_state()
             logger.info(f"Power state for {_host}: {state}")
+            data = {"PowerState": state}
         elif power_on:
             await badfish.set_power_state("on")
         elif power_off:
@@ -1682,28 +3592,55 @@ async def execute_badfish(_host, _args, logger):
         elif reboot_only:
             await badfish.reboot_server()
         elif list_interfaces:
-            await badfish.list_interfaces()
+            data = await badfish.list_interfaces()
         elif list_processors:
-            await badfish.list_processors()
+            data = await badfish.list_processors()
         elif list_memory:
-            await badfish.list_memory()
+            data = await badfish.list_memory()
         elif check_virtual_media:
-            await badfish.check_virtual_media()
+            data = await badfish.check_virtual_media()
         elif unmount_virtual_media:
             await badfish.unmount_virtual_media()
+        elif snapshot:
+            data = await badfish.get_inventory(interfaces_path)
+            logger.info("Inventory snapshot collected for %s." % _host)
+            try:
+                snapshot.add_inventory(_host, data)
+            except sqlite3.Error as ex:
+                # The rows stay pending, closing the snapshot writes them or
+                # reports the failure for the whole run.
+                logger.debug(ex)
+                logger.warning(
+                    "Could not write snapshot database %s, retrying on close."
+                    % snapshot.path
+                )
 
-        if pxe and not host_type:
+        if pxe and not host_type and not plan:
             await badfish.set_next_boot_pxe()
 
     except BadfishException as ex:
         logger.debug(ex)
         logger.error("There was something wrong executing Badfish")
         result = False
+    except asyncio.CancelledError:
+        raise
+    except Exception as ex:
+        # Any other failure stays with this host, the rest of the fleet may
+        # be in the middle of boot order or power changes.
+        logger.debug(ex, exc_info=True)
+        logger.error("Unexpected error executing Badfish: %r" % ex)
+        result = False
+    finally:
+        if badfish:
+            await badfish.close()
+
+    if writer:
+        writer.write({"host": _host, "success": result, "data": data})
 
     if _args["host_list"]:
         logger.info("*" * 48)
 
-    return _host, result
+    return _host, result, data
 
 
 def main(argv=None):
@@ -1711,8 +3648,8 @@ def main(argv=None):
         description="Tool for managing server hardware via the Redfish API."
     )
     parser.add_argument("-H", help="iDRAC host address")
-    parser.add_argument("-u", help="iDRAC username", required=True)
-    parser.add_argument("-p", help="iDRAC password", required=True)
+    parser.add_argument("-u", help="iDRAC username")
+    parser.add_argument("-p", help="iDRAC password")
     parser.add_argument("-i", help="Path to iDRAC interfaces yaml", default=None)
     parser.add_argument("-t", help="Type of host as defined on iDRAC interfaces yaml")
     parser.add_argument(
@@ -1730,6 +3667,26 @@ def main(argv=None):
         help="Path to a plain text file with a list of hosts",
         default=None,
     )
+    parser.add_argument(
+        "--max-concurrency",
+        help="Maximum number of hosts from --host-list actioned at the same time",
+        type=int,
+        default=MAX_CONCURRENCY,
+    )
+    parser.add_argument(
+        "--max-per-rack",
+        help="Maximum number of hosts actioned at the same time within one rack, "
+        "no limit when omitted",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--max-per-chassis",
+        help="Maximum number of hosts actioned at the same time within one chassis, "
+        "no limit when omitted",
+        type=int,
+        default=None,
+    )
     parser.add_argument(
         "--pxe", help="Set next boot to one-shot boot PXE", action="store_true"
     )
@@ -1744,6 +3701,10 @@ def main(argv=None):
         "--boot-to-mac",
         help="Set next boot to one-shot boot to a specific MAC address on the target",
     )
+    parser.add_argument(
+        "--find-mac",
+        help="Find which host and device own a specific MAC address",
+    )
     parser.add_argument(
         "--reboot-only", help="Flag for only rebooting the host", action="store_true"
     )
@@ -1772,6 +3733,11 @@ def main(argv=None):
         help="Flag for checking the host boot order",
         action="store_true",
     )
+    parser.add_argument(
+        "--detect-type",
+        help="Report which host type on the interfaces yaml matches the boot order",
+        action="store_true",
+    )
     parser.add_argument(
         "--firmware-inventory", help="Get firmware inventory", action="store_true"
     )
@@ -1802,6 +3768,73 @@ def main(argv=None):
         help="Unmount any mounted iso images",
         action="store_true",
     )
+    parser.add_argument(
+        "--snapshot",
+        help="Collect the inventory of each host into a SQLite database",
+        default=None,
+    )
+    parser.add_argument(
+        "--query",
+        help="Find hosts on the --snapshot database by NAME or NAME=VALUE, "
+        "VALUE accepts * wildcards. Can be given multiple times",
+        action="append",
+        default=None,
+    )
+    parser.add_argument(
+        "--output",
+        help="Write one machine readable record per host to stdout as it finishes",
+        choices=OUTPUT_FORMATS,
+        default=None,
+    )
+    parser.add_argument(
+        "--auth",
+        help="Authentication method: HTTP basic auth on every request or a single "
+        "Redfish session token",
+        choices=AUTH_METHODS,
+        default="basic",
+    )
+    parser.add_argument(
+        "--wait-events",
+        help="Wait for power state changes on the Redfish EventService stream, "
+        "falling back to polling when it is not available",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory where discovered host resources are cached",
+        default=None,
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        help="Seconds for which cached host discovery is trusted, 0 disables caching",
+        type=int,
+        default=DISCOVERY_TTL,
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        help="Ignore cached host discovery and rediscover every host",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--wait-jobs",
+        help="Wait for the BIOS config jobs created by the action to finish",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--plan",
+        help="Report what -t or --boot-to-type would change on each host "
+        "without making any changes",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--timeout",
+        help="Seconds to wait for power state and job changes, defaults to "
+        "%s seconds per retry, %s seconds per retry for a job to be scheduled "
+        "and %s seconds for --wait-jobs"
+        % (POLLING_INTERVAL, JOB_STATUS_INTERVAL, JOB_TIMEOUT),
+        type=int,
+        default=None,
+    )
     parser.add_argument("-v", "--verbose", help="Verbose output", action="store_true")
     parser.add_argument(
         "-r",
@@ -1810,6 +3843,19 @@ def main(argv=None):
         default=RETRIES,
     )
     _args = vars(parser.parse_args(argv))
+    if _args["query"]:
+        if not _args["snapshot"]:
+            parser.error("--query requires --snapshot")
+        if not os.path.exists(_args["snapshot"]):
+            parser.error("snapshot database not found: %s" % _args["snapshot"])
+    elif not _args["u"] or not _args["p"]:
+        parser.error("the following arguments are required: -u, -p")
+    if _args["plan"]:
+        if not (_args["t"] or _args["boot_to_type"]):
+            parser.error("--plan requires -t or --boot-to-type")
+        for option in MUTATING_OPTIONS:
+            if _args[option.lstrip("-").replace("-", "_")]:
+                parser.error("--plan can't be combined with %s" % option)
 
     log_level = DEBUG if _args["verbose"] else INFO
 
@@ -1841,26 +3887,84 @@ def main(argv=None):
         file_handler.setLevel(log_level)
         _queue_listener.handlers = _queue_listener.handlers + (file_handler,)
 
+    discovery = None
+    cache_dir = None
+    if _args["cache_ttl"] > 0:
+        cache_dir = _args["cache_dir"] or get_cache_dir()
+        discovery = DiscoveryCache(
+            os.path.join(cache_dir, "discovery.json"),
+            _args["cache_ttl"],
+            _args["refresh_cache"],
+        )
+
+    if _args["i"]:
+        # Parse the interfaces file once up front so every host reuses it,
+        # errors are reported by the hosts that need it.
+        try:
+            InterfacesIndex.load(_args["i"], cache_dir)
+        except (IOError, OSError, yaml.YAMLError) as ex:
+            _logger.debug(ex)
+
+    snapshot = None
+    if _args["snapshot"]:
+        try:
+            snapshot = SnapshotStore(_args["snapshot"])
+        except sqlite3.Error as ex:
+            _logger.debug(ex)
+            _logger.error("Could not open snapshot database %s" % _args["snapshot"])
+            _queue_listener.stop()
+            return 1
+
+    writer = None
+    if _args["output"]:
+        writer = OutputWriter(_args["output"])
+
+    invalid_limits = [
+        option
+        for option in ["max_concurrency", "max_per_rack", "max_per_chassis"]
+        if _args[option] is not None and _args[option] < 1
+    ]
     loop = asyncio.get_event_loop()
     tasks = []
-    if host_list:
+    if _args["query"]:
+        try:
+            result = query_snapshot(snapshot, _args["query"], _logger, writer)
+        except sqlite3.Error as ex:
+            _logger.debug(ex)
+            _logger.error("Could not query snapshot database %s" % snapshot.path)
+            result = False
+    elif host_list and invalid_limits:
+        for option in invalid_limits:
+            _logger.error("--%s must be a positive integer." % option.replace("_", "-"))
+        result = False
+    elif host_list:
+        job_tracker = JobTracker()
         try:
             with open(host_list, "r") as _file:
                 for _host in _file.readlines():
-                    logger = getLogger(_host.strip().split(".")[0])
+                    _host = _host.strip()
+                    if not _host:
+                        continue
+                    logger = getLogger(_host.split(".")[0])
                     logger.addHandler(_queue_handler)
                     logger.setLevel(log_level)
                     fn = functools.partial(
-                        execute_badfish, _host.strip(), _args, logger
+                        execute_badfish,
+                        _host,
+                        _args,
+                        logger,
+                        discovery,
+                        job_tracker,
+                        writer,
+                        snapshot,
                     )
-                    tasks.append(fn)
+                    tasks.append((_host, fn))
         except IOError as ex:
             _logger.debug(ex)
             _logger.error("There was something wrong reading from %s" % host_list)
-        results = []
         try:
-            results = loop.run_until_complete(
-                asyncio.gather(*[task() for task in tasks], return_exceptions=True)
+            result = loop.run_until_complete(
+                execute_badfish_fleet(tasks, _args, _logger)
             )
         except KeyboardInterrupt:
             _logger.warning("\nBadfish terminated")
@@ -1869,30 +3973,48 @@ def main(argv=None):
             _logger.warning("There was something wrong executing Badfish")
             _logger.debug(ex)
             result = False
-        if results:
-            result = True
-            _logger.info("RESULTS:")
-            for res in results:
-                if len(res) > 1 and res[1]:
-                    _logger.info(f"{res[0]}: SUCCESSFUL")
-                else:
-                    _logger.info(f"{res[0]}: FAILED")
-                    result = False
     elif not host:
         _logger.error(
             "You must specify at least either a host (-H) or a host list (--host-list)."
         )
     else:
         try:
-            _host, result = loop.run_until_complete(
-                execute_badfish(host, _args, _logger)
+            _host, result, data = loop.run_until_complete(
+                execute_badfish(
+                    host, _args, _logger, discovery, writer=writer, snapshot=snapshot
+                )
             )
+            if result and _args["find_mac"] and not data:
+                _logger.error(
+                    "MAC address %s not found on host %s." % (_args["find_mac"], host)
+                )
+                result = False
         except KeyboardInterrupt:
             _logger.warning("Badfish terminated")
         except BadfishException as ex:
             _logger.warning("There was something wrong executing Badfish")
             _logger.debug(ex)
             result = False
+
+    if writer:
+        writer.close()
+    if snapshot:
+        try:
+            snapshot.close()
+            _logger.debug(
+                "Snapshot %s updated, %s records changed."
+                % (snapshot.path, snapshot.changed)
+            )
+        except sqlite3.Error as ex:
+            _logger.debug(ex)
+            _logger.error("Could not write snapshot database %s" % snapshot.path)
+            result = False
+    if discovery:
+        try:
+            discovery.save()
+        except (IOError, OSError) as ex:
+            _logger.debug(ex)
+            _logger.warning("Could not write discovery cache to %s" % discovery.path)
     _queue_listener.stop()
 
     if result:
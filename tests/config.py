@@ -51,7 +51,8 @@ RESPONSE_NO_MATCH = (
     "- INFO     - 3: NIC.Slot.2-1-1\n"
 )
 WARN_NO_MATCH = (
-    "- WARNING  - Current boot order does not match any of the given.\n%s"
+    "- WARNING  - Current boot order does not match any of the given.\n"
+    "- WARNING  - Closest match is director, 2 position(s) differ.\n%s"
     % RESPONSE_NO_MATCH
 )
 RESPONSE_DIRECTOR = "- WARNING  - Current boot order is set to: director.\n"
@@ -79,10 +80,16 @@ RESPONSE_BOOT_TO = (
 RESPONSE_REBOOT_ONLY_SUCCESS = (
     "- INFO     - Command passed to GracefulRestart server, code return is 204.\n"
     "- INFO     - Polling for host state: Off\n"
-    "- INFO     - Polling for host state: Not Down\n"
     "- INFO     - Command passed to On server, code return is 204.\n"
 )
 
+RESPONSE_POWER_CYCLE_NOT_OFF = (
+    "- INFO     - Command passed to ForceOff server, code return is 204.\n"
+    "- INFO     - Polling for host state: Off\n"
+    f"- ERROR    - Server {MOCK_HOST} did not power off, it will not be powered on.\n"
+    "- ERROR    - There was something wrong executing Badfish\n"
+)
+
 # test_reset_idrac
 RESPONSE_RESET = (
     "- INFO     - Status code 204 returned for POST command to reset iDRAC.\n"
@@ -96,7 +103,7 @@ RESPONSE_CHANGE_BOOT = (
     "- INFO     - PATCH command passed to update boot order.\n"
     "- INFO     - POST command passed to create target config job.\n"
     "- INFO     - Command passed to ForceOff server, code return is 200.\n"
-    "- INFO     - Polling for host state: Not Down\n"
+    "- INFO     - Polling for host state: Off\n"
     "- INFO     - Command passed to On server, code return is 200.\n"
 )
 RESPONSE_CHANGE_BAD_TYPE = (
@@ -116,7 +123,9 @@ RESET_TYPE_RESP = (
     '{"Actions":{"#Manager.Reset":{"ResetType@Redfish.AllowableValues":["GracefulRestart"],'
     '"target":"/redfish/v1/Managers/iDRAC.Embedded.1/Actions/Manager.Reset"}}} '
 )
-INIT_RESP = [ROOT_RESP, SYS_RESP, ROOT_RESP, MAN_RESP]
+INIT_RESP = [ROOT_RESP, SYS_RESP, MAN_RESP]
+SYSTEM_INIT_RESP = [ROOT_RESP, SYS_RESP]
+MANAGER_INIT_RESP = [ROOT_RESP, MAN_RESP]
 
 STATE_OFF_RESP = '{"PowerState": "Off"}'
 STATE_ON_RESP = '{"PowerState": "On"}'
@@ -127,3 +136,210 @@ BOOT_SEQ_RESP = '{"Attributes": {"BootSeq": %s}}'
 BLANK_RESP = '"OK"'
 TASK_OK_RESP = '{"Message": "Task successfully scheduled."}'
 JOB_OK_RESP = '{"JobID": "%s"}' % JOB_ID
+
+# test_session_auth
+SESSION_TOKEN = "4c1d5b7e2f0a9e8d"
+SESSION_URI = "/redfish/v1/SessionService/Sessions/42"
+SESSION_HEADERS = {"X-Auth-Token": SESSION_TOKEN, "Location": SESSION_URI}
+RESPONSE_POWER_STATE_ON = "- INFO     - Power state for %s: On\n" % MOCK_HOST
+RESPONSE_SESSION_AUTH_FAILED = (
+    "- ERROR    - Failed to authenticate. Verify your credentials for %s\n"
+    "- ERROR    - There was something wrong executing Badfish\n" % MOCK_HOST
+)
+
+# test_host_list
+MOCK_HOST_SHORT = MOCK_HOST.split(".")[0]
+RESPONSE_SNAPSHOT_WRITE_RETRIED = (
+    "- INFO     - Inventory snapshot collected for %s.\n" % MOCK_HOST
+    + "- WARNING  - Could not write snapshot database %s, retrying on close.\n"
+)
+RESPONSE_HOST_LIST_INVALID_LIMITS = (
+    "[badfish.badfish] - ERROR    - --max-per-rack must be a positive integer.\n"
+    "[badfish.badfish] - ERROR    - --max-per-chassis must be a positive integer.\n"
+)
+RESPONSE_HOST_LIST_POWER_STATE = (
+    "[%(short)s] - INFO     - Executing actions on host: %(host)s\n"
+    "[%(short)s] - INFO     - Power state for %(host)s: On\n"
+    "[%(short)s] - INFO     - ************************************************\n"
+    "[badfish.badfish] - INFO     - %(host)s: SUCCESSFUL\n"
+    "[badfish.badfish] - INFO     - RESULTS: 1 of 1 hosts SUCCESSFUL\n"
+    % {"short": MOCK_HOST_SHORT, "host": MOCK_HOST}
+)
+FLEET_HOSTS = ["mgmt-f01-h%02d-000-r630.host.io" % uloc for uloc in range(1, 7)] + [
+    "mgmt-f02-h%02d-000-r630.host.io" % uloc for uloc in range(1, 7)
+]
+
+# test_ls_memory
+ROOT_EXPAND_RESP = (
+    '{"Managers":{"@odata.id":"/redfish/v1/Managers"},'
+    '"Systems":{"@odata.id":"/redfish/v1/Systems"},'
+    '"ProtocolFeaturesSupported":{"ExpandQuery":{"ExpandAll":true,"Levels":true,'
+    '"Links":true,"NoLinks":true,"MaxLevels":1},"SelectQuery":true}}'
+)
+MEMORY_URI = "/redfish/v1/Systems/System.Embedded.1/Memory"
+MEMORY_SUMMARY_RESP = (
+    '{"MemorySummary": {"MemoryMirroring": "System", "TotalSystemMemoryGiB": 64}}'
+)
+MEMORY_DIMM_A1 = (
+    '{"@odata.id": "%s/DIMM.Socket.A1", "Name": "DIMM A1", "CapacityMiB": 32768, '
+    '"Manufacturer": "Hynix", "MemoryDeviceType": "DDR4", "OperatingSpeedMhz": 2666}'
+    % MEMORY_URI
+)
+MEMORY_DIMM_B1 = (
+    '{"@odata.id": "%s/DIMM.Socket.B1", "Name": "DIMM B1", "CapacityMiB": 32768, '
+    '"Manufacturer": "Hynix", "MemoryDeviceType": "DDR4", "OperatingSpeedMhz": 2666}'
+    % MEMORY_URI
+)
+MEMORY_COLLECTION_RESP = (
+    '{"Members": [{"@odata.id": "%s/DIMM.Socket.A1"}, '
+    '{"@odata.id": "%s/DIMM.Socket.B1"}]}' % (MEMORY_URI, MEMORY_URI)
+)
+MEMORY_EXPANDED_RESP = '{"Members": [%s, %s]}' % (MEMORY_DIMM_A1, MEMORY_DIMM_B1)
+RESPONSE_LS_MEMORY = (
+    "- INFO     - Memory Summary:\n"
+    "- INFO     -     MemoryMirroring: System\n"
+    "- INFO     -     TotalSystemMemoryGiB: 64\n"
+    "- INFO     - DIMM A1:\n"
+    "- INFO     -     CapacityMiB: 32768\n"
+    "- INFO     -     Manufacturer: Hynix\n"
+    "- INFO     -     MemoryDeviceType: DDR4\n"
+    "- INFO     -     OperatingSpeedMhz: 2666\n"
+    "- INFO     - DIMM B1:\n"
+    "- INFO     -     CapacityMiB: 32768\n"
+    "- INFO     -     Manufacturer: Hynix\n"
+    "- INFO     -     MemoryDeviceType: DDR4\n"
+    "- INFO     -     OperatingSpeedMhz: 2666\n"
+)
+
+# test_ls_interfaces
+NIC_URI = "/redfish/v1/Systems/System.Embedded.1/NetworkAdapters/NIC.Integrated.1"
+NETWORK_ADAPTERS_RESP = '{"Members": [{"@odata.id": "%s"}]}' % NIC_URI
+NETWORK_PORTS_RESP = (
+    '{"Members": [{"@odata.id": "%(nic)s/NetworkPorts/NIC.Integrated.1-1"}, '
+    '{"@odata.id": "%(nic)s/NetworkPorts/NIC.Integrated.1-2"}]}' % {"nic": NIC_URI}
+)
+NETWORK_FUNCTIONS_RESP = (
+    '{"Members": [{"@odata.id": "%(nic)s/NetworkDeviceFunctions/NIC.Integrated.1-2-1"}, '
+    '{"@odata.id": "%(nic)s/NetworkDeviceFunctions/NIC.Integrated.1-1-1"}]}'
+    % {"nic": NIC_URI}
+)
+
+
+def render_network_port(port, link_status):
+    return (
+        '{"@odata.id": "%s/NetworkPorts/%s", "Id": "%s", "LinkStatus": "%s", '
+        '"SupportedLinkCapabilities": [{"LinkSpeedMbps": 10000}]}'
+        % (NIC_URI, port, port, link_status)
+    )
+
+
+def render_network_function(port, mac_address):
+    return (
+        '{"@odata.id": "%(nic)s/NetworkDeviceFunctions/%(port)s-1", '
+        '"Id": "%(port)s-1", "Ethernet": {"MACAddress": "%(mac)s"}, '
+        '"Links": {"PhysicalPortAssignment": '
+        '{"@odata.id": "%(nic)s/NetworkPorts/%(port)s"}}, '
+        '"Oem": {"Dell": {"DellNIC": {"VendorName": "Intel"}}}}'
+        % {"nic": NIC_URI, "port": port, "mac": mac_address}
+    )
+
+
+NETWORK_PORT_1 = render_network_port("NIC.Integrated.1-1", "Up")
+NETWORK_PORT_2 = render_network_port("NIC.Integrated.1-2", "Down")
+NETWORK_FUNCTION_1 = render_network_function("NIC.Integrated.1-1", "F8:BC:12:0A:00:01")
+NETWORK_FUNCTION_2 = render_network_function("NIC.Integrated.1-2", "F8:BC:12:0A:00:02")
+RESPONSE_LS_INTERFACES = (
+    "- INFO     - NIC.Integrated.1-1:\n"
+    "- INFO     -     Id: NIC.Integrated.1-1\n"
+    "- INFO     -     LinkStatus: Up\n"
+    "- INFO     -     LinkSpeedMbps: 10000\n"
+    "- INFO     -     MACAddress: F8:BC:12:0A:00:01\n"
+    "- INFO     -     Vendor: Intel\n"
+    "- INFO     - NIC.Integrated.1-2:\n"
+    "- INFO     -     Id: NIC.Integrated.1-2\n"
+    "- INFO     -     LinkStatus: Down\n"
+    "- INFO     -     LinkSpeedMbps: 10000\n"
+    "- INFO     -     MACAddress: F8:BC:12:0A:00:02\n"
+    "- INFO     -     Vendor: Intel\n"
+)
+
+# test_boot_to_mac
+MOCK_MAC = "F8:BC:12:0A:00:02"
+ETHERNET_URI = "/redfish/v1/Systems/System.Embedded.1/EthernetInterfaces"
+ETHERNET_INTERFACES_RESP = (
+    '{"Members": [{"@odata.id": "%(uri)s/NIC.Integrated.1-1-1"}, '
+    '{"@odata.id": "%(uri)s/NIC.Slot.2-1-1"}]}' % {"uri": ETHERNET_URI}
+)
+ETHERNET_INTERFACE_1 = (
+    '{"Id": "NIC.Integrated.1-1-1", "MACAddress": "f8:bc:12:0a:00:01"}'
+)
+ETHERNET_INTERFACE_2 = '{"Id": "NIC.Slot.2-1-1", "MACAddress": "f8:bc:12:0a:00:02"}'
+EMPTY_COLLECTION_RESP = '{"Members": []}'
+RESPONSE_FIND_MAC = "- INFO     - MAC address %s belongs to %s on host %s.\n" % (
+    MOCK_MAC,
+    DEVICE_NIC_2["name"],
+    MOCK_HOST,
+)
+RESPONSE_FIND_MAC_NOT_FOUND = (
+    "- ERROR    - MAC address AA:BB:CC:DD:EE:FF not found on host %s.\n" % MOCK_HOST
+)
+
+# test_power_events
+SYSTEM_URI = "/redfish/v1/Systems/System.Embedded.1"
+EVENT_STREAM_URI = "/redfish/v1/SSE"
+EVENT_SERVICE_RESP = {"ServiceEnabled": True, "ServerSentEventUri": EVENT_STREAM_URI}
+EVENT_UNRELATED = {"Events": [{"MessageId": "Base.1.0.Success", "Message": "Ok"}]}
+EVENT_POWER_OFF = {
+    "Events": [
+        {
+            "MessageId": "SYS1001",
+            "Message": "System is turning off.",
+            "OriginOfCondition": {"@odata.id": SYSTEM_URI},
+        }
+    ]
+}
+
+# test_job_tracker
+JOB_URI = "/redfish/v1/Managers/iDRAC.Embedded.1/Jobs"
+JOB_LOCATION = {"Location": "%s/%s" % (JOB_URI, JOB_ID)}
+JOB_SCHEDULED_RESP = '{"Message": "Task successfully scheduled."}'
+JOB_RUNNING_RESP = (
+    '{"Id": "%s", "JobState": "Running", "PercentComplete": 40, '
+    '"Message": "Job in progress."}' % JOB_ID
+)
+JOB_COMPLETED_RESP = (
+    '{"Id": "%s", "JobState": "Completed", "PercentComplete": 100, '
+    '"Message": "Job completed successfully."}' % JOB_ID
+)
+JOB_ID_2 = "JID_498218641681"
+JOBS_EXPANDED_RESP = (
+    '{"Members": ['
+    '{"@odata.id": "%(uri)s/JID_000000000001", "Id": "JID_000000000001", '
+    '"JobState": "Completed", "PercentComplete": 100}, '
+    '{"@odata.id": "%(uri)s/%(job)s", "Id": "%(job)s", '
+    '"JobState": "Completed", "PercentComplete": 100}, '
+    '{"@odata.id": "%(uri)s/%(job2)s", "Id": "%(job2)s", '
+    '"JobState": "Running", "PercentComplete": 20}]}'
+    % {"uri": JOB_URI, "job": JOB_ID, "job2": JOB_ID_2}
+)
+RESPONSE_CHANGE_BOOT_WAIT_JOBS = (
+    f"- WARNING  - Job queue already cleared for iDRAC {MOCK_HOST}, DELETE command will not "
+    "execute.\n"
+    "- INFO     - PATCH command passed to update boot order.\n"
+    "- INFO     - POST command passed to create target config job.\n"
+    f"- INFO     - Command passed to check job status {JOB_ID}\n"
+    f"- INFO     - Job id {JOB_ID} successfully scheduled.\n"
+    "- INFO     - Command passed to ForceOff server, code return is 200.\n"
+    "- INFO     - Polling for host state: Off\n"
+    "- INFO     - Command passed to On server, code return is 200.\n"
+    f"- INFO     - Waiting for jobs to finish: {JOB_ID}.\n"
+    f"- INFO     - Job {JOB_ID} is Running, 40% complete.\n"
+    f"- INFO     - Job {JOB_ID} is Completed, 100% complete.\n"
+)
+
+# test_detect_type
+RESPONSE_DETECT_DIRECTOR = "- INFO     - Boot order matches host type: director.\n"
+RESPONSE_DETECT_NO_MATCH = (
+    "- WARNING  - Boot order does not match any host type, closest is director "
+    "with 2 position(s) differing.\n"
+)
@@ -0,0 +1,25 @@
+from aiohttp.test_utils import unittest_run_loop
+
+from badfish.badfish import Backoff
+from tests.test_base import TestBase
+
+
+class TestBackoff(TestBase):
+    def test_delays_grow_up_to_cap(self):
+        backoff = Backoff(3600, initial=1, factor=2, maximum=8)
+        delays = [backoff.next_delay() for _ in range(6)]
+        for delay, base in zip(delays, [1, 2, 4, 8, 8, 8]):
+            assert base / 2 <= delay <= base
+
+    def test_delay_never_passes_deadline(self):
+        backoff = Backoff(3, initial=10)
+        assert backoff.next_delay() <= 3
+
+    @unittest_run_loop
+    async def test_deadline_ends_wait(self):
+        backoff = Backoff(60, initial=1, factor=2, maximum=15)
+        waits = 0
+        while await backoff.wait():
+            waits += 1
+        assert backoff.remaining <= 0
+        assert 5 <= waits <= 12
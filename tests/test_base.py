@@ -1,5 +1,6 @@
 import sys
 import time
+from logging import getLogger
 
 import pytest
 from asynctest import CoroutineMock
@@ -7,13 +8,24 @@ from aiohttp import web
 from aiohttp.test_utils import AioHTTPTestCase
 from asynctest import patch
 
-from badfish.badfish import main, BadfishException
+from badfish.badfish import main, Badfish, BadfishException
 from tests import config
 
 
-class TestBase(AioHTTPTestCase):
-    patch("asyncio.sleep").start()
+class FakeClock:
+    # Sleeps return right away and move the clock forward instead, so waits
+    # reach their deadline without taking that long.
+    def __init__(self):
+        self.offset = 0
+
+    def monotonic(self):
+        return time.monotonic() + self.offset
+
+    def sleep(self, delay, *args, **kwargs):
+        self.offset += delay
 
+
+class TestBase(AioHTTPTestCase):
     async def get_application(self):
         return web.Application()
 
@@ -33,12 +45,41 @@ class TestBase(AioHTTPTestCase):
     def inject_capsys(self, capsys):
         self._capsys = capsys
 
+    @pytest.fixture(autouse=True)
+    def isolate_cache(self, tmp_path, monkeypatch):
+        self.cache_home = str(tmp_path)
+        monkeypatch.setenv("XDG_CACHE_HOME", self.cache_home)
+
+    @pytest.fixture(autouse=True)
+    def fake_clock(self):
+        self.clock = FakeClock()
+        sleep = CoroutineMock(side_effect=self.clock.sleep)
+        with patch("asyncio.sleep", sleep), patch(
+            "badfish.badfish.time", wraps=time, monotonic=self.clock.monotonic
+        ):
+            yield
+
     @pytest.fixture(autouse=True)
     def capture_wrap(self):
         sys.stderr.close = lambda *args: None
         sys.stdout.close = lambda *args: None
         yield
 
+    async def get_badfish(self, **kwargs):
+        badfish = Badfish(
+            config.MOCK_HOST,
+            config.MOCK_USER,
+            config.MOCK_PASS,
+            getLogger(type(self).__module__),
+            15,
+            **kwargs
+        )
+        await badfish.open_session()
+        badfish.host_uri = str(self.server.make_url("")).rstrip("/")
+        badfish.root_uri = "%s%s" % (badfish.host_uri, badfish.redfish_uri)
+        badfish.system_resource = config.SYSTEM_URI
+        return badfish
+
     def badfish_call(self):
         argv = ["-H", config.MOCK_HOST, "-u", config.MOCK_USER, "-p", config.MOCK_PASS]
         argv.extend(self.args)
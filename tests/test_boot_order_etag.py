@@ -0,0 +1,170 @@
+import copy
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import unittest_run_loop
+
+from badfish.badfish import BadfishException
+from tests.config import (
+    BOOT_SEQ_RESPONSE_DIRECTOR,
+    BOOT_SEQ_RESPONSE_FOREMAN,
+    DEVICE_HDD_1,
+    DEVICE_NIC_1,
+    DEVICE_NIC_2,
+    SYSTEM_URI,
+    render_device_dict,
+)
+from tests.test_base import TestBase
+
+DEVICE_HDD_2 = {"name": "HardDisk.List.1-2", "hash": "0c3f5d9d7ab1c4b2e54f4f0a6c1b2d3e"}
+DEVICE_CD_1 = {
+    "name": "Optical.SATAEmbedded.J-1",
+    "hash": "7d1e2a0b9c8f6e5d4c3b2a1f0e9d8c7b",
+}
+
+
+class TestBootOrderETag(TestBase):
+    async def get_application(self):
+        self.version = 1
+        self.bios_gets = 0
+        self.if_match = []
+        self.always_changed = False
+        self.boot_seq = copy.deepcopy(BOOT_SEQ_RESPONSE_DIRECTOR)
+        self.requests = []
+        app = web.Application(middlewares=[self.record])
+        app.router.add_get("%s/Bios" % SYSTEM_URI, self.bios)
+        app.router.add_get("%s/BootSources" % SYSTEM_URI, self.boot_sources)
+        app.router.add_get(
+            "%s/BootSources/Settings" % SYSTEM_URI, self.boot_sources_settings_get
+        )
+        app.router.add_patch(
+            "%s/BootSources/Settings" % SYSTEM_URI, self.boot_sources_settings
+        )
+        return app
+
+    @web.middleware
+    async def record(self, request, handler):
+        self.requests.append((request.method, request.path))
+        return await handler(request)
+
+    @property
+    def etag(self):
+        return '"%s"' % self.version
+
+    async def bios(self, request):
+        self.bios_gets += 1
+        return web.json_response({"Attributes": {"BootMode": "Bios"}})
+
+    async def boot_sources(self, request):
+        return web.json_response({"Attributes": {"BootSeq": self.boot_seq}})
+
+    async def boot_sources_settings_get(self, request):
+        return web.json_response({"Attributes": {}}, headers={"ETag": self.etag})
+
+    async def boot_sources_settings(self, request):
+        self.if_match.append(request.headers.get("If-Match"))
+        if self.always_changed:
+            self.version += 1
+        if request.headers.get("If-Match") != self.etag:
+            return web.json_response({}, status=412)
+        self.boot_seq = (await request.json())["Attributes"]["BootSeq"]
+        self.version += 1
+        return web.json_response({}, headers={"ETag": self.etag})
+
+    def concurrent_change(self):
+        for device in self.boot_seq:
+            device["Enabled"] = False
+        self.version += 1
+
+    async def patch_foreman_order(self, badfish):
+        interfaces = [device["Name"] for device in BOOT_SEQ_RESPONSE_FOREMAN]
+        await badfish.patch_boot_seq(badfish.order_boot_devices(interfaces), interfaces)
+
+    @unittest_run_loop
+    async def test_patch_sends_if_match(self):
+        badfish = await self.get_badfish()
+        try:
+            await badfish.get_boot_devices(for_update=True)
+            await self.patch_foreman_order(badfish)
+        finally:
+            await badfish.close()
+        assert self.if_match == ['"1"']
+        assert self.bios_gets == 1
+        assert sorted(self.boot_seq, key=lambda x: x["Index"]) == json.loads(
+            json.dumps(BOOT_SEQ_RESPONSE_FOREMAN)
+        )
+
+    @unittest_run_loop
+    async def test_precondition_failed_refreshes_boot_sources(self):
+        badfish = await self.get_badfish()
+        try:
+            await badfish.get_boot_devices(for_update=True)
+            self.concurrent_change()
+            await self.patch_foreman_order(badfish)
+        finally:
+            await badfish.close()
+        assert self.if_match == ['"1"', '"2"']
+        assert [device["Index"] for device in self.boot_seq] == [2, 1, 0]
+        assert not any(device["Enabled"] for device in self.boot_seq)
+
+    @unittest_run_loop
+    async def test_precondition_failed_keeps_untouched_moves(self):
+        self.boot_seq.extend(
+            [render_device_dict(3, DEVICE_HDD_2), render_device_dict(4, DEVICE_CD_1)]
+        )
+        badfish = await self.get_badfish()
+        try:
+            await badfish.get_boot_devices(for_update=True)
+            # Another operator swaps two devices the requested order leaves alone.
+            self.boot_seq[3]["Index"], self.boot_seq[4]["Index"] = 4, 3
+            self.version += 1
+            await self.patch_foreman_order(badfish)
+        finally:
+            await badfish.close()
+        assert self.if_match == ['"1"', '"2"']
+        indexes = {device["Name"]: device["Index"] for device in self.boot_seq}
+        assert indexes == {
+            DEVICE_NIC_2["name"]: 0,
+            DEVICE_HDD_1["name"]: 1,
+            DEVICE_NIC_1["name"]: 2,
+            DEVICE_HDD_2["name"]: 4,
+            DEVICE_CD_1["name"]: 3,
+        }
+
+    @unittest_run_loop
+    async def test_precondition_failed_requested_device_removed(self):
+        badfish = await self.get_badfish()
+        try:
+            await badfish.get_boot_devices(for_update=True)
+            self.boot_seq.pop()
+            self.version += 1
+            with self.assertRaises(BadfishException):
+                await self.patch_foreman_order(badfish)
+        finally:
+            await badfish.close()
+        assert self.if_match == ['"1"']
+
+    @unittest_run_loop
+    async def test_precondition_failed_gives_up_after_retries(self):
+        self.always_changed = True
+        badfish = await self.get_badfish()
+        badfish.retries = 2
+        try:
+            await badfish.get_boot_devices(for_update=True)
+            with self.assertRaises(BadfishException):
+                await self.patch_foreman_order(badfish)
+        finally:
+            await badfish.close()
+        assert self.if_match == ['"1"', '"2"', '"3"']
+
+    @unittest_run_loop
+    async def test_check_boot_skips_settings_etag(self):
+        badfish = await self.get_badfish()
+        try:
+            await badfish.check_boot(None)
+        finally:
+            await badfish.close()
+        assert self.requests == [
+            ("GET", "%s/Bios" % SYSTEM_URI),
+            ("GET", "%s/BootSources" % SYSTEM_URI),
+        ]
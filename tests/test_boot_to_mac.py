@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+from asynctest import patch
+
+from badfish.badfish import main
+from tests.config import (
+    BOOT_MODE_RESP,
+    BOOT_SEQ_RESP,
+    BOOT_SEQ_RESPONSE_DIRECTOR,
+    BLANK_RESP,
+    EMPTY_COLLECTION_RESP,
+    ETHERNET_INTERFACES_RESP,
+    ETHERNET_INTERFACE_1,
+    ETHERNET_INTERFACE_2,
+    INIT_RESP,
+    JOB_OK_RESP,
+    MOCK_HOST,
+    MOCK_MAC,
+    MOCK_PASS,
+    MOCK_USER,
+    SYSTEM_INIT_RESP,
+    RESPONSE_BOOT_TO,
+    RESPONSE_FIND_MAC,
+    RESPONSE_FIND_MAC_NOT_FOUND,
+)
+from tests.test_base import TestBase
+
+MAC_CRAWL_RESP = [
+    ETHERNET_INTERFACES_RESP,
+    EMPTY_COLLECTION_RESP,
+    ETHERNET_INTERFACE_1,
+    ETHERNET_INTERFACE_2,
+]
+
+
+class TestBootToMac(TestBase):
+    option_arg = "--boot-to-mac"
+
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.patch")
+    @patch("aiohttp.ClientSession.get")
+    def test_boot_to_mac(self, mock_get, mock_patch, mock_post):
+        boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_DIRECTOR)
+        get_resp = [
+            BOOT_MODE_RESP,
+            boot_seq_resp_fmt.replace("'", '"'),
+            BLANK_RESP,
+        ]
+        responses = INIT_RESP + MAC_CRAWL_RESP + get_resp
+        self.set_mock_response(mock_get, 200, responses)
+        self.set_mock_response(mock_patch, 200, ["OK"])
+        self.set_mock_response(mock_post, 200, JOB_OK_RESP)
+        self.args = [self.option_arg, MOCK_MAC.lower()]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_BOOT_TO
+
+    @patch("aiohttp.ClientSession.get")
+    def test_find_mac_indexed(self, mock_get):
+        responses = SYSTEM_INIT_RESP + MAC_CRAWL_RESP
+        self.set_mock_response(mock_get, 200, responses)
+        self.args = ["--find-mac", MOCK_MAC]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_FIND_MAC
+
+        mock_get.reset_mock()
+        _, err = self.badfish_call()
+        assert err == RESPONSE_FIND_MAC
+        assert mock_get.call_count == 0
+
+    @patch("aiohttp.ClientSession.get")
+    def test_find_mac_miss_trusts_index(self, mock_get):
+        responses = SYSTEM_INIT_RESP + MAC_CRAWL_RESP
+        self.set_mock_response(mock_get, 200, responses)
+        argv = ["-H", MOCK_HOST, "-u", MOCK_USER, "-p", MOCK_PASS]
+        argv.extend(["--find-mac", "AA:BB:CC:DD:EE:FF"])
+        assert main(argv) == 1
+
+        mock_get.reset_mock()
+        assert main(argv) == 1
+        _, err = self._capsys.readouterr()
+        assert err == RESPONSE_FIND_MAC_NOT_FOUND * 2
+        assert mock_get.call_count == 0
+
+    @patch("aiohttp.ClientSession.get")
+    def test_find_mac_host_list_not_found(self, mock_get):
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + MAC_CRAWL_RESP)
+        _fd, host_list = tempfile.mkstemp()
+        with os.fdopen(_fd, "w") as _file:
+            _file.write("%s\n" % MOCK_HOST)
+        argv = ["--host-list", host_list, "-u", MOCK_USER, "-p", MOCK_PASS]
+        argv.extend(["--find-mac", "AA:BB:CC:DD:EE:FF"])
+        try:
+            assert main(argv) == 1
+        finally:
+            os.remove(host_list)
+        _, err = self._capsys.readouterr()
+        assert err.endswith(
+            "- ERROR    - MAC address AA:BB:CC:DD:EE:FF not found on any host.\n"
+        )
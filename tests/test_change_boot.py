@@ -1,3 +1,6 @@
+import copy
+import json
+
 from asynctest import patch
 from tests.config import (
     BOOT_SEQ_RESPONSE_DIRECTOR,
@@ -8,6 +11,7 @@ from tests.config import (
     INIT_RESP,
     BLANK_RESP,
     STATE_ON_RESP,
+    STATE_OFF_RESP,
     JOB_OK_RESP,
     BOOT_SEQ_RESPONSE_FOREMAN,
     RESPONSE_CHANGE_TO_SAME,
@@ -29,10 +33,11 @@ class TestChangeBoot(TestBase):
             BOOT_MODE_RESP,
             boot_seq_resp_fmt.replace("'", '"'),
             BLANK_RESP,
-            BOOT_MODE_RESP,
+            boot_seq_resp_fmt.replace("'", '"'),
             RESET_TYPE_RESP,
             STATE_ON_RESP,
             STATE_ON_RESP,
+            STATE_OFF_RESP,
         ]
         responses = INIT_RESP + get_resp
         self.set_mock_response(mock_get, 200, responses)
@@ -51,10 +56,11 @@ class TestChangeBoot(TestBase):
             BOOT_MODE_RESP,
             boot_seq_resp_fmt.replace("'", '"'),
             BLANK_RESP,
-            BOOT_MODE_RESP,
+            boot_seq_resp_fmt.replace("'", '"'),
             RESET_TYPE_RESP,
             STATE_ON_RESP,
             STATE_ON_RESP,
+            STATE_OFF_RESP,
         ]
         responses = INIT_RESP + get_resp
         self.set_mock_response(mock_get, 200, responses)
@@ -125,3 +131,38 @@ class TestChangeBoot(TestBase):
         self.args = [self.option_arg, "director"]
         _, err = self.badfish_call()
         assert err == RESPONSE_CHANGE_NO_INT
+
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.patch")
+    @patch("aiohttp.ClientSession.get")
+    def test_change_reads_devices_after_etag(self, mock_get, mock_patch, mock_post):
+        # The boot order changes on the host after it was first classified.
+        changed = copy.deepcopy(BOOT_SEQ_RESPONSE_DIRECTOR)
+        changed[1]["Enabled"] = "False"
+        get_resp = [
+            BOOT_MODE_RESP,
+            BOOT_SEQ_RESP % json.dumps(BOOT_SEQ_RESPONSE_DIRECTOR),
+            BLANK_RESP,
+            BOOT_SEQ_RESP % json.dumps(changed),
+            RESET_TYPE_RESP,
+            STATE_ON_RESP,
+            STATE_ON_RESP,
+            STATE_OFF_RESP,
+        ]
+        responses = INIT_RESP + get_resp
+        self.set_mock_response(mock_get, 200, responses)
+        self.set_mock_response(mock_patch, 200, ["OK"])
+        self.set_mock_response(mock_post, 200, JOB_OK_RESP)
+        self.args = ["-i", INTERFACES_PATH, self.option_arg, "foreman"]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_CHANGE_BOOT
+
+        uris = [call[0][0] for call in mock_get.call_args_list]
+        boot_sources = [i for i, uri in enumerate(uris) if uri.endswith("/BootSources")]
+        settings = uris.index(uris[boot_sources[0]] + "/Settings")
+        assert boot_sources[0] < settings < boot_sources[1]
+        payload = json.loads(mock_patch.call_args[1]["data"])
+        devices = {
+            device["Name"]: device for device in payload["Attributes"]["BootSeq"]
+        }
+        assert devices[changed[1]["Name"]]["Enabled"] == "False"
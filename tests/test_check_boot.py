@@ -3,7 +3,7 @@ from tests.config import (
     BOOT_MODE_RESP,
     BOOT_SEQ_RESP,
     BOOT_SEQ_RESPONSE_DIRECTOR,
-    INIT_RESP,
+    SYSTEM_INIT_RESP,
     BOOT_SEQ_RESPONSE_FOREMAN,
     RESPONSE_WITHOUT,
     RESPONSE_DIRECTOR,
@@ -22,7 +22,7 @@ class TestCheckBoot(TestBase):
     def test_check_boot_without_interfaces(self, mock_get):
         boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_DIRECTOR)
         responses_add = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"')]
-        responses = INIT_RESP + responses_add
+        responses = SYSTEM_INIT_RESP + responses_add
         self.set_mock_response(mock_get, 200, responses)
         self.args = [self.option_arg]
         _, err = self.badfish_call()
@@ -32,7 +32,7 @@ class TestCheckBoot(TestBase):
     def test_check_boot_with_interfaces_director(self, mock_get):
         boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_DIRECTOR)
         responses_add = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"')]
-        responses = INIT_RESP + responses_add
+        responses = SYSTEM_INIT_RESP + responses_add
         self.set_mock_response(mock_get, 200, responses)
         self.args = ["-i", INTERFACES_PATH, self.option_arg]
         _, err = self.badfish_call()
@@ -42,7 +42,7 @@ class TestCheckBoot(TestBase):
     def test_check_boot_with_interfaces_foreman(self, mock_get):
         boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_FOREMAN)
         responses_add = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"')]
-        responses = INIT_RESP + responses_add
+        responses = SYSTEM_INIT_RESP + responses_add
         self.set_mock_response(mock_get, 200, responses)
         self.args = ["-i", INTERFACES_PATH, self.option_arg]
         _, err = self.badfish_call()
@@ -52,7 +52,7 @@ class TestCheckBoot(TestBase):
     def test_check_boot_no_match(self, mock_get):
         boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_NO_MATCH)
         responses_add = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"')]
-        responses = INIT_RESP + responses_add
+        responses = SYSTEM_INIT_RESP + responses_add
         self.set_mock_response(mock_get, 200, responses)
         self.args = ["-i", INTERFACES_PATH, self.option_arg]
         _, err = self.badfish_call()
@@ -0,0 +1,89 @@
+from aiohttp import web
+from aiohttp.test_utils import unittest_run_loop
+
+from badfish.badfish import BadfishException, JOB_DELETE_CONCURRENCY
+from tests.config import JOB_URI
+from tests.test_base import TestBase
+
+JOB_IDS = ["JID_%012d" % i for i in range(20)] + ["RID_000000000001"]
+PAGE_SIZE = 8
+
+
+class TestClearJobs(TestBase):
+    async def get_application(self):
+        self.jobs = list(JOB_IDS)
+        self.failing = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        app = web.Application()
+        app.router.add_get(JOB_URI, self.job_queue)
+        app.router.add_delete(JOB_URI + "/{job}", self.delete_job)
+        return app
+
+    async def job_queue(self, request):
+        skip = int(request.query.get("$skip", 0))
+        data = {
+            "Members": [
+                {"@odata.id": "%s/%s" % (JOB_URI, job)}
+                for job in self.jobs[skip : skip + PAGE_SIZE]
+            ]
+        }
+        if skip + PAGE_SIZE < len(self.jobs):
+            data["Members@odata.nextLink"] = "%s?$skip=%s" % (
+                JOB_URI,
+                skip + PAGE_SIZE,
+            )
+        return web.json_response(data)
+
+    async def delete_job(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        future = self.loop.create_future()
+        self.loop.call_later(0.01, future.set_result, None)
+        await future
+        self.in_flight -= 1
+        job = request.match_info["job"]
+        if job in self.failing:
+            return web.json_response({}, status=400)
+        self.jobs.remove(job)
+        return web.json_response({})
+
+    async def get_badfish(self):
+        badfish = await super().get_badfish()
+        badfish.manager_resource = JOB_URI.rsplit("/", 1)[0]
+        return badfish
+
+    @unittest_run_loop
+    async def test_job_queue_follows_next_link(self):
+        badfish = await self.get_badfish()
+        try:
+            assert await badfish.get_job_queue() == JOB_IDS
+        finally:
+            await badfish.close()
+
+    @unittest_run_loop
+    async def test_clear_job_list_concurrently(self):
+        badfish = await self.get_badfish()
+        try:
+            await badfish.clear_job_list(await badfish.get_job_queue())
+        finally:
+            await badfish.close()
+        assert self.jobs == []
+        assert 1 < self.max_in_flight <= JOB_DELETE_CONCURRENCY
+
+    @unittest_run_loop
+    async def test_clear_job_list_reports_failed_jobs(self):
+        self.failing = {JOB_IDS[3], JOB_IDS[-1]}
+        badfish = await self.get_badfish()
+        try:
+            with self.assertLogs(__name__, "WARNING") as logs:
+                with self.assertRaises(BadfishException):
+                    await badfish.clear_job_list(list(JOB_IDS))
+        finally:
+            await badfish.close()
+        assert sorted(self.jobs) == sorted(self.failing)
+        for job in self.failing:
+            assert (
+                "WARNING:%s:Could not delete job %s, status code 400." % (__name__, job)
+                in logs.output
+            )
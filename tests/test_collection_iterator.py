@@ -0,0 +1,97 @@
+from aiohttp import web
+from aiohttp.test_utils import unittest_run_loop
+
+from tests.config import SYSTEM_URI
+from tests.test_base import TestBase
+
+LOG_URI = "%s/LogServices/Sel/Entries" % SYSTEM_URI
+ENTRIES = ["%s/%s" % (LOG_URI, i) for i in range(25)]
+PAGE_SIZE = 10
+
+
+class TestCollectionIterator(TestBase):
+    async def get_application(self):
+        self.pages = []
+        self.entries = []
+        app = web.Application()
+        app.router.add_get("/redfish/v1", self.service_root)
+        app.router.add_get(LOG_URI, self.log_entries)
+        app.router.add_get(LOG_URI + "/{entry}", self.log_entry)
+        return app
+
+    async def service_root(self, request):
+        return web.json_response({})
+
+    async def log_entries(self, request):
+        skip = int(request.query.get("$skip", 0))
+        self.pages.append(skip)
+        data = {
+            "Members": [
+                {"@odata.id": entry} for entry in ENTRIES[skip : skip + PAGE_SIZE]
+            ]
+        }
+        if skip + PAGE_SIZE < len(ENTRIES):
+            data["Members@odata.nextLink"] = "%s?$skip=%s" % (LOG_URI, skip + PAGE_SIZE)
+        return web.json_response(data)
+
+    async def log_entry(self, request):
+        self.entries.append(request.match_info["entry"])
+        return web.json_response({"Id": request.match_info["entry"]})
+
+    @unittest_run_loop
+    async def test_follows_next_link(self):
+        badfish = await self.get_badfish()
+        try:
+            members = [
+                member["@odata.id"]
+                async for member in badfish.iter_collection(badfish.host_uri + LOG_URI)
+            ]
+        finally:
+            await badfish.close()
+        assert members == ENTRIES
+        assert self.pages == [0, 10, 20]
+        assert self.entries == []
+
+    @unittest_run_loop
+    async def test_prefetches_next_page(self):
+        badfish = await self.get_badfish()
+        try:
+            collection = badfish.iter_collection(
+                badfish.host_uri + LOG_URI, prefetch=True
+            )
+            await collection.__anext__()
+            future = self.loop.create_future()
+            self.loop.call_later(0.05, future.set_result, None)
+            await future
+            assert self.pages == [0, 10]
+            await collection.aclose()
+        finally:
+            await badfish.close()
+
+    @unittest_run_loop
+    async def test_fetches_members(self):
+        badfish = await self.get_badfish()
+        try:
+            members = [
+                member
+                async for member in badfish.iter_collection(
+                    badfish.host_uri + LOG_URI,
+                    member_filter=lambda uri: int(uri.split("/")[-1]) % 2 == 0,
+                    fetch=True,
+                )
+            ]
+        finally:
+            await badfish.close()
+        assert [member["Id"] for member in members] == [str(i) for i in range(0, 25, 2)]
+        assert sorted(self.entries, key=int) == [str(i) for i in range(0, 25, 2)]
+
+    @unittest_run_loop
+    async def test_stops_early(self):
+        badfish = await self.get_badfish()
+        try:
+            async for member in badfish.iter_collection(badfish.host_uri + LOG_URI):
+                if member["@odata.id"] == ENTRIES[3]:
+                    break
+        finally:
+            await badfish.close()
+        assert self.pages == [0]
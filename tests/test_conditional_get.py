@@ -0,0 +1,95 @@
+import json
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import unittest_run_loop
+
+from badfish.badfish import DiscoveryCache
+from tests.config import SYSTEM_URI
+from tests.test_base import TestBase
+
+MEMORY_URI = "%s/Memory" % SYSTEM_URI
+MEMORY_RESP = {"Members": [{"@odata.id": "%s/DIMM.Socket.A1" % MEMORY_URI}]}
+BIOS_URI = "%s/Bios" % SYSTEM_URI
+
+
+class TestConditionalGet(TestBase):
+    async def get_application(self):
+        self.etag = '"1"'
+        self.requests = []
+        app = web.Application()
+        app.router.add_get(MEMORY_URI, self.memory)
+        app.router.add_get(SYSTEM_URI, self.system)
+        app.router.add_get(BIOS_URI, self.bios)
+        return app
+
+    async def memory(self, request):
+        self.requests.append(request.headers.get("If-None-Match"))
+        headers = {"ETag": self.etag} if self.etag else {}
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers=headers)
+        return web.json_response(MEMORY_RESP, headers=headers)
+
+    async def system(self, request):
+        self.requests.append(request.headers.get("If-None-Match"))
+        return web.json_response({"PowerState": "On"}, headers={"ETag": '"1"'})
+
+    async def bios(self, request):
+        self.requests.append(request.headers.get("If-None-Match"))
+        return web.json_response({"Attributes": {}}, headers={"ETag": '"1"'})
+
+    async def get_body(self, uri):
+        discovery = DiscoveryCache(
+            os.path.join(self.cache_home, "badfish", "discovery.json")
+        )
+        badfish = await self.get_badfish(_discovery=discovery)
+        try:
+            response = await badfish.get_request(badfish.host_uri + uri)
+            return json.loads(await response.text()), badfish.validators
+        finally:
+            await badfish.close()
+
+    @unittest_run_loop
+    async def test_not_modified_reuses_body(self):
+        data, validators = await self.get_body(MEMORY_URI)
+        assert data == MEMORY_RESP
+        assert os.path.exists(validators.path)
+
+        data, validators = await self.get_body(MEMORY_URI)
+        assert data == MEMORY_RESP
+        assert self.requests == [None, '"1"']
+        assert validators.not_modified == 1
+        assert not validators.updated
+
+    @unittest_run_loop
+    async def test_changed_etag_refreshes_body(self):
+        await self.get_body(MEMORY_URI)
+        self.etag = '"2"'
+        data, validators = await self.get_body(MEMORY_URI)
+        assert data == MEMORY_RESP
+        assert self.requests == [None, '"1"']
+        assert validators.get(MEMORY_URI)["etag"] == '"2"'
+
+    @unittest_run_loop
+    async def test_content_hash_without_etag(self):
+        self.etag = None
+        await self.get_body(MEMORY_URI)
+        data, validators = await self.get_body(MEMORY_URI)
+        assert data == MEMORY_RESP
+        assert self.requests == [None, None]
+        assert validators.unchanged == 1
+
+    @unittest_run_loop
+    async def test_polled_resources_not_revalidated(self):
+        await self.get_body(SYSTEM_URI)
+        _, validators = await self.get_body(SYSTEM_URI)
+        assert self.requests == [None, None]
+        assert validators.get(SYSTEM_URI) is None
+
+    @unittest_run_loop
+    async def test_settings_not_stored(self):
+        await self.get_body(BIOS_URI)
+        _, validators = await self.get_body(BIOS_URI)
+        assert self.requests == [None, None]
+        assert validators.get(BIOS_URI) is None
+        assert not os.path.exists(validators.path)
@@ -0,0 +1,57 @@
+from asynctest import patch
+
+from badfish.badfish import BootOrderClassifier
+from tests.config import (
+    BOOT_MODE_RESP,
+    BOOT_SEQ_RESP,
+    BOOT_SEQ_RESPONSE_DIRECTOR,
+    BOOT_SEQ_RESPONSE_NO_MATCH,
+    INTERFACES_PATH,
+    RESPONSE_DETECT_DIRECTOR,
+    RESPONSE_DETECT_NO_MATCH,
+    SYSTEM_INIT_RESP,
+)
+from tests.test_base import TestBase
+
+
+class TestDetectType(TestBase):
+    option_arg = "--detect-type"
+
+    def test_classifier(self):
+        classifier = BootOrderClassifier(
+            {
+                "director": ["NIC.1", "Disk.1", "NIC.2"],
+                "foreman": ["NIC.2", "Disk.1", "NIC.1"],
+                "custom": ["NIC.1", "Disk.1"],
+            }
+        )
+        assert classifier.classify(["NIC.1", "Disk.1", "NIC.2", "NIC.3"]) == {
+            "match": "custom",
+            "closest": "custom",
+            "differences": 0,
+        }
+        assert classifier.classify(["NIC.2", "Disk.2", "NIC.1"]) == {
+            "match": None,
+            "closest": "foreman",
+            "differences": 1,
+        }
+        assert classifier.classify(["NIC.1"])["closest"] == "custom"
+        assert BootOrderClassifier({}).classify(["NIC.1"])["closest"] is None
+
+    @patch("aiohttp.ClientSession.get")
+    def test_detect_type_match(self, mock_get):
+        boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_DIRECTOR)
+        responses_add = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"')]
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + responses_add)
+        self.args = ["-i", INTERFACES_PATH, self.option_arg]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_DETECT_DIRECTOR
+
+    @patch("aiohttp.ClientSession.get")
+    def test_detect_type_closest(self, mock_get):
+        boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_NO_MATCH)
+        responses_add = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"')]
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + responses_add)
+        self.args = ["-i", INTERFACES_PATH, self.option_arg]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_DETECT_NO_MATCH
@@ -0,0 +1,91 @@
+import json
+import os
+
+import aiohttp
+
+from aiohttp.test_utils import unittest_run_loop
+from asynctest import patch
+
+from badfish.badfish import DiscoveryCache, main
+from tests.config import (
+    BOOT_MODE_RESP,
+    BOOT_SEQ_RESP,
+    BOOT_SEQ_RESPONSE_DIRECTOR,
+    SYSTEM_INIT_RESP,
+    MOCK_HOST,
+    MOCK_PASS,
+    MOCK_USER,
+    STATE_ON_RESP,
+    RESPONSE_POWER_STATE_ON,
+)
+from tests.test_base import TestBase
+
+
+class TestDiscoveryCache(TestBase):
+    option_arg = "--power-state"
+
+    @patch("aiohttp.ClientSession.get")
+    def test_discovery_reused(self, mock_get):
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + [STATE_ON_RESP])
+        self.args = [self.option_arg]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_POWER_STATE_ON
+        assert mock_get.call_count == len(SYSTEM_INIT_RESP) + 1
+
+        cache_path = os.path.join(self.cache_home, "badfish", "discovery.json")
+        with open(cache_path) as _file:
+            entry = json.load(_file)[MOCK_HOST]
+        assert entry["system_resource"] == "/redfish/v1/Systems/System.Embedded.1"
+        assert "manager_resource" not in entry
+
+        mock_get.reset_mock()
+        self.set_mock_response(mock_get, 200, [STATE_ON_RESP])
+        _, err = self.badfish_call()
+        assert err == RESPONSE_POWER_STATE_ON
+        assert mock_get.call_count == 1
+
+    @patch("aiohttp.ClientSession.get")
+    def test_refresh_cache(self, mock_get):
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + [STATE_ON_RESP])
+        self.args = [self.option_arg]
+        self.badfish_call()
+
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + [STATE_ON_RESP])
+        self.args = [self.option_arg, "--refresh-cache"]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_POWER_STATE_ON
+
+    @patch("aiohttp.ClientSession.get")
+    def test_unreachable_host_with_warm_cache(self, mock_get):
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + [STATE_ON_RESP])
+        self.args = [self.option_arg]
+        self.badfish_call()
+
+        mock_get.side_effect = aiohttp.ClientConnectionError()
+        argv = ["-H", MOCK_HOST, "-u", MOCK_USER, "-p", MOCK_PASS, self.option_arg]
+        assert main(argv) == 1
+        _, err = self._capsys.readouterr()
+        assert err == (
+            "- ERROR    - Failed to communicate with server.\n"
+            "- ERROR    - There was something wrong executing Badfish\n"
+        )
+
+    @patch("aiohttp.ClientSession.get")
+    @unittest_run_loop
+    async def test_stale_boot_mode(self, mock_get):
+        discovery = DiscoveryCache(
+            os.path.join(self.cache_home, "badfish", "discovery.json")
+        )
+        discovery.set(MOCK_HOST, "boot_mode", "Uefi")
+        boot_seq_resp = BOOT_SEQ_RESP % json.dumps(BOOT_SEQ_RESPONSE_DIRECTOR)
+        self.set_mock_response(mock_get, 200, [boot_seq_resp, BOOT_MODE_RESP])
+        badfish = await self.get_badfish(_discovery=discovery)
+        try:
+            await badfish.get_boot_devices()
+        finally:
+            await badfish.close()
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[1][0][0].endswith("/Bios")
+        assert badfish.boot_seq == "BootSeq"
+        assert badfish.boot_devices == BOOT_SEQ_RESPONSE_DIRECTOR
+        assert discovery.get(MOCK_HOST, "boot_mode") == "Bios"
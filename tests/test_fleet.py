@@ -0,0 +1,175 @@
+import asyncio
+from logging import DEBUG, WARNING, getLogger
+
+from asynctest import patch
+from aiohttp.test_utils import unittest_run_loop
+
+from badfish.badfish import BadfishFleet, BadfishFleetSync, MessageHandler
+from tests.config import (
+    BLANK_RESP,
+    INIT_RESP,
+    MOCK_HOST,
+    MOCK_PASS,
+    MOCK_USER,
+    STATE_OFF_RESP,
+    STATE_ON_RESP,
+    SYSTEM_INIT_RESP,
+)
+from tests.test_base import TestBase
+
+
+class TestFleet(TestBase):
+    @patch("aiohttp.ClientSession.get")
+    def test_sync_fleet_reuses_client(self, mock_get):
+        self.set_mock_response(
+            mock_get, 200, SYSTEM_INIT_RESP + [STATE_ON_RESP, STATE_OFF_RESP]
+        )
+        with BadfishFleetSync([MOCK_HOST], MOCK_USER, MOCK_PASS) as fleet:
+            results = fleet.run("get_power_state")
+            assert [(r.host, r.success, r.data) for r in results] == [
+                (MOCK_HOST, True, "On")
+            ]
+            results = fleet.run("get_power_state")
+            assert results[0].data == "Off"
+        assert mock_get.call_count == len(SYSTEM_INIT_RESP) + 2
+
+    @patch("aiohttp.ClientSession.get")
+    def test_sync_fleet_keeps_response_cache(self, mock_get):
+        async def read_memory(badfish):
+            await badfish.discover("system")
+            _url = "%s%s/Memory" % (badfish.host_uri, badfish.system_resource)
+            _response = await badfish.get_request(_url)
+            return await _response.text()
+
+        self.set_mock_response(
+            mock_get, 200, SYSTEM_INIT_RESP + [BLANK_RESP, BLANK_RESP]
+        )
+        with BadfishFleetSync([MOCK_HOST], MOCK_USER, MOCK_PASS) as fleet:
+            fleet.run(read_memory)
+            fleet.run(read_memory)
+            assert mock_get.call_count == len(SYSTEM_INIT_RESP) + 1
+            fleet.invalidate()
+            (result,) = fleet.run(read_memory)
+            assert mock_get.call_count == len(SYSTEM_INIT_RESP) + 2
+        assert result.data == BLANK_RESP
+
+    @patch("aiohttp.ClientSession.get")
+    def test_failures_are_reported_per_host(self, mock_get):
+        self.set_mock_response(mock_get, 200, INIT_RESP)
+        error = (
+            "You must provide a path to the interfaces yaml via `-i` optional argument."
+        )
+        with BadfishFleetSync([MOCK_HOST], MOCK_USER, MOCK_PASS) as fleet:
+            (result,) = fleet.run("change_boot", "director", None)
+        assert not result.success
+        assert result.errors == [error]
+        assert result.to_dict()["messages"] == [{"level": "ERROR", "message": error}]
+
+    @unittest_run_loop
+    async def test_async_fleet_with_callable(self):
+        async def power_state(badfish, prefix):
+            return "%s%s" % (prefix, await badfish.get_power_state())
+
+        with patch("aiohttp.ClientSession.get") as mock_get:
+            self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + [STATE_ON_RESP])
+            async with BadfishFleet([MOCK_HOST], MOCK_USER, MOCK_PASS) as fleet:
+                (result,) = await fleet.run(power_state, "state: ")
+        assert result.data == "state: On"
+
+    @unittest_run_loop
+    async def test_async_fleet_captures_info(self):
+        async def log_info(badfish):
+            badfish.logger.info("Power state checked.")
+
+        with patch("aiohttp.ClientSession.get") as mock_get:
+            self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP)
+            async with BadfishFleet([MOCK_HOST], MOCK_USER, MOCK_PASS) as fleet:
+                (result,) = await fleet.run(log_info)
+        assert result.success
+        assert result.messages == [("INFO", "Power state checked.")]
+
+    @unittest_run_loop
+    async def test_async_fleet_unexpected_error(self):
+        async def missing_key(badfish):
+            return {}["PowerState"]
+
+        with patch("aiohttp.ClientSession.get") as mock_get:
+            self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP)
+            async with BadfishFleet([MOCK_HOST], MOCK_USER, MOCK_PASS) as fleet:
+                (result,) = await fleet.run(missing_key)
+        assert not result.success
+        assert result.errors == [
+            "Unexpected error executing Badfish: KeyError('PowerState')"
+        ]
+
+    @unittest_run_loop
+    async def test_async_fleet_serializes_runs_per_host(self):
+        running = []
+
+        async def track(badfish, name):
+            running.append(name)
+            assert running == [name]
+            future = self.loop.create_future()
+            self.loop.call_later(0.01, future.set_result, None)
+            await future
+            badfish.logger.info(name)
+            running.remove(name)
+            return name
+
+        with patch("aiohttp.ClientSession.get") as mock_get:
+            self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP)
+            async with BadfishFleet([MOCK_HOST], MOCK_USER, MOCK_PASS) as fleet:
+                first, second = await asyncio.gather(
+                    fleet.run(track, "first"), fleet.run(track, "second")
+                )
+        assert [first[0].data, second[0].data] == ["first", "second"]
+        assert first[0].messages == [("INFO", "first")]
+        assert second[0].messages == [("INFO", "second")]
+        assert first[0].success and second[0].success
+
+    @unittest_run_loop
+    async def test_async_fleet_keeps_caller_level(self):
+        async def log_messages(badfish):
+            badfish.logger.info("Power state checked.")
+            badfish.logger.warning("Power state is Off.")
+
+        received = []
+        handler = MessageHandler(received, level=DEBUG)
+        caller = getLogger("%s.caller" % __name__)
+        caller.setLevel(WARNING)
+        caller.addHandler(handler)
+        try:
+            with patch("aiohttp.ClientSession.get") as mock_get:
+                self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP)
+                async with BadfishFleet(
+                    [MOCK_HOST], MOCK_USER, MOCK_PASS, logger=caller
+                ) as fleet:
+                    (result,) = await fleet.run(log_messages)
+        finally:
+            caller.removeHandler(handler)
+        assert result.messages == [
+            ("INFO", "Power state checked."),
+            ("WARNING", "Power state is Off."),
+        ]
+        assert received == [("WARNING", "Power state is Off.")]
+
+    @unittest_run_loop
+    async def test_async_fleet_logs_outside_runs(self):
+        received = []
+        handler = MessageHandler(received, level=DEBUG)
+        caller = getLogger("%s.outside" % __name__)
+        caller.setLevel(WARNING)
+        caller.addHandler(handler)
+        try:
+            with patch("aiohttp.ClientSession.get") as mock_get:
+                self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP)
+                async with BadfishFleet(
+                    [MOCK_HOST], MOCK_USER, MOCK_PASS, logger=caller
+                ) as fleet:
+                    await fleet.run("discover", "system")
+                    badfish = fleet.clients[MOCK_HOST]
+                    badfish.logger.info("Session closed.")
+                    badfish.logger.warning("Could not delete Redfish session.")
+        finally:
+            caller.removeHandler(handler)
+        assert received == [("WARNING", "Could not delete Redfish session.")]
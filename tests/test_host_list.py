@@ -0,0 +1,97 @@
+import os
+import tempfile
+from collections import defaultdict
+
+from asynctest import patch
+from badfish.badfish import FleetScheduler, get_host_name_fields
+from tests.config import (
+    FLEET_HOSTS,
+    SYSTEM_INIT_RESP,
+    MOCK_HOST,
+    STATE_ON_RESP,
+    RESPONSE_HOST_LIST_POWER_STATE,
+    RESPONSE_HOST_LIST_INVALID_LIMITS,
+)
+from tests.test_base import TestBase
+
+
+class TestHostList(TestBase):
+    option_arg = "--host-list"
+
+    def setUp(self):
+        super().setUp()
+        _fd, self.host_list = tempfile.mkstemp()
+        with os.fdopen(_fd, "w") as _file:
+            _file.write("%s\n\n" % MOCK_HOST)
+
+    def tearDown(self):
+        os.remove(self.host_list)
+        super().tearDown()
+
+    @patch("aiohttp.ClientSession.get")
+    def test_host_list_power_state(self, mock_get):
+        responses = SYSTEM_INIT_RESP + [STATE_ON_RESP]
+        self.set_mock_response(mock_get, 200, responses)
+        self.args = [self.option_arg, self.host_list, "--power-state"]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_HOST_LIST_POWER_STATE
+
+    def test_host_list_rejects_invalid_limits(self):
+        self.args = [
+            self.option_arg,
+            self.host_list,
+            "--max-per-rack",
+            "-1",
+            "--max-per-chassis",
+            "0",
+            "--power-state",
+        ]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_HOST_LIST_INVALID_LIMITS
+
+    def test_scheduler_limits(self):
+        active = defaultdict(int)
+        peak = defaultdict(int)
+
+        async def job(host):
+            rack = get_host_name_fields(host)["rack"]
+            for key in ["all", rack]:
+                active[key] += 1
+                peak[key] = max(peak[key], active[key])
+            future = self.loop.create_future()
+            self.loop.call_soon(future.set_result, None)
+            await future
+            for key in ["all", rack]:
+                active[key] -= 1
+            return host, True
+
+        async def run():
+            scheduler = FleetScheduler(4, max_per_rack=3)
+            tasks = [(host, lambda host=host: job(host)) for host in FLEET_HOSTS]
+            return [result async for result in scheduler.as_completed(tasks)]
+
+        results = self.loop.run_until_complete(run())
+        assert sorted(host for host, _ in results) == sorted(FLEET_HOSTS)
+        assert peak["all"] == 4
+        assert peak["f01"] == 3
+        assert peak["f02"] <= 3
+
+    @patch("aiohttp.ClientSession.get")
+    def test_host_list_isolates_unexpected_errors(self, mock_get):
+        with open(self.host_list, "w") as _file:
+            _file.write("\n".join(FLEET_HOSTS[:3]))
+
+        async def get_power_state(badfish):
+            if badfish.host == FLEET_HOSTS[0]:
+                raise KeyError("PowerState")
+            return "On"
+
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP * 3)
+        self.args = [self.option_arg, self.host_list, "--power-state"]
+        with patch("badfish.badfish.Badfish.get_power_state", new=get_power_state):
+            _, err = self.badfish_call()
+        assert "Unexpected error executing Badfish: KeyError('PowerState')" in err
+        assert "%s: FAILED" % FLEET_HOSTS[0] in err
+        for host in FLEET_HOSTS[1:3]:
+            assert "%s: SUCCESSFUL" % host in err
+        assert "RESULTS: 2 of 3 hosts SUCCESSFUL" in err
@@ -0,0 +1,57 @@
+import os
+import shutil
+
+import pytest
+import yaml
+from asynctest import patch
+
+from badfish.badfish import InterfacesIndex
+from tests.config import INTERFACES_PATH
+from tests.test_base import TestBase
+
+
+class TestInterfacesIndex(TestBase):
+    @pytest.fixture(autouse=True)
+    def interfaces_copy(self, tmp_path):
+        self.interfaces_path = str(tmp_path / "idrac_interfaces.yml")
+        shutil.copy(INTERFACES_PATH, self.interfaces_path)
+        with open(self.interfaces_path, "a") as _file:
+            _file.write("director_f21_h23_fc640_b02_interfaces: NIC.Slot.1-1-1\n")
+        self.compiled_dir = str(tmp_path / "compiled")
+        InterfacesIndex.indexes.clear()
+        yield
+        InterfacesIndex.indexes.clear()
+
+    def test_lookup_falls_back_to_less_specific_keys(self):
+        index = InterfacesIndex.load(self.interfaces_path)
+        assert index.host_types == ["director", "foreman"]
+        assert index.get("director", "f21", "h23", "fc640", "b02") == ["NIC.Slot.1-1-1"]
+        assert index.get("director", "f21", "h25", "fc640", "b02") == [
+            "NIC.ChassisSlot.4-1-1",
+            "HardDisk.List.1-1",
+            "NIC.Integrated.1-1-1",
+        ]
+        assert index.get("director", "f21", "h23", "r999") is None
+
+    def test_parsed_once_per_process(self):
+        index = InterfacesIndex.load(self.interfaces_path)
+        with patch("yaml.load", side_effect=AssertionError):
+            assert InterfacesIndex.load(self.interfaces_path) is index
+
+    def test_compiled_cache_reused(self):
+        index = InterfacesIndex.load(self.interfaces_path, self.compiled_dir)
+        assert len(os.listdir(self.compiled_dir)) == 1
+        InterfacesIndex.indexes.clear()
+        with patch("yaml.load", side_effect=AssertionError):
+            compiled = InterfacesIndex.load(self.interfaces_path, self.compiled_dir)
+        assert compiled.interfaces == index.interfaces
+
+    def test_compiled_cache_invalidated_by_content(self):
+        InterfacesIndex.load(self.interfaces_path, self.compiled_dir)
+        InterfacesIndex.indexes.clear()
+        with open(self.interfaces_path, "a") as _file:
+            _file.write("custom_r640_interfaces: NIC.Slot.3-1-1\n")
+        with patch("yaml.load", wraps=yaml.load) as mock_load:
+            index = InterfacesIndex.load(self.interfaces_path, self.compiled_dir)
+        assert mock_load.call_count == 1
+        assert index.get("custom", "f21", "h23", "r640") == ["NIC.Slot.3-1-1"]
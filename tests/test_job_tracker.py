@@ -0,0 +1,163 @@
+import asyncio
+from logging import getLogger
+
+import pytest
+from aiohttp.test_utils import unittest_run_loop
+from asynctest import patch
+
+from badfish.badfish import BadfishException, JobTracker
+from tests.config import (
+    BLANK_RESP,
+    BOOT_MODE_RESP,
+    BOOT_SEQ_RESP,
+    BOOT_SEQ_RESPONSE_DIRECTOR,
+    INIT_RESP,
+    INTERFACES_PATH,
+    JOB_COMPLETED_RESP,
+    JOB_ID,
+    JOB_ID_2,
+    JOB_LOCATION,
+    JOB_OK_RESP,
+    JOB_RUNNING_RESP,
+    JOB_SCHEDULED_RESP,
+    JOBS_EXPANDED_RESP,
+    RESET_TYPE_RESP,
+    RESPONSE_CHANGE_BOOT_WAIT_JOBS,
+    ROOT_EXPAND_RESP,
+    STATE_ON_RESP,
+    STATE_OFF_RESP,
+)
+from tests.test_base import TestBase
+
+
+class FakeHost:
+    def __init__(self, states, clock=None, on_poll=None):
+        self.logger = getLogger(__name__)
+        self.states = states
+        self.calls = 0
+        self.clock = clock
+        self.on_poll = on_poll
+        self.polls = []
+
+    async def get_jobs(self, job_ids):
+        state = self.states[min(self.calls, len(self.states) - 1)]
+        self.calls += 1
+        if self.clock:
+            self.polls.append(self.clock.monotonic())
+        if self.on_poll:
+            self.on_poll(self)
+        return {job_id: {"JobState": state} for job_id in job_ids}
+
+
+class TestJobTracker(TestBase):
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.patch")
+    @patch("aiohttp.ClientSession.get")
+    def test_change_boot_waits_for_job(self, mock_get, mock_patch, mock_post):
+        boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_DIRECTOR)
+        get_resp = [
+            BOOT_MODE_RESP,
+            boot_seq_resp_fmt.replace("'", '"'),
+            BLANK_RESP,
+            boot_seq_resp_fmt.replace("'", '"'),
+            JOB_SCHEDULED_RESP,
+            RESET_TYPE_RESP,
+            STATE_ON_RESP,
+            STATE_ON_RESP,
+            STATE_OFF_RESP,
+            JOB_RUNNING_RESP,
+            JOB_COMPLETED_RESP,
+        ]
+        self.set_mock_response(mock_get, 200, INIT_RESP + get_resp)
+        self.set_mock_response(mock_patch, 200, ["OK"])
+        self.set_mock_response(mock_post, 200, JOB_OK_RESP)
+        mock_post.return_value.__aenter__.return_value.headers = JOB_LOCATION
+        self.args = ["-i", INTERFACES_PATH, "-t", "foreman", "--wait-jobs"]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_CHANGE_BOOT_WAIT_JOBS
+
+    @unittest_run_loop
+    async def test_hosts_share_one_poll_loop(self):
+        tracker = JobTracker()
+        fast = FakeHost(["Running", "Completed"])
+        slow = FakeHost(["Scheduled", "Running", "Running", "Failed"])
+        results = await asyncio.gather(
+            tracker.track(fast, [JOB_ID], 600), tracker.track(slow, [JOB_ID], 600)
+        )
+        assert results[0] == {JOB_ID: {"JobState": "Completed"}}
+        assert results[1] == {JOB_ID: {"JobState": "Failed"}}
+        assert (fast.calls, slow.calls) == (2, 4)
+        assert tracker.task.done()
+
+    @unittest_run_loop
+    async def test_staggered_hosts_keep_their_backoff(self):
+        tracker = JobTracker()
+        newer = FakeHost(["Running", "Completed"])
+        joined = []
+
+        def join(host):
+            if host.calls == 3:
+                joined.append(
+                    asyncio.ensure_future(tracker.track(newer, [JOB_ID], 600))
+                )
+
+        older = FakeHost(["Running"] * 6 + ["Completed"], self.clock, join)
+        await tracker.track(older, [JOB_ID], 600)
+        await joined[0]
+        intervals = [b - a for a, b in zip(older.polls, older.polls[1:])]
+        # Jitter keeps at least half of the 1, 2, 4, 8, 15, 15 second delays.
+        for interval, delay in zip(intervals, [1, 2, 4, 8, 15, 15]):
+            assert interval >= delay / 2
+        assert newer.calls == 2
+
+    @unittest_run_loop
+    async def test_timeout(self):
+        tracker = JobTracker()
+        host = FakeHost(["Running"])
+        with pytest.raises(BadfishException):
+            await tracker.track(host, [JOB_ID], 60)
+        assert host.calls > 1
+
+    @patch("aiohttp.ClientSession.get")
+    @unittest_run_loop
+    async def test_get_jobs_expanded(self, mock_get):
+        self.set_mock_response(mock_get, 200, [ROOT_EXPAND_RESP, JOBS_EXPANDED_RESP])
+        badfish = await self.get_badfish()
+        badfish.manager_resource = "/redfish/v1/Managers/iDRAC.Embedded.1"
+        try:
+            jobs = await badfish.get_jobs([JOB_ID, JOB_ID_2])
+        finally:
+            await badfish.close()
+        assert mock_get.call_count == 2
+        assert "$expand" in mock_get.call_args_list[1][0][0]
+        assert sorted(jobs) == [JOB_ID, JOB_ID_2]
+        assert jobs[JOB_ID_2]["PercentComplete"] == 20
+
+    @patch("aiohttp.ClientSession.get")
+    @unittest_run_loop
+    async def test_job_status_without_message(self, mock_get):
+        self.set_mock_response(
+            mock_get, 200, ["{}", '{"Id": "%s", "JobState": "Scheduled"}' % JOB_ID]
+        )
+        badfish = await self.get_badfish()
+        badfish.manager_resource = "/redfish/v1/Managers/iDRAC.Embedded.1"
+        try:
+            await badfish.get_job_status(JOB_ID)
+        finally:
+            await badfish.close()
+        assert mock_get.call_count == 2
+
+    @patch("aiohttp.ClientSession.get")
+    @unittest_run_loop
+    async def test_job_status_failed(self, mock_get):
+        self.set_mock_response(
+            mock_get, 200, '{"Id": "%s", "JobState": "Failed"}' % JOB_ID
+        )
+        badfish = await self.get_badfish()
+        badfish.manager_resource = "/redfish/v1/Managers/iDRAC.Embedded.1"
+        try:
+            with pytest.raises(BadfishException):
+                await badfish.get_job_status(JOB_ID)
+        finally:
+            await badfish.close()
+        assert mock_get.call_count == 1
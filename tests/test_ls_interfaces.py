@@ -0,0 +1,35 @@
+from asynctest import patch
+from tests.config import (
+    NETWORK_ADAPTERS_RESP,
+    NETWORK_FUNCTIONS_RESP,
+    NETWORK_FUNCTION_1,
+    NETWORK_FUNCTION_2,
+    NETWORK_PORTS_RESP,
+    NETWORK_PORT_1,
+    NETWORK_PORT_2,
+    SYSTEM_INIT_RESP,
+    RESPONSE_LS_INTERFACES,
+)
+from tests.test_base import TestBase
+
+
+class TestLsInterfaces(TestBase):
+    option_arg = "--ls-interfaces"
+
+    @patch("aiohttp.ClientSession.get")
+    def test_ls_interfaces_network_adapters(self, mock_get):
+        # Ports and device functions are crawled concurrently and the
+        # functions are listed in a different order than their ports.
+        responses = SYSTEM_INIT_RESP + [
+            NETWORK_ADAPTERS_RESP,
+            NETWORK_PORTS_RESP,
+            NETWORK_FUNCTIONS_RESP,
+            NETWORK_PORT_1,
+            NETWORK_PORT_2,
+            NETWORK_FUNCTION_2,
+            NETWORK_FUNCTION_1,
+        ]
+        self.set_mock_response(mock_get, 200, responses)
+        self.args = [self.option_arg]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_LS_INTERFACES
@@ -0,0 +1,51 @@
+from asynctest import patch
+from tests.config import (
+    MEMORY_COLLECTION_RESP,
+    MEMORY_DIMM_A1,
+    MEMORY_DIMM_B1,
+    MEMORY_EXPANDED_RESP,
+    MEMORY_SUMMARY_RESP,
+    MEMORY_URI,
+    MOCK_HOST,
+    ROOT_EXPAND_RESP,
+    SYS_RESP,
+    SYSTEM_INIT_RESP,
+    RESPONSE_LS_MEMORY,
+)
+from tests.test_base import TestBase
+
+
+class TestLsMemory(TestBase):
+    option_arg = "--ls-memory"
+
+    @patch("aiohttp.ClientSession.get")
+    def test_ls_memory_expand(self, mock_get):
+        responses = [
+            ROOT_EXPAND_RESP,
+            SYS_RESP,
+            MEMORY_SUMMARY_RESP,
+            MEMORY_EXPANDED_RESP,
+        ]
+        self.set_mock_response(mock_get, 200, responses)
+        self.args = [self.option_arg]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_LS_MEMORY
+        assert mock_get.call_count == len(responses)
+        assert mock_get.call_args[0][0] == "https://%s%s?$expand=.($levels=1)" % (
+            MOCK_HOST,
+            MEMORY_URI,
+        )
+
+    @patch("aiohttp.ClientSession.get")
+    def test_ls_memory_members(self, mock_get):
+        responses = SYSTEM_INIT_RESP + [
+            MEMORY_SUMMARY_RESP,
+            MEMORY_COLLECTION_RESP,
+            MEMORY_DIMM_A1,
+            MEMORY_DIMM_B1,
+        ]
+        self.set_mock_response(mock_get, 200, responses)
+        self.args = [self.option_arg]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_LS_MEMORY
+        assert mock_get.call_count == len(responses)
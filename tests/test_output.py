@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+
+from asynctest import patch
+from tests.config import (
+    MEMORY_EXPANDED_RESP,
+    MEMORY_SUMMARY_RESP,
+    MOCK_HOST,
+    ROOT_EXPAND_RESP,
+    RESPONSE_HOST_LIST_POWER_STATE,
+    STATE_ON_RESP,
+    SYS_RESP,
+    SYSTEM_INIT_RESP,
+)
+from tests.test_base import TestBase
+
+
+class TestOutput(TestBase):
+    option_arg = "--output"
+
+    @patch("aiohttp.ClientSession.get")
+    def test_ndjson_record(self, mock_get):
+        responses = [
+            ROOT_EXPAND_RESP,
+            SYS_RESP,
+            MEMORY_SUMMARY_RESP,
+            MEMORY_EXPANDED_RESP,
+        ]
+        self.set_mock_response(mock_get, 200, responses)
+        self.args = [self.option_arg, "ndjson", "--ls-memory"]
+        out, _ = self.badfish_call()
+        lines = out.splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert record["host"] == MOCK_HOST
+        assert record["success"] is True
+        assert record["data"]["MemorySummary"]["TotalSystemMemoryGiB"]
+        assert len(record["data"]["Memory"]) == 2
+
+    @patch("aiohttp.ClientSession.get")
+    def test_ndjson_failure_record(self, mock_get):
+        self.set_mock_response(mock_get, 401, SYSTEM_INIT_RESP)
+        self.args = [self.option_arg, "ndjson", "--power-state"]
+        out, _ = self.badfish_call()
+        assert json.loads(out) == {"host": MOCK_HOST, "success": False, "data": None}
+
+    @patch("aiohttp.ClientSession.get")
+    def test_json_host_list(self, mock_get):
+        _fd, host_list = tempfile.mkstemp()
+        with os.fdopen(_fd, "w") as _file:
+            _file.write("%s\n" % MOCK_HOST)
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP + [STATE_ON_RESP])
+        self.args = [self.option_arg, "json", "--host-list", host_list, "--power-state"]
+        try:
+            out, err = self.badfish_call()
+        finally:
+            os.remove(host_list)
+        assert json.loads(out) == [
+            {"host": MOCK_HOST, "success": True, "data": {"PowerState": "On"}}
+        ]
+        assert err == RESPONSE_HOST_LIST_POWER_STATE
@@ -0,0 +1,86 @@
+import pytest
+
+from asynctest import patch
+from tests.config import (
+    BLANK_RESP,
+    BOOT_MODE_RESP,
+    BOOT_SEQ_RESP,
+    BOOT_SEQ_RESPONSE_DIRECTOR,
+    BOOT_SEQ_RESPONSE_FOREMAN,
+    DEVICE_NIC_2,
+    INIT_RESP,
+    INTERFACES_PATH,
+    MOCK_HOST,
+)
+from tests.test_base import TestBase
+
+
+class TestPlan(TestBase):
+    option_arg = "--plan"
+
+    @patch("aiohttp.ClientSession.delete")
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.patch")
+    @patch("aiohttp.ClientSession.get")
+    def test_plan_change_boot(self, mock_get, mock_patch, mock_post, mock_delete):
+        boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_DIRECTOR)
+        get_resp = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"'), BLANK_RESP]
+        self.set_mock_response(mock_get, 200, INIT_RESP + get_resp)
+        self.args = ["-i", INTERFACES_PATH, "-t", "foreman", self.option_arg]
+        _, err = self.badfish_call()
+        assert err == (
+            "- INFO     - Plan for %s: director -> foreman, boot order "
+            "NIC.Slot.2-1-1 3->1, NIC.Integrated.1-2-1 1->3, reboot.\n" % MOCK_HOST
+        )
+        assert not mock_patch.called
+        assert not mock_post.called
+        assert not mock_delete.called
+
+    @patch("aiohttp.ClientSession.get")
+    def test_plan_no_changes(self, mock_get):
+        boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_FOREMAN)
+        get_resp = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"')]
+        self.set_mock_response(mock_get, 200, INIT_RESP + get_resp)
+        self.args = ["-i", INTERFACES_PATH, "-t", "foreman", self.option_arg]
+        _, err = self.badfish_call()
+        assert err == (
+            "- INFO     - Plan for %s: no changes, boot order already matches "
+            "foreman.\n" % MOCK_HOST
+        )
+
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.patch")
+    @patch("aiohttp.ClientSession.get")
+    def test_plan_boot_to_type(self, mock_get, mock_patch, mock_post):
+        boot_seq_resp_fmt = BOOT_SEQ_RESP % str(BOOT_SEQ_RESPONSE_DIRECTOR)
+        get_resp = [BOOT_MODE_RESP, boot_seq_resp_fmt.replace("'", '"'), BLANK_RESP]
+        self.set_mock_response(mock_get, 200, INIT_RESP + get_resp)
+        self.args = [
+            "-i",
+            INTERFACES_PATH,
+            "--boot-to-type",
+            "foreman",
+            self.option_arg,
+        ]
+        _, err = self.badfish_call()
+        assert err == "- INFO     - Plan for %s: one time boot to %s.\n" % (
+            MOCK_HOST,
+            DEVICE_NIC_2["name"],
+        )
+        assert not mock_patch.called
+        assert not mock_post.called
+
+    @patch("aiohttp.ClientSession.delete")
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.get")
+    def test_plan_with_clear_jobs(self, mock_get, mock_post, mock_delete):
+        self.set_mock_response(mock_get, 200, INIT_RESP + [BLANK_RESP])
+        self.args = ["-i", INTERFACES_PATH, "-t", "foreman", self.option_arg]
+        self.args.append("--clear-jobs")
+        with pytest.raises(SystemExit):
+            self.badfish_call()
+        _, err = self._capsys.readouterr()
+        assert "--plan can't be combined with --clear-jobs" in err
+        assert not mock_get.called
+        assert not mock_post.called
+        assert not mock_delete.called
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import unittest_run_loop
+
+from badfish.badfish import EVENT_RECHECK_INTERVAL
+from tests.config import (
+    EVENT_POWER_OFF,
+    EVENT_SERVICE_RESP,
+    EVENT_STREAM_URI,
+    EVENT_UNRELATED,
+    SYSTEM_URI,
+)
+from tests.test_base import TestBase
+
+
+class TestPowerEvents(TestBase):
+    async def get_application(self):
+        self.power_state = "On"
+        self.system_gets = 0
+        self.events_enabled = True
+        self.events_stalled = False
+        self.events = asyncio.Queue()
+        app = web.Application()
+        app.router.add_get("/redfish/v1/EventService", self.event_service)
+        app.router.add_get(EVENT_STREAM_URI, self.event_stream)
+        app.router.add_get(SYSTEM_URI, self.system)
+        return app
+
+    async def event_service(self, request):
+        if not self.events_enabled:
+            return web.json_response({}, status=404)
+        return web.json_response(EVENT_SERVICE_RESP)
+
+    async def event_stream(self, request):
+        if self.events_stalled:
+            # Accept the connection and never send the response headers.
+            await asyncio.Event().wait()
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        while True:
+            payload = await self.events.get()
+            await response.write(b"data: %s\n\n" % json.dumps(payload).encode())
+
+    async def system(self, request):
+        self.system_gets += 1
+        return web.json_response({"PowerState": self.power_state})
+
+    def power_off(self):
+        self.events.put_nowait(EVENT_UNRELATED)
+        self.power_state = "Off"
+        self.events.put_nowait(EVENT_POWER_OFF)
+
+    @unittest_run_loop
+    async def test_power_state_wait_woken_by_event(self):
+        badfish = await self.get_badfish(_events=True)
+        try:
+            assert await badfish.get_event_listener()
+            self.loop.call_later(0.1, self.power_off)
+            start = self.loop.time()
+            assert await badfish.polling_host_state("Off")
+            assert self.loop.time() - start < EVENT_RECHECK_INTERVAL
+            assert self.system_gets == 2
+        finally:
+            await badfish.close()
+
+    @unittest_run_loop
+    async def test_power_state_wait_falls_back_to_polling(self):
+        self.events_enabled = False
+        self.power_state = "Off"
+        badfish = await self.get_badfish(_events=True)
+        try:
+            assert await badfish.get_event_listener() is None
+            assert await badfish.polling_host_state("Off")
+            assert self.system_gets == 1
+        finally:
+            await badfish.close()
+
+    @unittest_run_loop
+    async def test_stalled_event_stream_keeps_deadline(self):
+        self.events_stalled = True
+        badfish = await self.get_badfish(_events=True, _timeout=1)
+        try:
+            start = self.loop.time()
+            assert not await asyncio.wait_for(badfish.polling_host_state("Off"), 10)
+            assert self.loop.time() - start < 5
+            assert badfish.event_listener is False
+            assert self.system_gets == 1
+        finally:
+            await badfish.close()
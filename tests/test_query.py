@@ -0,0 +1,83 @@
+import os
+import sqlite3
+
+from badfish.badfish import main, SnapshotStore
+from tests.test_base import TestBase
+
+HOSTS = {
+    "f01-h01-000-r640.example.com": {
+        "power_state": {"PowerState": "On"},
+        "firmware": [{"Name": "BIOS", "Version": "2.11.2"}],
+        "interfaces": {"NIC.Integrated.1-1": {"MACAddress": "b0:7b:25:d0:30:01"}},
+        "boot_order": {"match": "director", "BootOrder": []},
+    },
+    "f01-h02-000-r640.example.com": {
+        "power_state": {"PowerState": "Off"},
+        "firmware": [{"Name": "BIOS", "Version": "2.12.0"}],
+        "boot_order": {"match": "foreman", "BootOrder": []},
+    },
+}
+
+
+class TestQuery(TestBase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.cache_home, "inventory.db")
+        store = SnapshotStore(self.path)
+        for host, inventory in HOSTS.items():
+            store.add_inventory(host, inventory)
+        store.close()
+
+    def query_call(self, *expressions):
+        argv = ["--snapshot", self.path]
+        for expression in expressions:
+            argv.extend(["--query", expression])
+        result = main(argv)
+        out, err = self._capsys.readouterr()
+        return result, out, err
+
+    def test_query_value(self):
+        result, _, err = self.query_call("power_state=On")
+        assert result == 0
+        assert err == (
+            "- INFO     - f01-h01-000-r640.example.com: power_state=On\n"
+            "- INFO     - 1 hosts matched.\n"
+        )
+
+    def test_query_glob_and_intersection(self):
+        _, _, err = self.query_call("firmware:BIOS=2.1*", "host_type")
+        assert err == (
+            "- INFO     - f01-h01-000-r640.example.com: "
+            "firmware:BIOS=2.11.2, host_type=director\n"
+            "- INFO     - f01-h02-000-r640.example.com: "
+            "firmware:BIOS=2.12.0, host_type=foreman\n"
+            "- INFO     - 2 hosts matched.\n"
+        )
+
+    def test_query_mac_normalized(self):
+        _, _, err = self.query_call("mac_address=B0:7B:25:D0:30:01")
+        assert "f01-h01-000-r640.example.com" in err
+        assert "1 hosts matched." in err
+
+    def test_attributes_follow_updates(self):
+        store = SnapshotStore(self.path)
+        store.add("f01-h02-000-r640.example.com", "power_state", {"PowerState": "On"})
+        store.close()
+        _, _, err = self.query_call("power_state=On")
+        assert "2 hosts matched." in err
+
+    def test_attributes_backfilled(self):
+        connection = sqlite3.connect(self.path)
+        with connection:
+            connection.execute("DROP TABLE attributes")
+        connection.close()
+        _, _, err = self.query_call("power_state=Off")
+        assert "f01-h02-000-r640.example.com: power_state=Off" in err
+
+    def test_query_missing_database(self):
+        try:
+            main(["--snapshot", self.path + ".missing", "--query", "power_state"])
+        except SystemExit as ex:
+            assert ex.code == 2
+        _, err = self._capsys.readouterr()
+        assert "snapshot database not found" in err
@@ -1,9 +1,10 @@
 from asynctest import patch
 from tests.config import (
-    INIT_RESP,
+    SYSTEM_INIT_RESP,
     STATE_ON_RESP,
     STATE_OFF_RESP,
     RESPONSE_REBOOT_ONLY_SUCCESS,
+    RESPONSE_POWER_CYCLE_NOT_OFF,
     BOOT_SEQ_RESPONSE_DIRECTOR, RESET_TYPE_RESP,
 )
 from tests.test_base import TestBase
@@ -15,10 +16,21 @@ class TestRebootOnly(TestBase):
     @patch("aiohttp.ClientSession.post")
     @patch("aiohttp.ClientSession.get")
     def test_reboot_only_success(self, mock_get, mock_post):
-        responses = INIT_RESP + [RESET_TYPE_RESP, STATE_ON_RESP, STATE_OFF_RESP, STATE_ON_RESP]
+        responses = SYSTEM_INIT_RESP + [RESET_TYPE_RESP, STATE_ON_RESP, STATE_OFF_RESP]
         self.set_mock_response(mock_get, 200, responses)
         self.set_mock_response(mock_post, 204, ["ok"])
         self.boot_seq = BOOT_SEQ_RESPONSE_DIRECTOR
         self.args = [self.option_arg]
         _, err = self.badfish_call()
         assert err == RESPONSE_REBOOT_ONLY_SUCCESS
+
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.get")
+    def test_power_cycle_waits_for_off(self, mock_get, mock_post):
+        responses = SYSTEM_INIT_RESP + [RESET_TYPE_RESP] + [STATE_ON_RESP] * 20
+        self.set_mock_response(mock_get, 200, responses)
+        self.set_mock_response(mock_post, 204, ["ok"])
+        self.args = ["--power-cycle", "--timeout", "5"]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_POWER_CYCLE_NOT_OFF
+        assert mock_post.call_count == 1
@@ -3,7 +3,7 @@ from tests.config import (
     RESET_TYPE_RESP,
     BOOT_SEQ_RESPONSE_DIRECTOR,
     RESPONSE_RESET,
-    INIT_RESP,
+    MANAGER_INIT_RESP,
 )
 from tests.test_base import TestBase
 
@@ -14,7 +14,7 @@ class TestResetIdrac(TestBase):
     @patch("aiohttp.ClientSession.post")
     @patch("aiohttp.ClientSession.get")
     def test_reset_idrac(self, mock_get, mock_post):
-        responses = INIT_RESP + [RESET_TYPE_RESP]
+        responses = MANAGER_INIT_RESP + [RESET_TYPE_RESP]
         self.set_mock_response(mock_get, 200, responses)
         self.set_mock_response(mock_post, 204, ["ok"])
         self.boot_seq = BOOT_SEQ_RESPONSE_DIRECTOR
@@ -0,0 +1,52 @@
+from badfish.badfish import ResponseCache
+from tests.config import MOCK_HOST
+from tests.test_base import TestBase
+
+HOST_URI = "https://%s" % MOCK_HOST
+SYSTEM_URI = "%s/redfish/v1/Systems/System.Embedded.1" % HOST_URI
+MANAGER_URI = "%s/redfish/v1/Managers/iDRAC.Embedded.1" % HOST_URI
+
+
+class TestResponseCache(TestBase):
+    def test_ttl_by_resource(self):
+        cache = ResponseCache()
+        assert cache.get_ttl("%s/redfish/v1" % HOST_URI) is None
+        assert cache.get_ttl("%s/redfish/v1/Systems" % HOST_URI) is None
+        assert cache.get_ttl("%s/Memory" % SYSTEM_URI) is None
+        assert cache.get_ttl(SYSTEM_URI) == 0
+        assert cache.get_ttl("%s/Jobs/JID_498218641680" % MANAGER_URI) == 0
+        assert cache.get_ttl("%s/Bios" % SYSTEM_URI) == cache.default_ttl
+
+    def test_hits_and_misses(self):
+        cache = ResponseCache()
+        cache.set(SYSTEM_URI, "power")
+        cache.set("%s/Bios" % SYSTEM_URI, "bios")
+        assert cache.get(SYSTEM_URI) is None
+        assert cache.get("%s/Bios/" % SYSTEM_URI) == "bios"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_invalidate_on_mutation(self):
+        cache = ResponseCache()
+        cache.set("%s/redfish/v1/Systems" % HOST_URI, "systems")
+        cache.set("%s/Bios" % SYSTEM_URI, "bios")
+        cache.set("%s/BootSources" % SYSTEM_URI, "boot")
+        cache.set("%s/Memory" % SYSTEM_URI, "memory")
+        cache.set(MANAGER_URI, "manager")
+
+        cache.invalidate("%s/Bios/Settings" % SYSTEM_URI)
+        assert cache.get("%s/Bios" % SYSTEM_URI) is None
+        assert cache.get("%s/BootSources" % SYSTEM_URI) == "boot"
+
+        cache.invalidate("%s/Actions/ComputerSystem.Reset" % SYSTEM_URI)
+        assert cache.get("%s/BootSources" % SYSTEM_URI) is None
+        assert cache.get("%s/Memory" % SYSTEM_URI) is None
+        assert cache.get(MANAGER_URI) == "manager"
+        assert cache.get("%s/redfish/v1/Systems" % HOST_URI) == "systems"
+
+    def test_invalidate_collection_on_member_delete(self):
+        cache = ResponseCache(rules=[])
+        cache.set("%s/Jobs" % MANAGER_URI, "jobs")
+        cache.set(MANAGER_URI, "manager")
+        cache.invalidate("%s/Jobs/JID_498218641680" % MANAGER_URI)
+        assert cache.get("%s/Jobs" % MANAGER_URI) is None
+        assert cache.get(MANAGER_URI) == "manager"
@@ -0,0 +1,96 @@
+from aiohttp import web
+from aiohttp.test_utils import unittest_run_loop
+from asynctest import patch
+from tests.config import (
+    SYSTEM_INIT_RESP,
+    SYSTEM_URI,
+    MOCK_HOST,
+    STATE_ON_RESP,
+    SESSION_HEADERS,
+    SESSION_TOKEN,
+    SESSION_URI,
+    RESPONSE_POWER_STATE_ON,
+    RESPONSE_SESSION_AUTH_FAILED,
+)
+from tests.test_base import TestBase
+
+
+class TestSessionAuth(TestBase):
+    option_arg = "--auth"
+
+    async def get_application(self):
+        self.sessions = []
+        self.expired = set()
+        self.tokens = []
+        self.deleted = []
+        app = web.Application()
+        app.router.add_post("/redfish/v1/SessionService/Sessions", self.login)
+        app.router.add_delete(
+            "/redfish/v1/SessionService/Sessions/{session}", self.logout
+        )
+        app.router.add_get(SYSTEM_URI, self.system)
+        return app
+
+    async def login(self, request):
+        self.sessions.append("token-%s" % (len(self.sessions) + 1))
+        headers = {
+            "X-Auth-Token": self.sessions[-1],
+            "Location": "/redfish/v1/SessionService/Sessions/%s" % len(self.sessions),
+        }
+        return web.json_response({}, status=201, headers=headers)
+
+    async def logout(self, request):
+        self.deleted.append(
+            (request.match_info["session"], request.headers.get("X-Auth-Token"))
+        )
+        return web.json_response({})
+
+    async def system(self, request):
+        token = request.headers.get("X-Auth-Token")
+        self.tokens.append(token)
+        if token not in self.sessions or token in self.expired:
+            return web.json_response({}, status=401)
+        return web.json_response({"PowerState": "On"})
+
+    @patch("aiohttp.ClientSession.delete")
+    @patch("aiohttp.ClientSession.post")
+    @patch("aiohttp.ClientSession.get")
+    def test_session_token_reused_and_deleted(self, mock_get, mock_post, mock_delete):
+        responses = SYSTEM_INIT_RESP + [STATE_ON_RESP]
+        self.set_mock_response(mock_get, 200, responses)
+        self.set_mock_response(mock_post, 201, "{}")
+        mock_post.return_value.__aenter__.return_value.headers = SESSION_HEADERS
+        self.set_mock_response(mock_delete, 200, "{}")
+        self.args = [self.option_arg, "session", "--power-state"]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_POWER_STATE_ON
+
+        assert mock_post.call_count == 1
+        for _call in mock_get.call_args_list:
+            assert _call[1]["headers"]["X-Auth-Token"] == SESSION_TOKEN
+            assert _call[1]["auth"] is None
+        mock_delete.assert_called_once_with(
+            "https://%s%s" % (MOCK_HOST, SESSION_URI),
+            headers={"X-Auth-Token": SESSION_TOKEN},
+        )
+
+    @patch("aiohttp.ClientSession.post")
+    def test_session_bad_credentials(self, mock_post):
+        self.set_mock_response(mock_post, 401, "{}")
+        self.args = [self.option_arg, "session", "--power-state"]
+        _, err = self.badfish_call()
+        assert err == RESPONSE_SESSION_AUTH_FAILED
+
+    @unittest_run_loop
+    async def test_session_token_expired_mid_run(self):
+        badfish = await self.get_badfish()
+        try:
+            await badfish.create_redfish_session()
+            assert await badfish.get_power_state() == "On"
+            self.expired.add("token-1")
+            assert await badfish.get_power_state() == "On"
+        finally:
+            await badfish.close()
+        assert self.sessions == ["token-1", "token-2"]
+        assert self.tokens == ["token-1", "token-1", "token-2"]
+        assert self.deleted == [("2", "token-2")]
@@ -0,0 +1,204 @@
+import functools
+import os
+import sqlite3
+
+from aiohttp import web
+from aiohttp.test_utils import unittest_run_loop
+from asynctest import CoroutineMock, patch
+
+from badfish.badfish import SnapshotStore, main
+from tests.config import (
+    BOOT_SEQ_RESPONSE_DIRECTOR,
+    JOB_URI,
+    MOCK_HOST,
+    MOCK_PASS,
+    MOCK_USER,
+    RESPONSE_SNAPSHOT_WRITE_RETRIED,
+    SYSTEM_INIT_RESP,
+    SYSTEM_URI,
+)
+from tests.test_base import TestBase
+
+INVENTORY = {
+    "power_state": {"PowerState": "On"},
+    "firmware": [{"Name": "BIOS", "Version": "2.11.2"}],
+}
+
+
+MEMBERS = {
+    "%s/Processors"
+    % SYSTEM_URI: {"CPU.Socket.1": {"Id": "CPU.Socket.1", "Model": "Xeon Gold 6230"}},
+    "%s/Memory"
+    % SYSTEM_URI: {"DIMM.Socket.A1": {"Name": "DIMM A1", "CapacityMiB": 32768}},
+    "%s/EthernetInterfaces"
+    % SYSTEM_URI: {
+        "NIC.Integrated.1-1-1": {
+            "Id": "NIC.Integrated.1-1-1",
+            "MACAddress": "b8:59:9f:c0:36:46",
+        }
+    },
+    "/redfish/v1/UpdateService/FirmwareInventory": {
+        "Installed-159-2.11.2": {"Name": "BIOS", "Version": "2.11.2"},
+        "Previous-159-2.10.0": {"Name": "BIOS", "Version": "2.10.0"},
+    },
+}
+
+
+class TestSnapshot(TestBase):
+    option_arg = "--snapshot"
+
+    async def get_application(self):
+        app = web.Application()
+        app.router.add_get("/redfish/v1", self.service_root)
+        app.router.add_get(SYSTEM_URI, self.system)
+        app.router.add_get("%s/Bios" % SYSTEM_URI, self.bios)
+        app.router.add_get("%s/BootSources" % SYSTEM_URI, self.boot_sources)
+        for uri in MEMBERS:
+            app.router.add_get(uri, self.collection)
+            app.router.add_get(uri + "/{member}", self.member)
+        return app
+
+    async def service_root(self, request):
+        return web.json_response({})
+
+    async def system(self, request):
+        return web.json_response(
+            {
+                "PowerState": "On",
+                "ProcessorSummary": {"Count": 1, "Model": "Xeon Gold 6230"},
+                "MemorySummary": {"TotalSystemMemoryGiB": 32},
+            }
+        )
+
+    async def bios(self, request):
+        return web.json_response({"Attributes": {"BootMode": "Bios"}})
+
+    async def boot_sources(self, request):
+        return web.json_response(
+            {"Attributes": {"BootSeq": BOOT_SEQ_RESPONSE_DIRECTOR}}
+        )
+
+    async def collection(self, request):
+        members = [
+            {"@odata.id": "%s/%s" % (request.path, member)}
+            for member in MEMBERS[request.path]
+        ]
+        return web.json_response({"Members": members})
+
+    async def member(self, request):
+        uri = request.path.rsplit("/", 1)[0]
+        return web.json_response(MEMBERS[uri][request.match_info["member"]])
+
+    def get_rows(self, path):
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute(
+                "SELECT host, kind, content, updated FROM inventory ORDER BY kind"
+            ).fetchall()
+        finally:
+            connection.close()
+
+    def test_upsert_only_changed_content(self):
+        path = os.path.join(self.cache_home, "inventory.db")
+        store = SnapshotStore(path)
+        store.add_inventory(MOCK_HOST, INVENTORY)
+        store.close()
+        assert store.changed == 2
+        rows = self.get_rows(path)
+
+        store = SnapshotStore(path)
+        store.add_inventory(
+            MOCK_HOST, dict(INVENTORY, power_state={"PowerState": "Off"})
+        )
+        store.close()
+        assert store.changed == 1
+        new_rows = self.get_rows(path)
+        assert new_rows[0] == rows[0]
+        assert new_rows[1][2] == '{"PowerState": "Off"}'
+        assert new_rows[1][3] > rows[1][3]
+
+    def test_batched_writes(self):
+        path = os.path.join(self.cache_home, "inventory.db")
+        store = SnapshotStore(path, batch_size=2)
+        store.add(MOCK_HOST, "power_state", "On")
+        assert self.get_rows(path) == []
+        store.add(MOCK_HOST, "firmware", [])
+        assert len(self.get_rows(path)) == 2
+        store.close()
+
+    @patch("badfish.badfish.Badfish.get_inventory", new_callable=CoroutineMock)
+    @patch("aiohttp.ClientSession.get")
+    def test_snapshot_cli(self, mock_get, mock_inventory):
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP)
+        mock_inventory.return_value = INVENTORY
+        path = os.path.join(self.cache_home, "inventory.db")
+        self.args = [self.option_arg, path]
+        _, err = self.badfish_call()
+        assert err == "- INFO     - Inventory snapshot collected for %s.\n" % MOCK_HOST
+        rows = self.get_rows(path)
+        assert [(row[0], row[1]) for row in rows] == [
+            (MOCK_HOST, "firmware"),
+            (MOCK_HOST, "power_state"),
+        ]
+
+    @unittest_run_loop
+    async def test_inventory_reaches_snapshot(self):
+        badfish = await self.get_badfish()
+        badfish.manager_resource = JOB_URI.rsplit("/", 1)[0]
+        try:
+            inventory = await badfish.get_inventory()
+        finally:
+            await badfish.close()
+        path = os.path.join(self.cache_home, "inventory.db")
+        store = SnapshotStore(path)
+        store.add_inventory(MOCK_HOST, inventory)
+        store.close()
+
+        rows = self.get_rows(path)
+        assert [row[1] for row in rows] == [
+            "boot_order",
+            "firmware",
+            "interfaces",
+            "memory",
+            "power_state",
+            "processors",
+        ]
+        store = SnapshotStore(path)
+        try:
+            assert store.query("power_state") == [(MOCK_HOST, "On")]
+            assert store.query("processor_model") == [(MOCK_HOST, "Xeon Gold 6230")]
+            assert store.query("memory_gib") == [(MOCK_HOST, "32")]
+            assert store.query("mac_address") == [(MOCK_HOST, "B8:59:9F:C0:36:46")]
+            assert store.query("firmware:BIOS") == [(MOCK_HOST, "2.11.2")]
+        finally:
+            store.close()
+
+    @patch("badfish.badfish.Badfish.get_inventory", new_callable=CoroutineMock)
+    @patch("aiohttp.ClientSession.get")
+    def test_snapshot_write_error_keeps_host_result(self, mock_get, mock_inventory):
+        self.set_mock_response(mock_get, 200, SYSTEM_INIT_RESP)
+        mock_inventory.return_value = INVENTORY
+        path = os.path.join(self.cache_home, "inventory.db")
+        flush = SnapshotStore.flush
+        calls = []
+
+        def failing_flush(store):
+            calls.append(len(store.pending))
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            flush(store)
+
+        argv = ["-H", MOCK_HOST, "-u", MOCK_USER, "-p", MOCK_PASS]
+        argv.extend([self.option_arg, path])
+        with patch(
+            "badfish.badfish.SnapshotStore",
+            functools.partial(SnapshotStore, batch_size=1),
+        ), patch.object(SnapshotStore, "flush", new=failing_flush):
+            assert main(argv) == 0
+        _, err = self._capsys.readouterr()
+        assert err == RESPONSE_SNAPSHOT_WRITE_RETRIED % path
+        assert calls == [2, 2]
+        assert [(row[0], row[1]) for row in self.get_rows(path)] == [
+            (MOCK_HOST, "firmware"),
+            (MOCK_HOST, "power_state"),
+        ]